@@ -5,3 +5,6 @@ class ApplicationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'applications'
     verbose_name = 'Quest Applications'
+
+    def ready(self):
+        import applications.signals  # noqa: F401
@@ -0,0 +1,221 @@
+"""
+Bulk review of applications by quest owners.
+
+``decide(reviewer, items)`` takes ``[{"application_id": .., "decision":
+"approve" | "reject"}, ...]`` and reports a result per item, so a request can
+partly succeed. Valid items are applied together in one transaction:
+
+* every quest involved is locked once (in primary-key order), then the
+  applications are re-read under lock and checked for ownership and status
+* approvals and rejections are one UPDATE each, like
+  Application.reject_other_pending; an approval still rejects the quest's other
+  pending applications, and only one approval per quest is accepted
+* new participants are bulk-created, dropped ones reactivated with one UPDATE,
+  and each approved quest is assigned and saved once
+* applicant notifications are one bulk_create
+
+After commit each applicant gets one ``applications_decided`` event covering
+all of their decided applications (see quests.signals.applications_decided).
+"""
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Application, ApplicationState
+
+APPROVE = 'approve'
+REJECT = 'reject'
+DECISIONS = (APPROVE, REJECT)
+MAX_ITEMS = 200
+
+
+@dataclass
+class DecisionResult:
+    application_id: object
+    decision: object
+    ok: bool = False
+    status: str = ''
+    error: str = ''
+
+
+@dataclass
+class DecisionReport:
+    results: list = field(default_factory=list)
+    approved: int = 0
+    rejected: int = 0
+    auto_rejected: int = 0
+
+    @property
+    def failed(self):
+        return sum(1 for result in self.results if not result.ok)
+
+    def as_dict(self):
+        return {
+            'results': [asdict(result) for result in self.results],
+            'approved': self.approved,
+            'rejected': self.rejected,
+            'auto_rejected': self.auto_rejected,
+            'failed': self.failed,
+        }
+
+
+def _parse(items, report):
+    """Results for well-formed items by application id; malformed ones fail straight away."""
+    wanted = {}
+    for item in items:
+        item = item if isinstance(item, dict) else {}
+        result = DecisionResult(application_id=item.get('application_id'), decision=item.get('decision'))
+        report.results.append(result)
+        try:
+            application_id = int(result.application_id)
+        except (TypeError, ValueError):
+            result.error = 'application_id must be an integer.'
+            continue
+        if result.decision not in DECISIONS:
+            result.error = f"decision must be one of: {', '.join(DECISIONS)}."
+            continue
+        if application_id in wanted:
+            result.error = 'Duplicate application_id in this request.'
+            continue
+        result.application_id = application_id
+        wanted[application_id] = result
+    return wanted
+
+
+def decide(reviewer, items):
+    """Apply a batch of approve/reject decisions by ``reviewer``; returns a DecisionReport."""
+    from notifications.models import Notification
+    from quests.models import Quest, QuestParticipant
+    from quests.signals import applications_decided
+
+    report = DecisionReport()
+    wanted = _parse(items, report)
+    if not wanted:
+        return report
+
+    with transaction.atomic():
+        quest_ids = set(Application.objects.filter(pk__in=wanted).values_list('quest_id', flat=True))
+        quests = {quest.pk: quest for quest in Quest.objects.select_for_update().filter(pk__in=quest_ids).order_by('pk')}
+        applications = {app.pk: app for app in Application.objects.select_for_update().filter(pk__in=wanted)}
+
+        winners = {}  # quest_id -> approved Application
+        rejected = {}  # application_id -> (quest_id, applicant_id)
+        for application_id, result in wanted.items():
+            application = applications.get(application_id)
+            if application is None or application.quest_id not in quests:
+                result.error = 'Application not found.'
+            elif quests[application.quest_id].creator_id != reviewer.pk:
+                result.error = 'You can only review applications to your own quests.'
+            elif application.status != 'pending':
+                result.error = f'Application is not pending (status: {application.status}).'
+            elif result.decision == APPROVE and application.quest_id in winners:
+                result.error = 'Another application for this quest is approved in this request.'
+            elif result.decision == APPROVE:
+                winners[application.quest_id] = application
+            else:
+                rejected[application_id] = (application.quest_id, application.applicant_id)
+
+        # An approval rejects everything else still pending for its quest
+        explicit = len(rejected)
+        for application_id, quest_id, applicant_id in (
+            Application.objects.select_for_update().filter(quest_id__in=winners, status='pending')
+            .exclude(pk__in=[app.pk for app in winners.values()]).values_list('pk', 'quest_id', 'applicant_id')
+        ):
+            rejected.setdefault(application_id, (quest_id, applicant_id))
+        # Explicit rejections inside winning quests may also have come back from the query above
+        report.auto_rejected = len(rejected) - explicit
+
+        now = timezone.now()
+        approved_ids = [app.pk for app in winners.values()]
+        if approved_ids:
+            Application.objects.filter(pk__in=approved_ids).update(
+                status='approved', reviewed_by=reviewer, reviewed_at=now,
+            )
+            ApplicationState.objects.filter(latest_application_id__in=approved_ids).update(
+                latest_status='approved', updated_at=now,
+            )
+        if rejected:
+            Application.objects.filter(pk__in=list(rejected), status='pending').update(
+                status='rejected', reviewed_by=reviewer, reviewed_at=now,
+            )
+            ApplicationState.objects.filter(latest_application_id__in=list(rejected)).update(
+                latest_status='rejected', updated_at=now,
+            )
+
+        if winners:
+            participant_counts = dict(
+                QuestParticipant.objects.filter(quest_id__in=winners).order_by().values_list('quest_id')
+                .annotate(total=Count('id'))
+            )
+            existing = {
+                (participant.quest_id, participant.user_id): participant
+                for participant in QuestParticipant.objects.filter(
+                    quest_id__in=winners, user_id__in=[app.applicant_id for app in winners.values()],
+                )
+            }
+            reactivate, create = [], []
+            for quest_id, application in winners.items():
+                participant = existing.get((quest_id, application.applicant_id))
+                if participant is None:
+                    create.append(QuestParticipant(quest_id=quest_id, user_id=application.applicant_id,
+                                                   status='joined', application_message=''))
+                elif participant.status == 'dropped':
+                    reactivate.append(participant.pk)
+            if reactivate:
+                QuestParticipant.objects.filter(pk__in=reactivate).update(status='joined')
+            QuestParticipant.objects.bulk_create(create)
+
+            # One save per approved quest keeps Quest.save's status side effects (reserved gold, pushes)
+            for quest_id, application in winners.items():
+                quest = quests[quest_id]
+                quest.assigned_to_id = application.applicant_id
+                if quest.status == 'open' and not participant_counts.get(quest_id):
+                    quest.status = 'in-progress'
+                quest.save()
+
+        notifications = [
+            Notification(
+                user_id=application.applicant_id,
+                notif_type="quest_application_result",
+                title="Quest Application Approved",
+                message=f"Your application for quest '{quests[quest_id].title}' was approved!",
+                quest_id=quest_id,
+                application_id=application.pk,
+                quest_title=quests[quest_id].title,
+                status='approved',
+                result="accepted"
+            )
+            for quest_id, application in winners.items()
+        ] + [
+            Notification(
+                user_id=applicant_id,
+                notif_type="quest_application_result",
+                title="Quest Application Rejected",
+                message=f"Your application for quest '{quests[quest_id].title}' was rejected.",
+                quest_id=quest_id,
+                application_id=application_id,
+                quest_title=quests[quest_id].title,
+                status='rejected',
+                result="rejected"
+            )
+            for application_id, (quest_id, applicant_id) in rejected.items()
+        ]
+        Notification.objects.bulk_create(notifications)
+
+        changes = [(app.pk, quest_id, app.applicant_id, 'approved') for quest_id, app in winners.items()]
+        changes += [(pk, quest_id, applicant_id, 'rejected') for pk, (quest_id, applicant_id) in rejected.items()]
+        if changes:
+            touched = sorted({quest_id for _, quest_id, _, _ in changes})
+            transaction.on_commit(lambda: applications_decided(touched, changes))
+
+    for application_id, result in wanted.items():
+        if result.error:
+            continue
+        result.ok = True
+        result.status = 'approved' if result.decision == APPROVE else 'rejected'
+    report.approved = len(winners)
+    report.rejected = len(rejected) - report.auto_rejected
+    return report
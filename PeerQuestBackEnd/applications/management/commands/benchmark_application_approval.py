@@ -0,0 +1,54 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from applications.models import Application, ApplicationState
+from quests.models import Quest, QuestCategory
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = ('Benchmark Application.approve with N other pending applicants (query count and wall time). '
+            'All data is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 200],
+                            help='Numbers of competing pending applications to auto-reject')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'pending':>8} {'queries':>8} {'wall ms':>10}")
+        for size in options['sizes']:
+            queries, elapsed = self._run(size)
+            self.stdout.write(f"{size:>8} {queries:>8} {elapsed * 1000:>10.1f}")
+
+    def _run(self, size):
+        with transaction.atomic():
+            tag = uuid.uuid4().hex[:8]
+            creator = User.objects.create(username=f'bench-creator-{tag}', email=f'bench-creator-{tag}@example.com')
+            category = QuestCategory.objects.create(name=f'bench-{tag}')
+            quest = Quest.objects.create(
+                title=f'Approval benchmark {tag}', description='benchmark', creator=creator, category=category,
+            )
+            users = User.objects.bulk_create([
+                User(username=f'bench-{tag}-{i}', email=f'bench-{tag}-{i}@example.com') for i in range(size + 1)
+            ])
+            applications = Application.objects.bulk_create([Application(quest=quest, applicant=user) for user in users])
+            ApplicationState.objects.bulk_create([
+                ApplicationState(quest=quest, applicant=app.applicant, attempt_count=1, latest_application=app,
+                                 latest_status='pending')
+                for app in applications
+            ])
+            application = Application.objects.select_related('quest', 'applicant').get(
+                quest=quest, applicant=users[0],
+            )
+
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                application.approve(creator)
+                elapsed = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+        return len(ctx.captured_queries), elapsed
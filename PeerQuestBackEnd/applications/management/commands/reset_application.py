@@ -1,5 +1,5 @@
 from django.core.management.base import BaseCommand, CommandError
-from applications.models import Application
+from applications.models import Application, ApplicationState
 
 class Command(BaseCommand):
     help = 'Reset an application status to pending for testing'
@@ -17,4 +17,5 @@ class Command(BaseCommand):
         )
         if not updated:
             raise CommandError(f"Application with ID {app_id} does not exist.")
+        ApplicationState.objects.filter(latest_application_id=app_id).update(latest_status='pending')
         self.stdout.write(self.style.SUCCESS(f"Application {app_id} status reset to 'pending'."))
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_application_states(apps, schema_editor):
+    """One state row per (quest, applicant): latest application by applied_at, attempts = highest attempt number."""
+    Application = apps.get_model('applications', 'Application')
+    ApplicationAttempt = apps.get_model('applications', 'ApplicationAttempt')
+    ApplicationState = apps.get_model('applications', 'ApplicationState')
+
+    attempts = {
+        (quest_id, applicant_id): top
+        for quest_id, applicant_id, top in ApplicationAttempt.objects.order_by().values(
+            'quest_id', 'applicant_id',
+        ).annotate(top=models.Max('attempt_number')).values_list('quest_id', 'applicant_id', 'top')
+    }
+    latest = {}
+    rows = Application.objects.order_by('applied_at', 'pk').values_list('pk', 'quest_id', 'applicant_id', 'status')
+    for pk, quest_id, applicant_id, status in rows.iterator(chunk_size=2000):
+        latest[(quest_id, applicant_id)] = (pk, status)
+    ApplicationState.objects.bulk_create([
+        ApplicationState(
+            quest_id=quest_id, applicant_id=applicant_id, attempt_count=attempts.get((quest_id, applicant_id), 0),
+            latest_application_id=pk, latest_status=status,
+        )
+        for (quest_id, applicant_id), (pk, status) in latest.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+        ('quests', '0009_quest_is_deleted_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempt_count', models.PositiveIntegerField(default=0, help_text='Pending applications submitted for this quest (numbering for ApplicationAttempt)')),
+                ('latest_status', models.CharField(blank=True, choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('kicked', 'Kicked')], help_text='Status of the most recent application', max_length=15)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('applicant', models.ForeignKey(help_text='Applicant', on_delete=django.db.models.deletion.CASCADE, related_name='application_states', to=settings.AUTH_USER_MODEL)),
+                ('latest_application', models.ForeignKey(blank=True, help_text='Most recent application for this quest', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='applications.application')),
+                ('quest', models.ForeignKey(help_text='Quest applied to', on_delete=django.db.models.deletion.CASCADE, related_name='application_states', to='quests.quest')),
+            ],
+            options={
+                'unique_together': {('quest', 'applicant')},
+            },
+        ),
+        migrations.RunPython(backfill_application_states, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_application_state'),
+        ('quests', '0009_quest_is_deleted_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', 'applied_at'], name='application_applica_bd212a_idx'),
+        ),
+    ]
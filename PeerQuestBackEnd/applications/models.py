@@ -3,10 +3,12 @@ from django.conf import settings
 from django.utils import timezone
 import logging
 
+from common.tracking import FieldTrackerMixin
+
 logger = logging.getLogger(__name__)
 
 
-class Application(models.Model):
+class Application(FieldTrackerMixin, models.Model):
     APPLICATION_STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('approved', 'Approved'),
@@ -55,6 +57,8 @@ class Application(models.Model):
         help_text="Application review time"
     )
 
+    tracked_fields = ('status',)
+
     class Meta:
         ordering = ['-applied_at']
         # Allow reapplication after rejection - no unique constraint
@@ -63,6 +67,7 @@ class Application(models.Model):
             models.Index(fields=['applicant', 'status']),
             models.Index(fields=['applied_at']),
             models.Index(fields=['quest', 'applicant']),  # Index for performance
+            models.Index(fields=['applicant', 'applied_at']),  # my_applications inbox order
         ]
 
     def __str__(self):
@@ -71,24 +76,21 @@ class Application(models.Model):
     def clean(self):
         """Custom validation to enforce application limits and prevent duplicate pending applications"""
         if self.status == 'pending':
-            # Check for existing pending applications for same quest+applicant
-            existing_pending = Application.objects.filter(
-                quest=self.quest,
-                applicant=self.applicant,
-                status='pending'
-            ).exclude(pk=self.pk)
-            
-            if existing_pending.exists():
-                from django.core.exceptions import ValidationError
+            from django.core.exceptions import ValidationError
+            state = ApplicationState.lookup(self.quest_id, self.applicant_id)
+            if state is not None and self.pk is not None and state.latest_application_id == self.pk:
+                # Moving this application back to pending is not a new attempt
+                return
+            # Check for an existing pending application for same quest+applicant
+            if state is not None and state.latest_status == 'pending':
                 raise ValidationError(
                     'You already have a pending application for this quest. '
                     'Please wait for a response before applying again.'
                 )
             
             # Check application attempt limits using the new system
-            can_apply, reason = ApplicationAttempt.can_apply_again(self.quest, self.applicant)
+            can_apply, reason = ApplicationAttempt.check_state(state)
             if not can_apply:
-                from django.core.exceptions import ValidationError
                 raise ValidationError(reason)
 
     def save(self, *args, **kwargs):
@@ -96,29 +98,36 @@ class Application(models.Model):
         from django.db import transaction
         
         from notifications.models import Notification
-        self.clean()
         is_new = self.pk is None
+        # The pending/attempt-limit checks only apply when an application becomes pending
+        if self.has_changed('status'):
+            self.clean()
         
         # Use atomic transaction to ensure consistency
+        status_changed = self.has_changed('status')
         with transaction.atomic():
             super().save(*args, **kwargs)
+            if is_new:
                 # Record application attempt when creating a new application
-            if is_new and self.status == 'pending':
-                ApplicationAttempt.record_attempt(self)
-            # Notify quest owner of new application
-            print(f"[DEBUG] Creating notification for quest owner: {self.quest.creator} (user id: {self.quest.creator.id}) for quest '{self.quest.title}'")
-            notif = Notification.objects.create(
-                user=self.quest.creator,
-                notif_type="quest_application",
-                title="New Quest Application",
-                message=f"{self.applicant.username} applied for your quest '{self.quest.title}'.",
-                quest_id=self.quest.id,
-                application_id=self.pk,
-                applicant=self.applicant.username,
-                quest_title=self.quest.title,
-                status=self.status
-            )
-            print(f"[DEBUG] Notification created: {notif}")
+                state = ApplicationState.record_application(self)
+                if self.status == 'pending':
+                    ApplicationAttempt.record_attempt(self, state.attempt_count)
+            elif status_changed:
+                ApplicationState.record_status(self)
+            if is_new:
+                # Notify quest owner of new application
+                notif = Notification.objects.create(
+                    user=self.quest.creator,
+                    notif_type="quest_application",
+                    title="New Quest Application",
+                    message=f"{self.applicant.username} applied for your quest '{self.quest.title}'.",
+                    quest_id=self.quest.id,
+                    application_id=self.pk,
+                    applicant=self.applicant.username,
+                    quest_title=self.quest.title,
+                    status=self.status
+                )
+                logger.debug("Notified quest owner %s of application %s to quest %s", notif.user_id, self.pk, self.quest_id)
 
     def approve(self, reviewer):
         """Approve the application and assign the quest to the applicant, and notify applicant and others"""
@@ -142,29 +151,7 @@ class Application(models.Model):
                     # Rollback application approval since quest assignment failed
                     raise Exception(f"Failed to assign quest to user: {str(assign_error)}")
                 # Step 3: Automatically reject all other pending applications for this quest
-                other_pending_applications = Application.objects.filter(
-                    quest=self.quest,
-                    status='pending'
-                ).exclude(id=self.id)
-                rejected_count = 0
-                for app in other_pending_applications:
-                    app.status = 'rejected'
-                    app.reviewed_by = reviewer
-                    app.reviewed_at = timezone.now()
-                    app.save()
-                    rejected_count += 1
-                    # Notify rejected applicants
-                    Notification.objects.create(
-                        user=app.applicant,
-                        notif_type="quest_application_result",
-                        title="Quest Application Rejected",
-                        message=f"Your application for quest '{self.quest.title}' was rejected.",
-                        quest_id=self.quest.id,
-                        application_id=app.id,
-                        quest_title=self.quest.title,
-                        status=app.status,
-                        result="rejected"
-                    )
+                rejected_count = self.reject_other_pending(reviewer)
                 if rejected_count > 0:
                     logger.info(f"Auto-rejected {rejected_count} other pending applications for Quest '{self.quest.title}'")
                 # Notify applicant of approval
@@ -192,6 +179,46 @@ class Application(models.Model):
                 logger.info(f"Reverted application status to pending due to failure")
             raise Exception(f"Application approval failed: {str(e)}")
 
+    def reject_other_pending(self, reviewer):
+        """
+        Reject every other pending application for this quest in bulk: one UPDATE,
+        one bulk_create for the applicants' rejection notifications, and one
+        round of websocket/cache updates after commit. Returns the number rejected.
+        """
+        from notifications.models import Notification
+        from quests.signals import applications_bulk_updated
+
+        losing = list(
+            Application.objects.select_for_update().filter(quest_id=self.quest_id, status='pending')
+            .exclude(pk=self.pk).values_list('pk', 'applicant_id')
+        )
+        if not losing:
+            return 0
+        Application.objects.filter(pk__in=[pk for pk, _ in losing], status='pending').update(
+            status='rejected', reviewed_by=reviewer, reviewed_at=timezone.now(),
+        )
+        ApplicationState.objects.filter(latest_application_id__in=[pk for pk, _ in losing]).update(
+            latest_status='rejected', updated_at=timezone.now(),
+        )
+        Notification.objects.bulk_create([
+            Notification(
+                user_id=applicant_id,
+                notif_type="quest_application_result",
+                title="Quest Application Rejected",
+                message=f"Your application for quest '{self.quest.title}' was rejected.",
+                quest_id=self.quest_id,
+                application_id=application_id,
+                quest_title=self.quest.title,
+                status='rejected',
+                result="rejected"
+            )
+            for application_id, applicant_id in losing
+        ])
+        # queryset.update() sends no post_save; replay what the Application receivers would have done
+        quest_id = self.quest_id
+        transaction.on_commit(lambda: applications_bulk_updated(quest_id, losing, 'rejected'))
+        return len(losing)
+
     def reject(self, reviewer):
         """Reject the application and notify applicant"""
         from notifications.models import Notification
@@ -329,10 +356,13 @@ class ApplicationAttempt(models.Model):
     def __str__(self):
         return f"Attempt #{self.attempt_number} by {self.applicant.username} for quest '{self.quest.title}'"
     
+    MAX_ATTEMPTS = 4  # 1 initial + 3 re-attempts after rejection
+
     @classmethod
     def get_attempt_count(cls, quest, applicant):
         """Get the current number of attempts for a user on a quest"""
-        return cls.objects.filter(quest=quest, applicant=applicant).count()
+        state = ApplicationState.lookup(quest, applicant)
+        return state.attempt_count if state else 0
     
     @classmethod
     def can_apply_again(cls, quest, applicant):
@@ -343,55 +373,132 @@ class ApplicationAttempt(models.Model):
         - Rejected users can only apply 3 more times (4 total attempts including first)
         - Approved/pending users cannot apply again
         """
-        # Get the latest application status
-        latest_application = Application.objects.filter(
-            quest=quest, 
-            applicant=applicant
-        ).order_by('-applied_at').first()
-        
-        if not latest_application:
+        return cls.check_state(ApplicationState.lookup(quest, applicant))
+
+    @classmethod
+    def check_state(cls, state):
+        """can_apply_again() for an already loaded ApplicationState (or None)."""
+        if state is None or not state.latest_status:
             # No previous application, can apply
             return True, "Can apply"
         
-        if latest_application.status == 'pending':
+        if state.latest_status == 'pending':
             return False, "You already have a pending application for this quest"
         
-        if latest_application.status == 'approved':
+        if state.latest_status == 'approved':
             return False, "You are already participating in this quest"
         
-        if latest_application.status == 'kicked':
+        if state.latest_status == 'kicked':
             # Kicked users can apply unlimited times
             return True, "Can re-apply (kicked users have unlimited attempts)"
         
-        if latest_application.status == 'rejected':
-            # Check attempt count
-            attempt_count = cls.get_attempt_count(quest, applicant)
-            max_attempts = 4  # 1 initial + 3 re-attempts
-            
-            if attempt_count < max_attempts:
-                remaining = max_attempts - attempt_count
+        if state.latest_status == 'rejected':
+            if state.attempt_count < cls.MAX_ATTEMPTS:
+                remaining = cls.MAX_ATTEMPTS - state.attempt_count
                 return True, f"Can re-apply ({remaining} attempts remaining after rejection)"
             else:
-                return False, f"Maximum application attempts ({max_attempts}) reached for this quest"
+                return False, f"Maximum application attempts ({cls.MAX_ATTEMPTS}) reached for this quest"
         
         return False, "Unknown application status"
     
     @classmethod
-    def record_attempt(cls, application):
-        """Record a new application attempt using chronological order"""
-        # Get all applications for this user+quest created before or at the same time as this one
-        previous_applications = Application.objects.filter(
-            quest=application.quest,
-            applicant=application.applicant,
-            applied_at__lte=application.applied_at
-        ).order_by('applied_at')
-        
-        # The attempt number should be the position of this application in chronological order
-        attempt_number = list(previous_applications).index(application) + 1
-        
+    def record_attempt(cls, application, attempt_number=None):
+        """Record a new application attempt numbered by the (quest, applicant) counter"""
+        if attempt_number is None:
+            attempt_number = ApplicationState.record_application(application).attempt_count
         return cls.objects.create(
-            quest=application.quest,
-            applicant=application.applicant,
+            quest_id=application.quest_id,
+            applicant_id=application.applicant_id,
             application=application,
             attempt_number=attempt_number
         )
+
+
+class ApplicationState(models.Model):
+    """
+    Per-(quest, applicant) summary kept in step by Application.save: the attempt
+    counter and the latest application with its status. Eligibility checks read
+    this one row instead of scanning the pair's applications and attempts.
+    """
+    quest = models.ForeignKey(
+        'quests.Quest',
+        on_delete=models.CASCADE,
+        related_name='application_states',
+        help_text="Quest applied to"
+    )
+    applicant = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='application_states',
+        help_text="Applicant"
+    )
+    attempt_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Pending applications submitted for this quest (numbering for ApplicationAttempt)"
+    )
+    latest_application = models.ForeignKey(
+        Application,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Most recent application for this quest"
+    )
+    latest_status = models.CharField(
+        max_length=15,
+        choices=Application.APPLICATION_STATUS_CHOICES,
+        blank=True,
+        help_text="Status of the most recent application"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('quest', 'applicant')
+
+    def __str__(self):
+        return f"{self.applicant_id} -> quest {self.quest_id}: {self.latest_status or 'none'} ({self.attempt_count} attempts)"
+
+    @classmethod
+    def lookup(cls, quest, applicant):
+        """The state row for a quest/applicant pair (instances or ids), or None."""
+        return cls.objects.filter(
+            quest_id=getattr(quest, 'pk', quest), applicant_id=getattr(applicant, 'pk', applicant),
+        ).first()
+
+    @classmethod
+    def record_application(cls, application):
+        """Make ``application`` the latest for its pair, counting it if it is a new attempt."""
+        state, _ = cls.objects.select_for_update().get_or_create(
+            quest_id=application.quest_id, applicant_id=application.applicant_id,
+        )
+        if application.status == 'pending':
+            state.attempt_count += 1
+        state.latest_application = application
+        state.latest_status = application.status
+        state.save()
+        return state
+
+    @classmethod
+    def record_status(cls, application):
+        """Mirror a status change if ``application`` is still the pair's latest."""
+        cls.objects.filter(latest_application_id=application.pk).update(
+            latest_status=application.status, updated_at=timezone.now(),
+        )
+
+    @classmethod
+    def rebuild(cls, quest_id, applicant_id):
+        """Recompute one pair from its applications and attempts (after deletes or repairs)."""
+        latest = Application.objects.filter(quest_id=quest_id, applicant_id=applicant_id).order_by(
+            '-applied_at', '-pk',
+        ).values_list('pk', 'status').first()
+        if latest is None:
+            cls.objects.filter(quest_id=quest_id, applicant_id=applicant_id).delete()
+            return None
+        attempts = ApplicationAttempt.objects.filter(quest_id=quest_id, applicant_id=applicant_id).aggregate(
+            top=models.Max('attempt_number'),
+        )['top'] or 0
+        state, _ = cls.objects.update_or_create(
+            quest_id=quest_id, applicant_id=applicant_id,
+            defaults={'attempt_count': attempts, 'latest_application_id': latest[0], 'latest_status': latest[1]},
+        )
+        return state
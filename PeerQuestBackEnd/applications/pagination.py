@@ -0,0 +1,56 @@
+"""
+Keyset pagination for the application inboxes (``my_applications`` and
+``to_my_quests``).
+
+Pages are ordered newest first on ``(applied_at, id)`` and addressed by
+cursor, like the quest board. Each page carries status facets, which are the
+inbox's application counts per status from one grouped aggregate. ``count`` is
+the total for the statuses requested with ``?status=``, so clients get tab
+badges and a total without a second ``COUNT(*)``.
+"""
+from django.db.models import Count
+
+from quests.pagination import KeysetPagination
+from .models import Application
+
+STATUSES = [choice for choice, _ in Application.APPLICATION_STATUS_CHOICES]
+
+
+def status_facets(queryset):
+    """{status: count} for every application status, from one GROUP BY query."""
+    counts = dict(queryset.order_by().values_list('status').annotate(total=Count('id')))
+    return {status: counts.get(status, 0) for status in STATUSES}
+
+
+class ApplicationInboxPagination(KeysetPagination):
+    tie_breakers = ('applied_at', 'id')
+    default_ordering = ('-applied_at',)
+    status_query_param = 'status'
+
+    def get_statuses(self, request):
+        requested = request.query_params.get(self.status_query_param, '')
+        return [status for status in requested.split(',') if status in STATUSES]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.facets = status_facets(queryset)
+        statuses = self.get_statuses(request)
+        if statuses:
+            queryset = queryset.filter(status__in=statuses)
+        return super().paginate_queryset(queryset.order_by('-applied_at', '-id'), request, view)
+
+    def get_count(self, queryset, request):
+        statuses = self.get_statuses(request) or STATUSES
+        return sum(self.facets[status] for status in statuses)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data['facets'] = self.facets
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {'type': 'integer', 'description': 'Total for the requested statuses'}
+        response_schema['properties']['facets'] = {
+            'type': 'object', 'description': 'Application count per status for the whole inbox',
+        }
+        return response_schema
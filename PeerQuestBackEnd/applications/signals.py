@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Application, ApplicationState
+
+
+@receiver(post_delete, sender=Application)
+def rebuild_application_state(sender, instance, **kwargs):
+    """Point the (quest, applicant) state at the next latest application once the delete commits."""
+    quest_id, applicant_id = instance.quest_id, instance.applicant_id
+    transaction.on_commit(lambda: ApplicationState.rebuild(quest_id, applicant_id))
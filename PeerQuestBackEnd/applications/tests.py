@@ -1,3 +1,208 @@
+from datetime import timedelta
+import importlib
+from unittest import mock
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from common.testing import make_user
+from notifications.models import Notification
+from quests.models import Quest, QuestCategory, QuestParticipant
+from users.models import User
+from .models import Application, ApplicationAttempt, ApplicationState
+
+
+class BulkAutoRejectTest(TestCase):
+    def setUp(self):
+        self.creator = make_user('bulk-creator')
+        category = QuestCategory.objects.create(name='Bulk')
+        self.quest = Quest.objects.create(title='Popular quest', description='desc', creator=self.creator,
+                                          category=category)
+        self.applications = [
+            Application.objects.create(quest=self.quest, applicant=make_user(f'bulk-applicant-{i}'))
+            for i in range(6)
+        ]
+
+    def test_approval_rejects_the_others_in_bulk(self):
+        winner = Application.objects.select_related('quest', 'applicant').get(pk=self.applications[0].pk)
+        with self.settings(QUEST_COUNT_PUSH_WINDOW=0), mock.patch('quests.signals.send_to_group') as send, \
+                self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as ctx:
+                winner.approve(self.creator)
+
+        losers = Application.objects.exclude(pk=winner.pk)
+        self.assertEqual(set(losers.values_list('status', 'reviewed_by')), {('rejected', self.creator.pk)})
+        self.assertEqual(Notification.objects.filter(notif_type='quest_application_result', result='rejected').count(), 5)
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "applications_application"')]
+        self.assertEqual(len(updates), 2)  # the winner's save and one UPDATE for every loser
+
+        messages = [call.args for call in send.call_args_list]
+        pushed = {group for group, message in messages if message['type'] == 'application_status_changed'}
+        self.assertEqual(pushed, {f'user.{app.applicant_id}' for app in self.applications})
+        counts = [message for group, message in messages if message['type'] == 'quest_application_count_changed']
+        self.assertEqual(len(counts), 2)  # the winner's save and one coalesced push for the losers
+
+
+class ApplicationStateTest(TestCase):
+    def setUp(self):
+        self.creator = make_user('state-creator')
+        self.applicant = make_user('state-applicant')
+        category = QuestCategory.objects.create(name='State')
+        self.quest = Quest.objects.create(title='Retry quest', description='desc', creator=self.creator,
+                                          category=category)
+
+    def apply(self):
+        return Application.objects.create(quest=self.quest, applicant=self.applicant)
+
+    def test_state_follows_applications(self):
+        first = self.apply()
+        with self.assertRaises(ValidationError):
+            self.apply()
+        first.reject(self.creator)
+        second = self.apply()
+
+        state = ApplicationState.lookup(self.quest, self.applicant)
+        self.assertEqual((state.attempt_count, state.latest_application_id, state.latest_status), (2, second.pk, 'pending'))
+        self.assertEqual(list(ApplicationAttempt.objects.order_by('attempt_number').values_list('attempt_number', flat=True)), [1, 2])
+
+        second.reject(self.creator)
+        with self.assertNumQueries(1):
+            self.assertEqual(ApplicationAttempt.can_apply_again(self.quest, self.applicant),
+                             (True, 'Can re-apply (2 attempts remaining after rejection)'))
+
+        with self.settings(QUEST_COUNT_PUSH_WINDOW=0), self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        state = ApplicationState.lookup(self.quest, self.applicant)
+        self.assertEqual((state.latest_application_id, state.latest_status), (first.pk, 'rejected'))
+
+    def test_unsaved_application_is_still_checked_without_a_latest_application(self):
+        ApplicationState.objects.create(quest=self.quest, applicant=self.applicant, latest_application=None,
+                                        latest_status='rejected', attempt_count=ApplicationAttempt.MAX_ATTEMPTS)
+        with self.assertRaises(ValidationError):
+            Application(quest=self.quest, applicant=self.applicant).clean()
+
+    def test_migration_backfill(self):
+        application = self.apply()
+        application.reject(self.creator)
+        ApplicationState.objects.all().delete()
+        migration = importlib.import_module('applications.migrations.0002_application_state')
+        migration.backfill_application_states(apps, None)
+        state = ApplicationState.lookup(self.quest, self.applicant)
+        self.assertEqual((state.attempt_count, state.latest_application_id, state.latest_status), (1, application.pk, 'rejected'))
+
+
+class ApplicationInboxTest(TestCase):
+    def setUp(self):
+        self.creator = make_user('inbox-creator')
+        category = QuestCategory.objects.create(name='Inbox')
+        quests = [
+            Quest.objects.create(title=f'Inbox quest {i}', description='desc', creator=self.creator, category=category)
+            for i in range(3)
+        ]
+        applicants = User.objects.bulk_create([
+            User(username=f'inbox-applicant-{i}', email=f'inbox-applicant-{i}@example.com') for i in range(25)
+        ])
+        applied_at = timezone.now()
+        statuses = ['pending', 'pending', 'rejected', 'approved', 'kicked']
+        # Pairs share applied_at so the id tie-breaker matters
+        Application.objects.bulk_create([
+            Application(quest=quests[i % 3], applicant=applicant, status=statuses[i % 5],
+                        applied_at=applied_at - timedelta(minutes=i // 2))
+            for i, applicant in enumerate(applicants)
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(self.creator)
+
+    def test_pages_are_stable_and_constant_cost(self):
+        url = '/api/applications/to_my_quests/?page_size=10'
+        seen = []
+        for page in range(3):
+            with self.assertNumQueries(2):  # status facets + the page with its joins
+                response = self.client.get(url)
+            seen += [row['id'] for row in response.data['results']]
+            self.assertEqual(response.data['count'], 25)
+            url = response.data['next']
+        self.assertIsNone(url)
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+        self.assertEqual(response.data['facets'], {'pending': 10, 'approved': 5, 'rejected': 5, 'kicked': 5})
+
+    def test_status_filter(self):
+        response = self.client.get('/api/applications/to_my_quests/?status=pending,kicked')
+        self.assertEqual(response.data['count'], 15)
+        self.assertEqual({row['status'] for row in response.data['results']}, {'pending', 'kicked'})
+        self.assertEqual(response.data['facets']['approved'], 5)
+
+    def test_quest_filter(self):
+        quest = Quest.objects.filter(creator=self.creator).order_by('pk').first()
+        response = self.client.get(f'/api/applications/to_my_quests/?quest={quest.pk}')
+        self.assertEqual(response.data['count'], 9)
+        self.assertEqual({row['quest']['id'] for row in response.data['results']}, {quest.pk})
+        self.assertEqual(sum(response.data['facets'].values()), 9)
+        self.assertEqual(self.client.get('/api/applications/to_my_quests/?quest=abc').status_code, 400)
+
+
+class BulkDecisionTest(TestCase):
+    def setUp(self):
+        self.creator = make_user('decide-creator')
+        category = QuestCategory.objects.create(name='Decide')
+        self.quest_a = Quest.objects.create(title='Quest A', description='desc', creator=self.creator, category=category)
+        self.quest_b = Quest.objects.create(title='Quest B', description='desc', creator=self.creator, category=category)
+        other_quest = Quest.objects.create(title='Not mine', description='desc', creator=make_user('decide-other'),
+                                           category=category)
+        applicants = [make_user(f'decide-applicant-{i}') for i in range(4)]
+        self.a = [Application.objects.create(quest=self.quest_a, applicant=user) for user in applicants]
+        self.b = [Application.objects.create(quest=self.quest_b, applicant=user) for user in applicants[:2]]
+        self.foreign = Application.objects.create(quest=other_quest, applicant=applicants[3])
+        self.client = APIClient()
+        self.client.force_authenticate(self.creator)
+
+    def test_per_item_report(self):
+        decisions = [
+            {'application_id': self.a[0].pk, 'decision': 'approve'},
+            {'application_id': self.a[1].pk, 'decision': 'reject'},
+            {'application_id': self.a[2].pk, 'decision': 'approve'},
+            {'application_id': self.b[0].pk, 'decision': 'reject'},
+            {'application_id': self.foreign.pk, 'decision': 'approve'},
+            {'application_id': 999999, 'decision': 'reject'},
+            {'application_id': self.b[1].pk, 'decision': 'maybe'},
+        ]
+        with self.settings(QUEST_COUNT_PUSH_WINDOW=0), mock.patch('quests.signals.send_to_group') as send, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/applications/bulk_decide/', {'decisions': decisions}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual([result['ok'] for result in results], [True, True, False, True, False, False, False])
+        self.assertIn('Another application', results[2]['error'])
+        self.assertIn('your own quests', results[4]['error'])
+        self.assertEqual(results[5]['error'], 'Application not found.')
+        self.assertEqual((response.data['approved'], response.data['rejected'], response.data['auto_rejected']), (1, 2, 2))
+
+        status = dict(Application.objects.values_list('pk', 'status'))
+        self.assertEqual([status[app.pk] for app in self.a], ['approved', 'rejected', 'rejected', 'rejected'])
+        self.assertEqual([status[app.pk] for app in self.b], ['rejected', 'pending'])
+        self.assertEqual(status[self.foreign.pk], 'pending')
+        self.assertEqual(ApplicationState.lookup(self.quest_a, self.a[3].applicant).latest_status, 'rejected')
+
+        self.quest_a.refresh_from_db()
+        self.assertEqual((self.quest_a.assigned_to_id, self.quest_a.status), (self.a[0].applicant_id, 'in-progress'))
+        self.assertTrue(QuestParticipant.objects.filter(quest=self.quest_a, user=self.a[0].applicant, status='joined').exists())
+        self.assertEqual(Notification.objects.filter(notif_type='quest_application_result').count(), 5)
+
+        messages = [call.args for call in send.call_args_list]
+        decided = {group: message['applications'] for group, message in messages if message['type'] == 'applications_decided'}
+        # One event per applicant; the first applicant hears about both quests at once
+        self.assertEqual(len(decided), 4)
+        self.assertEqual(len(decided[f'user.{self.a[0].applicant_id}']), 2)
+        counts = {group for group, message in messages if message['type'] == 'quest_application_count_changed'}
+        self.assertEqual(counts, {f'quest.{self.quest_a.pk}', f'quest.{self.quest_b.pk}'})
 
-# Create your tests here.
+    def test_rejects_malformed_payload(self):
+        response = self.client.post('/api/applications/bulk_decide/', {'decisions': 'approve all'}, format='json')
+        self.assertEqual(response.status_code, 400)
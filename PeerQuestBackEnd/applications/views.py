@@ -19,7 +19,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+from rest_framework.exceptions import NotFound, ValidationError
+
+from .decisions import MAX_ITEMS, decide
 from .models import Application, ApplicationAttempt
+from .pagination import ApplicationInboxPagination
 from .serializers import (
     ApplicationListSerializer,
     ApplicationDetailSerializer,
@@ -115,29 +119,36 @@ class ApplicationViewSet(ModelViewSet):
             # For regular CRUD operations, only show user's own applications
             return Application.objects.filter(applicant=user).order_by('-applied_at')
     
+    def get_inbox(self, request, queryset):
+        """One keyset page of ``queryset`` with status facets (see applications.pagination)."""
+        quest_id = request.query_params.get('quest')
+        if quest_id:
+            if not quest_id.isdigit():
+                raise ValidationError({'quest': 'Must be a quest id.'})
+            queryset = queryset.filter(quest_id=quest_id)
+        paginator = ApplicationInboxPagination()
+        queryset = queryset.select_related('quest__creator', 'applicant', 'reviewed_by')
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
     @action(detail=False, methods=['get'])
     def my_applications(self, request):
-        """Get applications made by the current user"""
+        """Get applications made by the current user (?quest=, ?status=, ?cursor=, ?page_size=)"""
         try:
-            applications = Application.objects.filter(applicant=request.user).order_by('-applied_at')
-            serializer = self.get_serializer(applications, many=True)
-            return Response({
-                'results': serializer.data,
-                'count': applications.count()
-            })
+            return self.get_inbox(request, Application.objects.filter(applicant=request.user))
+        except (NotFound, ValidationError):
+            raise
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @action(detail=False, methods=['get'])
     def to_my_quests(self, request):
-        """Get applications to quests created by the current user"""
+        """Get applications to quests created by the current user (?quest=, ?status=, ?cursor=, ?page_size=)"""
         try:
-            applications = Application.objects.filter(quest__creator=request.user).order_by('-applied_at')
-            serializer = self.get_serializer(applications, many=True)
-            return Response({
-                'results': serializer.data,
-                'count': applications.count()
-            })
+            return self.get_inbox(request, Application.objects.filter(quest__creator=request.user))
+        except (NotFound, ValidationError):
+            raise
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
@@ -236,6 +247,25 @@ class ApplicationViewSet(ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @action(detail=False, methods=['post'])
+    def bulk_decide(self, request):
+        """Approve or reject several applications to your quests at once, with a result per item"""
+        decisions = request.data.get('decisions')
+        if not isinstance(decisions, list) or not decisions:
+            return Response(
+                {'error': 'decisions must be a non-empty list of {"application_id": ..., "decision": "approve" | "reject"}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(decisions) > MAX_ITEMS:
+            return Response(
+                {'error': f'At most {MAX_ITEMS} decisions per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        report = decide(request.user, decisions)
+        logger.info(f"Bulk review by {request.user.username}: {report.approved} approved, {report.rejected} rejected, "
+                    f"{report.auto_rejected} auto-rejected, {report.failed} failed")
+        return Response(report.as_dict())
+    
     @action(detail=False, methods=['get'])
     def check_attempts(self, request):
         """Check application attempt count for a specific quest"""
@@ -257,7 +287,7 @@ class ApplicationViewSet(ModelViewSet):
         
         # Import here to avoid circular imports
         from quests.models import Quest
-        from .models import ApplicationAttempt
+        from .models import ApplicationAttempt, ApplicationState
         
         try:
             quest = Quest.objects.get(id=quest_id)
@@ -270,19 +300,14 @@ class ApplicationViewSet(ModelViewSet):
         # Get attempt information with detailed logging
         logger.info(f"Checking attempts for user {request.user.username} on quest {quest_id}")
         
-        attempt_count = ApplicationAttempt.get_attempt_count(quest, request.user)
-        can_apply, reason = ApplicationAttempt.can_apply_again(quest, request.user)
-        
-        # Get status of last application if any
-        last_application = Application.objects.filter(
-            quest=quest, 
-            applicant=request.user
-        ).order_by('-applied_at').first()
-        
-        last_status = last_application.status if last_application else None
+        # One indexed lookup gives the attempt count and the status of the last application
+        state = ApplicationState.lookup(quest, request.user)
+        attempt_count = state.attempt_count if state else 0
+        can_apply, reason = ApplicationAttempt.check_state(state)
+        last_status = (state.latest_status or None) if state else None
         
         # Determine max attempts based on user's history
-        max_attempts = 4  # Default for rejected users
+        max_attempts = ApplicationAttempt.MAX_ATTEMPTS  # Default for rejected users
         if last_status == 'kicked':
             max_attempts = None  # Unlimited for kicked users
         
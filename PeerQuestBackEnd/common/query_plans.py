@@ -0,0 +1,336 @@
+"""
+Query-plan regression checks for the hot read paths.
+
+``HOT_QUERIES`` lists the querysets behind the busiest endpoints (quest board,
+conversation list, message history, notifications, transactions, guild hall),
+built the same way the views build them. ``check_plans`` runs each one against
+a seeded SQLite database and records:
+
+* the ``EXPLAIN QUERY PLAN`` rows
+* any full scans: ``SCAN <table>`` without an index, or an index walk
+  (``SCAN <table> USING INDEX``) that a LIMIT cannot cut short because the
+  query is unbounded or sorts afterwards. An ordered walk of the
+  ``created_at`` index that stops after one page is how the planner should
+  serve "newest first" lists when the filter matches most rows.
+* temp B-tree sorts, which are reported but do not fail the check
+* the median wall time over ``repeat`` runs, compared with the query's budget
+
+``seed`` bulk-creates a synthetic dataset. At ``scale=1.0`` that is 100k quests,
+1M messages and 500k transactions, plus users, conversations, notifications
+and guilds in proportion. Rows go through ``bulk_create``, so no signals fire.
+
+Use ``manage.py check_query_plans`` for the full-size run and its JSON report,
+and quests.tests.QueryPlanRegressionTest for the small-scale check in CI.
+"""
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+import re
+import statistics
+import time
+
+from django.db import connection
+from django.utils import timezone
+
+PAGE_SIZE = 20
+BATCH_SIZE = 5000
+
+# Row counts at scale=1.0
+DATASET = {
+    'users': 5_000,
+    'quests': 100_000,
+    'conversations': 50_000,
+    'messages': 1_000_000,
+    'transactions': 500_000,
+    'notifications': 300_000,
+    'guilds': 5_000,
+}
+
+FULL_SCAN_RE = re.compile(r'\bSCAN (?!CONSTANT ROW)(\w+)(.*)$')
+TEMP_SORT_RE = re.compile(r'USE TEMP B-TREE FOR (.+)$')
+
+
+@dataclass
+class HotQuery:
+    name: str
+    endpoint: str
+    build: object  # callable(sample) -> QuerySet
+    budget_ms: float = 50.0
+    count: bool = False  # time .count() instead of fetching the page
+
+
+@dataclass
+class PlanResult:
+    name: str
+    endpoint: str
+    sql: str
+    plan: list
+    full_scans: list
+    temp_sorts: list
+    median_ms: float
+    budget_ms: float
+    over_budget: bool = field(init=False)
+
+    def __post_init__(self):
+        self.over_budget = self.median_ms > self.budget_ms
+
+    @property
+    def ok(self):
+        return not self.full_scans and not self.over_budget
+
+
+def _quest_board(sample):
+    from quests.models import Quest
+    return Quest.objects.with_board_stats().filter(is_deleted=False).order_by('-created_at')[:PAGE_SIZE]
+
+
+def _open_quest_board(sample):
+    from quests.models import Quest
+    return Quest.objects.with_board_stats().filter(
+        is_deleted=False, status='open', difficulty='adventurer',
+    ).order_by('-created_at')[:PAGE_SIZE]
+
+
+def _my_quests(sample):
+    from quests.models import Quest
+    return Quest.objects.filter(creator_id=sample['user_id'], is_deleted=False).order_by('-created_at')[:PAGE_SIZE]
+
+
+def _conversation_list(sample):
+    from django.db.models import F, FilteredRelation, Q
+    from messaging.models import Conversation
+    user_id = sample['user_id']
+    return Conversation.objects.annotate(
+        membership=FilteredRelation('unread_counters', condition=Q(unread_counters__user=user_id)),
+    ).filter(membership__user=user_id).annotate(
+        my_last_activity_at=F('membership__last_activity_at'),
+    ).select_related('last_message').order_by('-my_last_activity_at')[:PAGE_SIZE]
+
+
+def _message_history(sample):
+    from messaging.history import PAGE_SIZE as HISTORY_PAGE_SIZE
+    from messaging.models import Message
+    return Message.objects.filter(conversation_id=sample['conversation_id']).select_related(
+        'sender', 'recipient',
+    ).order_by('-timestamp', '-id')[:HISTORY_PAGE_SIZE + 1]
+
+
+def _unread_messages(sample):
+    from messaging.models import UnreadCounter
+    return UnreadCounter.objects.filter(conversation_id=sample['conversation_id'], user_id=sample['user_id'])
+
+
+def _notifications(sample):
+    from notifications.models import Notification
+    return Notification.objects.filter(user_id=sample['user_id'])[:PAGE_SIZE]
+
+
+def _unread_notifications(sample):
+    from notifications.models import Notification
+    return Notification.objects.filter(user_id=sample['user_id'], read=False)
+
+
+def _transactions(sample):
+    from transactions.models import Transaction
+    return Transaction.objects.filter(user_id=sample['user_id'])[:PAGE_SIZE]
+
+
+def _guild_hall(sample):
+    from guilds.models import Guild
+    return Guild.objects.filter(privacy='public', allow_discovery=True, show_on_home_page=True)[:PAGE_SIZE]
+
+
+HOT_QUERIES = [
+    HotQuery('quest_board', 'GET /api/quests/quests/', _quest_board),
+    HotQuery('quest_board_filtered', 'GET /api/quests/quests/?status=open&difficulty=adventurer', _open_quest_board),
+    HotQuery('my_quests', 'GET /api/quests/quests/?creator=<id>', _my_quests),
+    HotQuery('conversation_list', 'GET /api/conversations/', _conversation_list),
+    HotQuery('message_history', 'GET /api/conversations/<id>/messages/', _message_history),
+    HotQuery('unread_messages', 'conversation unread_count', _unread_messages, budget_ms=20.0),
+    HotQuery('notifications', 'GET /api/notifications/', _notifications),
+    HotQuery('unread_notifications', 'GET /api/notifications/unread-count/', _unread_notifications,
+             budget_ms=20.0, count=True),
+    HotQuery('transactions', 'GET /api/transactions/transactions/', _transactions),
+    HotQuery('guild_hall', 'GET /api/guilds/', _guild_hall),
+]
+
+
+def _sized(name, scale):
+    return max(int(DATASET[name] * scale), 10)
+
+
+def _bulk(model, rows):
+    model.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+
+def seed(scale=1.0, stdout=None):
+    """Bulk-create the synthetic dataset; returns {table: rows created}."""
+    from guilds.models import Guild
+    from messaging.models import Conversation, Message, UnreadCounter
+    from notifications.models import Notification
+    from quests.models import Quest, QuestCategory
+    from transactions.models import Transaction, TransactionType
+    from users.models import User
+
+    def log(message):
+        if stdout is not None:
+            stdout.write(message)
+
+    now = timezone.now()
+    counts = {name: _sized(name, scale) for name in DATASET}
+
+    _bulk(User, [
+        User(username=f'plan_user_{i}', email=f'plan_user_{i}@example.com', password='!')
+        for i in range(counts['users'])
+    ])
+    user_ids = list(User.objects.filter(username__startswith='plan_user_').values_list('pk', flat=True))
+    log(f"users: {len(user_ids)}")
+
+    categories = QuestCategory.objects.bulk_create([QuestCategory(name=f'Plan category {i}') for i in range(8)])
+    statuses = ['open', 'open', 'in-progress', 'completed']
+    difficulties = [choice for choice, _ in Quest.DIFFICULTY_CHOICES]
+    for start in range(0, counts['quests'], BATCH_SIZE):
+        _bulk(Quest, [
+            Quest(
+                title=f'Plan quest {i}', description='Synthetic quest for query plan checks', slug=f'plan-quest-{i}',
+                category=categories[i % len(categories)], creator_id=user_ids[i % len(user_ids)],
+                status=statuses[i % len(statuses)], difficulty=difficulties[i % len(difficulties)],
+                is_deleted=i % 50 == 0, created_at=now - timedelta(minutes=i),
+            )
+            for i in range(start, min(start + BATCH_SIZE, counts['quests']))
+        ])
+    log(f"quests: {counts['quests']}")
+
+    _bulk(Conversation, [Conversation() for _ in range(counts['conversations'])])
+    conversation_ids = list(Conversation.objects.values_list('pk', flat=True))
+    through = Conversation.participants.through
+    pairs = [
+        (conversation_id, user_ids[i % len(user_ids)], user_ids[(i * 7 + 1) % len(user_ids)])
+        for i, conversation_id in enumerate(conversation_ids)
+    ]
+    _bulk(through, [
+        through(conversation_id=conversation_id, user_id=user_id)
+        for conversation_id, first, second in pairs for user_id in {first, second}
+    ])
+    log(f"conversations: {len(conversation_ids)}")
+
+    for start in range(0, counts['messages'], BATCH_SIZE):
+        rows = []
+        for i in range(start, min(start + BATCH_SIZE, counts['messages'])):
+            conversation_id, first, second = pairs[i % len(pairs)]
+            sender, recipient = (first, second) if i % 2 else (second, first)
+            rows.append(Message(conversation_id=conversation_id, sender_id=sender, recipient_id=recipient,
+                                content=f'Message {i}', is_read=i % 3 != 0))
+        _bulk(Message, rows)
+    log(f"messages: {counts['messages']}")
+    _bulk(UnreadCounter, [
+        UnreadCounter(conversation_id=conversation_id, user_id=user_id, unread_count=i % 5,
+                      last_activity_at=now - timedelta(minutes=i))
+        for i, (conversation_id, first, second) in enumerate(pairs) for user_id in {first, second}
+    ])
+
+    transaction_types = [choice for choice, _ in TransactionType.choices]
+    for start in range(0, counts['transactions'], BATCH_SIZE):
+        _bulk(Transaction, [
+            Transaction(user_id=user_ids[i % len(user_ids)], type=transaction_types[i % len(transaction_types)],
+                        amount=(i % 500) + 1, description=f'Plan transaction {i}')
+            for i in range(start, min(start + BATCH_SIZE, counts['transactions']))
+        ])
+    log(f"transactions: {counts['transactions']}")
+
+    for start in range(0, counts['notifications'], BATCH_SIZE):
+        _bulk(Notification, [
+            Notification(user_id=user_ids[i % len(user_ids)], notif_type='quest_application',
+                         title='Plan notification', message=f'Notification {i}', read=i % 4 != 0)
+            for i in range(start, min(start + BATCH_SIZE, counts['notifications']))
+        ])
+    log(f"notifications: {counts['notifications']}")
+
+    _bulk(Guild, [
+        Guild(name=f'Plan guild {i}', description='Synthetic guild', specialization='development',
+              owner_id=user_ids[i % len(user_ids)], privacy='private' if i % 5 == 0 else 'public')
+        for i in range(counts['guilds'])
+    ])
+    log(f"guilds: {counts['guilds']}")
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return counts
+
+
+def sample_ids():
+    """Ids the hot queries are parameterized with: a busy user and one of their conversations."""
+    from messaging.models import Conversation
+    from users.models import User
+
+    user_id = User.objects.filter(username__startswith='plan_user_').order_by('username').values_list(
+        'pk', flat=True,
+    ).first()
+    conversation_id = Conversation.objects.filter(participants=user_id).values_list('pk', flat=True).first()
+    return {'user_id': user_id, 'conversation_id': conversation_id}
+
+
+def explain(queryset, count=False):
+    """EXPLAIN QUERY PLAN detail rows for ``queryset`` (SQLite)."""
+    if count:
+        # COUNT(*) drops the ordering; explain the access path it actually uses
+        queryset = queryset.order_by().values('pk')
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return sql, [row[-1] for row in cursor.fetchall()]
+
+
+def full_scans(plan, bounded=False):
+    """Tables the plan walks end to end; ``bounded`` means the query has a LIMIT."""
+    sorts_afterwards = any(TEMP_SORT_RE.search(line) for line in plan)
+    scans = []
+    for line in plan:
+        match = FULL_SCAN_RE.search(line)
+        if not match:
+            continue
+        if 'USING' in match.group(2) and bounded and not sorts_afterwards:
+            continue  # ordered index walk that stops at the LIMIT
+        scans.append(match.group(1))
+    return scans
+
+
+def _run(query, queryset):
+    if query.count:
+        return queryset.count()
+    return len(list(queryset))
+
+
+def check_plans(sample=None, repeat=5, budget_factor=1.0, queries=HOT_QUERIES):
+    """[PlanResult] for every hot query; ``budget_factor`` scales all budgets."""
+    if connection.vendor != 'sqlite':
+        raise RuntimeError(f"Query plan checks need SQLite, not {connection.vendor}")
+    sample = sample or sample_ids()
+    results = []
+    for query in queries:
+        queryset = query.build(sample)
+        sql, plan = explain(queryset, count=query.count)
+        _run(query, query.build(sample))  # warm the page cache
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            _run(query, query.build(sample))
+            timings.append((time.perf_counter() - started) * 1000)
+        results.append(PlanResult(
+            name=query.name, endpoint=query.endpoint, sql=sql, plan=plan,
+            full_scans=full_scans(plan, bounded=not query.count and queryset.query.high_mark is not None),
+            temp_sorts=[match.group(1) for line in plan for match in [TEMP_SORT_RE.search(line)] if match],
+            median_ms=round(statistics.median(timings), 3), budget_ms=query.budget_ms * budget_factor,
+        ))
+    return results
+
+
+def report(results, counts=None):
+    """Machine-readable summary suitable for diffing between releases."""
+    return {
+        'generated_at': timezone.now().isoformat(),
+        'database': connection.vendor,
+        'sqlite_version': connection.Database.sqlite_version if connection.vendor == 'sqlite' else None,
+        'dataset': counts,
+        'passed': all(result.ok for result in results),
+        'queries': [dict(asdict(result), ok=result.ok) for result in results],
+    }
@@ -0,0 +1,162 @@
+"""
+Process-local cache for small, rarely changing reference tables (quest
+categories, gold packages, skills, cashout method settings).
+
+Each ``ReferenceDataCache`` keeps its loaded value in process memory. Within
+``ttl`` seconds a lookup is a plain attribute read. After that, one cache
+round trip compares the local copy against a version number in the shared
+cache backend. Saves and deletes of the source models bump that version on
+commit, so every worker reloads within ``ttl``; the process that made the
+change reloads immediately. A reload first tries the shared cache entry for
+the new version and only falls back to the database loader when no worker
+has stored it yet.
+
+Hit/miss counters are kept per process and added to shared totals at each
+version check; the admin changelists of the source models display them.
+They are approximate by design (no locking on the hot path).
+"""
+from collections import Counter
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+LOCAL_TTL = 30
+SHARED_TTL = 24 * 60 * 60
+COUNTERS = ('hits', 'shared_hits', 'misses')
+
+
+class ReferenceDataCache:
+    registry = {}
+
+    def __init__(self, name, load, models, ttl=LOCAL_TTL):
+        """``load()`` builds the value from the database; ``models`` are 'app_label.Model' senders."""
+        self.name = name
+        self.load = load
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self._value = None
+        self._version = None
+        self._checked_at = 0.0
+        self._pending = Counter()
+        self.registry[name] = self
+        for model in models:
+            post_save.connect(self._changed, sender=model, weak=False, dispatch_uid=f'refdata-save-{name}-{model}')
+            post_delete.connect(self._changed, sender=model, weak=False, dispatch_uid=f'refdata-delete-{name}-{model}')
+
+    @property
+    def _version_key(self):
+        return f'refdata:{self.name}:version'
+
+    def _data_key(self, version):
+        return f'refdata:{self.name}:{version}'
+
+    def _counter_key(self, counter):
+        return f'refdata:{self.name}:{counter}'
+
+    def get(self):
+        value = self._value
+        if value is not None and time.monotonic() - self._checked_at < self.ttl:
+            self._pending['hits'] += 1
+            return value
+        with self.lock:
+            return self._refresh()
+
+    def _refresh(self):
+        version = cache.get(self._version_key)
+        if version is None:
+            cache.add(self._version_key, 1, timeout=None)
+            version = cache.get(self._version_key) or 1
+
+        if self._value is not None and version == self._version:
+            self._pending['hits'] += 1
+        else:
+            value = cache.get(self._data_key(version))
+            if value is None:
+                value = self.load()
+                logger.debug(f"Loaded reference data '{self.name}' (version {version})")
+                cache.set(self._data_key(version), value, timeout=SHARED_TTL)
+                self._pending['misses'] += 1
+            else:
+                self._pending['shared_hits'] += 1
+            self._value, self._version = value, version
+        self._checked_at = time.monotonic()
+        self._flush_counters()
+        return self._value
+
+    def _flush_counters(self):
+        pending, self._pending = self._pending, Counter()
+        for counter, count in pending.items():
+            key = self._counter_key(counter)
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                if not cache.add(key, count, timeout=None):
+                    cache.incr(key, count)
+
+    def invalidate(self):
+        """Drop the local copy and move every worker onto a new version."""
+        with self.lock:
+            self._value = None
+            try:
+                cache.incr(self._version_key)
+            except ValueError:
+                cache.add(self._version_key, 1, timeout=None)
+                cache.incr(self._version_key)
+
+    def _changed(self, sender, **kwargs):
+        transaction.on_commit(self.invalidate)
+
+    def stats(self):
+        """Shared hit/miss totals plus this process's unflushed counts."""
+        totals = cache.get_many([self._counter_key(counter) for counter in COUNTERS])
+        stats = {counter: totals.get(self._counter_key(counter), 0) + self._pending[counter] for counter in COUNTERS}
+        lookups = sum(stats.values())
+        stats['hit_rate'] = (stats['hits'] + stats['shared_hits']) / lookups if lookups else None
+        stats['version'] = self._version
+        return stats
+
+
+def _load_quest_categories():
+    from quests.models import QuestCategory
+    return dict(QuestCategory.objects.order_by('name').values_list('id', 'name'))
+
+
+def _load_gold_packages():
+    from payments.models import GoldPackage
+    from payments.serializers import GoldPackageSerializer
+    packages = GoldPackage.objects.filter(is_active=True).order_by('price_php')
+    return [dict(package) for package in GoldPackageSerializer(packages, many=True).data]
+
+
+def _load_skills_by_category():
+    from users.models import Skill
+    skills_by_category = {}
+    for skill in Skill.objects.filter(is_active=True).order_by('category', 'name'):
+        skills_by_category.setdefault(skill.category, []).append({
+            'id': str(skill.id),
+            'name': skill.name,
+            'description': skill.description,
+        })
+    return skills_by_category
+
+
+def _load_cashout_methods():
+    from transactions.models import CashoutMethodConfig
+    return {
+        config['method']: config
+        for config in CashoutMethodConfig.objects.values(
+            'id', 'method', 'display_name', 'minimum_amount', 'maximum_amount', 'is_active',
+        )
+    }
+
+
+quest_categories = ReferenceDataCache('quest_categories', _load_quest_categories, ['quests.QuestCategory'])
+gold_packages = ReferenceDataCache('gold_packages', _load_gold_packages, ['payments.GoldPackage'])
+skills_by_category = ReferenceDataCache('skills_by_category', _load_skills_by_category, ['users.Skill'])
+cashout_methods = ReferenceDataCache('cashout_methods', _load_cashout_methods, ['transactions.CashoutMethodConfig'])
@@ -0,0 +1,6 @@
+"""Helpers shared by the apps' test suites."""
+from users.models import User
+
+
+def make_user(username, **extra):
+    return User.objects.create(username=username, email=f'{username}@example.com', **extra)
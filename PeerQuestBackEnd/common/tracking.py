@@ -0,0 +1,78 @@
+"""
+Field-change tracking for model instances.
+
+``FieldTrackerMixin`` snapshots the ``tracked_fields`` of an instance when it
+is loaded from the database (``from_db``) and again after every save, so
+``save()`` overrides and signal receivers can ask ``has_changed('status')`` or
+``loaded_value('status')`` instead of re-reading the row. The snapshot is
+refreshed only after ``Model.save()`` returns, so pre_save and post_save
+receivers still see the values the row had before the save.
+
+Foreign keys are tracked by their ``*_id`` column and never trigger a query.
+A field whose loaded value is unknown (a new instance, an instance built in
+Python rather than loaded, or a field deferred by ``.only()``) reports as
+changed, and ``loaded_value()`` returns the given default for it.
+"""
+
+
+class FieldTrackerMixin:
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    @classmethod
+    def _tracked_attnames(cls):
+        return [cls._meta.get_field(name).attname for name in cls.tracked_fields]
+
+    def _snapshot_tracked_fields(self, fields=None):
+        deferred = self.get_deferred_fields()
+        snapshot = getattr(self, '_loaded_values', None)
+        if snapshot is None or fields is None:
+            snapshot = {}
+        for attname in self._tracked_attnames():
+            if fields is not None and attname not in fields:
+                continue
+            if attname not in deferred:
+                snapshot[attname] = getattr(self, attname)
+        self._loaded_values = snapshot
+
+    def is_tracked(self, field):
+        """True when the value ``field`` was loaded (or last saved) with is known."""
+        attname = self._meta.get_field(field).attname
+        return not self._state.adding and attname in getattr(self, '_loaded_values', {})
+
+    def loaded_value(self, field, default=None):
+        """The value ``field`` had when the instance was loaded or last saved."""
+        if not self.is_tracked(field):
+            return default
+        return self._loaded_values[self._meta.get_field(field).attname]
+
+    def has_changed(self, field):
+        if not self.is_tracked(field):
+            return True
+        attname = self._meta.get_field(field).attname
+        return self._loaded_values[attname] != getattr(self, attname)
+
+    def changed_fields(self):
+        """{field: loaded value} for every tracked field that has changed."""
+        return {name: self.loaded_value(name) for name in self.tracked_fields if self.has_changed(name)}
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self._snapshot_tracked_fields()
+        else:
+            self._snapshot_tracked_fields({self._meta.get_field(name).attname for name in update_fields})
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        fields = kwargs.get('fields')
+        if fields is None:
+            self._snapshot_tracked_fields()
+        else:
+            self._snapshot_tracked_fields({self._meta.get_field(name).attname for name in fields})
@@ -82,3 +82,17 @@ class EnhancedModelAdmin(admin.ModelAdmin):
         if 'id' not in list_display:
             list_display.insert(0, 'id')
         return list_display
+
+class ReferenceDataAdminMixin:
+    """
+    Show the hit/miss counters of a common.reference_data cache above the changelist
+    """
+    reference_cache = None
+    change_list_template = 'admin/reference_data_change_list.html'
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = extra_context or {}
+        if self.reference_cache is not None:
+            extra_context['reference_cache_name'] = self.reference_cache.name
+            extra_context['reference_cache_stats'] = self.reference_cache.stats()
+        return super().changelist_view(request, extra_context)
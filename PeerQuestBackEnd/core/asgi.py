@@ -18,6 +18,7 @@ django_asgi_app = get_asgi_application()
 # Import WebSocket routing
 import messaging.routing
 import guilds.routing  # ✅ NEW
+import core.routing  # Quest topics, application and notification WS routes
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
@@ -25,7 +26,8 @@ application = ProtocolTypeRouter({
         JWTAuthMiddleware(
             URLRouter(
                 messaging.routing.websocket_urlpatterns +  # ✅ Messaging WS routes
-                guilds.routing.websocket_urlpatterns        # ✅ Guild WS routes
+                guilds.routing.websocket_urlpatterns +      # ✅ Guild WS routes
+                core.routing.websocket_urlpatterns          # Quest / application / notification WS routes
             )
         )
     ),
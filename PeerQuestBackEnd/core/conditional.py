@@ -0,0 +1,38 @@
+"""
+Conditional GET (ETag / Last-Modified) helpers for DRF views.
+
+Views compute a cheap fingerprint of what the full response would contain
+(timestamps, counters, version numbers) *before* running serializers. When the
+client's ``If-None-Match`` / ``If-Modified-Since`` still matches, the view
+returns ``304 Not Modified`` straight away; otherwise it builds the response as
+usual and stamps the validators on it with ``set_validators()``.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def set_validators(response, etag, last_modified=None):
+    """Attach ETag/Last-Modified and make clients revalidate before reusing the body."""
+    response['ETag'] = quote_etag(etag)
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Return a 304 (or 412 for a failed ``If-Match``) response when the client's
+    validators match ``etag`` / ``last_modified`` (a datetime), otherwise None.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    response = get_conditional_response(request, etag=quote_etag(etag), last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
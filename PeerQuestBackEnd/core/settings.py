@@ -1,5 +1,6 @@
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 from corsheaders.defaults import default_headers
 from datetime import timedelta # Moved import to top for consistency
@@ -72,6 +73,7 @@ MIDDLEWARE = [
     'users.email_verification_middleware.EmailVerificationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'quests.unit_of_work.UnitOfWorkMiddleware',
 ]
 
 # URL Configuration
@@ -116,6 +118,34 @@ CHANNEL_LAYERS = {
 # Celery config (use REDIS_URL if set)
 CELERY_BROKER_URL = REDIS_URL
 
+# Cache (versioned quest board responses, count estimates): Redis in production,
+# in-process locmem when running tests or with CACHE_BACKEND=locmem
+if os.environ.get('CACHE_BACKEND', 'redis') == 'locmem' or 'test' in sys.argv:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'peerquest',
+        }
+    }
+
+# Deadline sweeper (quests.deadlines): seconds between in-process sweeps, 0 to rely on
+# `manage.py sweep_quest_deadlines` from cron instead
+QUEST_DEADLINE_SWEEP_INTERVAL = int(os.environ.get('QUEST_DEADLINE_SWEEP_INTERVAL', '0'))
+
+# Application count pushes on quest.<id> topics (quests.topics): seconds to coalesce changes per quest,
+# 0 to push after every commit
+QUEST_COUNT_PUSH_WINDOW = float(os.environ.get('QUEST_COUNT_PUSH_WINDOW', '1.0'))
+
+# Leaderboards (xp.leaderboards): 'redis' uses REDIS_URL, 'memory' keeps boards in-process (tests/local dev)
+LEADERBOARD_BACKEND = 'memory' if 'test' in sys.argv else os.environ.get('LEADERBOARD_BACKEND', 'redis')
+
 # Database config (use DATABASE_URL if set, fallback to Docker Compose/MySQL env vars)
 DATABASE_URL = os.environ.get('DATABASE_URL')
 if DATABASE_URL:
@@ -61,6 +61,8 @@ urlpatterns = [
     path('api/conversations/start/', StartConversationView.as_view(), name='start-conversation'),
     # Notifications API
     path('api/notifications/', include('notifications.urls')),
+    # Leaderboards API
+    path('api/leaderboards/', include('xp.urls')),
 
     # API Docs (Swagger + Redoc)
     path('api-auth/', include('rest_framework.urls', namespace='rest_framework')),
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('guilds', '0005_merge_20250713_1642'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='guild',
+            index=models.Index(fields=['privacy', 'created_at'], name='guilds_guil_privacy_aa6182_idx'),
+        ),
+    ]
@@ -5,6 +5,8 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 import uuid
 
+from common.tracking import FieldTrackerMixin
+
 User = get_user_model()
 
 class Guild(models.Model):
@@ -95,6 +97,10 @@ class Guild(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Guild Hall listing
+            models.Index(fields=['privacy', 'created_at']),
+        ]
 
     def __str__(self):
         return self.name
@@ -315,7 +321,7 @@ class GuildSocialLink(models.Model):
         return f"{self.guild.name} - {self.platform_name}"
 
 
-class GuildMembership(models.Model):
+class GuildMembership(FieldTrackerMixin, models.Model):
     ROLE_CHOICES = [
         ('owner', 'Owner'),
         ('admin', 'Admin'),
@@ -348,6 +354,8 @@ class GuildMembership(models.Model):
         related_name='approved_memberships'
     )
 
+    tracked_fields = ('status', 'is_active')
+
     class Meta:
         unique_together = ['guild', 'user']
         ordering = ['-joined_at']
@@ -1,8 +1,10 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.conf import settings
 from users.models import UserAchievement, Achievement
-from .models import Guild
+from xp import leaderboards
+from .models import Guild, GuildMembership
 
 @receiver(post_save, sender=Guild)
 def award_guild_leader_achievement(sender, instance, created, **kwargs):
@@ -13,3 +15,23 @@ def award_guild_leader_achievement(sender, instance, created, **kwargs):
             UserAchievement.objects.get_or_create(user=instance.owner, achievement=achievement)
         except Achievement.DoesNotExist:
             pass
+
+
+def _sync_guild_leaderboards(membership, active):
+    def apply():
+        try:
+            leaderboards.sync_guild_membership(membership.user_id, membership.guild_id, active)
+        except Exception as e:
+            leaderboards.logger.error(f"Failed to sync guild leaderboard: {e}")
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=GuildMembership)
+def sync_guild_leaderboards_on_save(sender, instance, **kwargs):
+    if instance.has_changed('is_active'):
+        _sync_guild_leaderboards(instance, instance.is_active)
+
+
+@receiver(post_delete, sender=GuildMembership)
+def sync_guild_leaderboards_on_delete(sender, instance, **kwargs):
+    _sync_guild_leaderboards(instance, False)
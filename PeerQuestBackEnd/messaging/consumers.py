@@ -8,6 +8,7 @@ from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 from messaging.models import Message, Conversation, UserPresence
 from messaging.serializers import MessageSerializer
+from messaging.history import PAGE_SIZE, InvalidCursor, clamp_limit, history_page
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -114,9 +115,10 @@ def mark_message_read(message_id):
     return msg
 
 @database_sync_to_async
-def fetch_initial_messages(conversation_id, limit=50):
-    msgs = Message.objects.filter(conversation_id=conversation_id).order_by("timestamp")[:limit]
-    return MessageSerializer(msgs, many=True).data
+def fetch_history(conversation_id, before=None, limit=PAGE_SIZE):
+    # Latest messages (or the page before a cursor), oldest first; same pages as MessageListView
+    page = history_page(conversation_id, before=before, limit=limit)
+    return MessageSerializer(page.messages, many=True).data, page.before
 
 @database_sync_to_async
 def serialize_message(message):
@@ -160,8 +162,8 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
 
         # ✅ Fetch and send initial messages
         try:
-            initial = await fetch_initial_messages(self.conversation_id)
-            await self.send_json({"type": "initial_messages", "messages": initial})
+            initial, before = await fetch_history(self.conversation_id)
+            await self.send_json({"type": "initial_messages", "messages": initial, "before": before})
         except Exception as e:
             logger.error(f"Error fetching initial messages for conversation {self.conversation_id}: {e}")
 
@@ -262,6 +264,8 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
                 await self.handle_typing(data)
             elif typ == "read_receipt":
                 await self.handle_read_receipt(data)
+            elif typ == "load_history":
+                await self.handle_load_history(data)
         except Exception as e:
             logger.error(f"Exception in receive: {e}", exc_info=True)
             # Optionally, send error to client or just log
@@ -354,6 +358,18 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         )
 
 
+    async def handle_load_history(self, data):
+        # Backward scroll: {"type": "load_history", "before": <cursor from the last page>}
+        try:
+            messages, before = await fetch_history(
+                self.conversation_id, before=data.get("before"), limit=clamp_limit(data.get("limit")),
+            )
+        except InvalidCursor:
+            await self.send_json({"type": "error", "detail": "Invalid cursor"})
+            return
+        await self.send_json({"type": "history", "messages": messages, "before": before})
+
+
     async def handle_read_receipt(self, data):
         mid = data.get("message_id")
         user = self.scope["user"]
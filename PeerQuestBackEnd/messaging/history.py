@@ -0,0 +1,95 @@
+"""
+Cursor-paginated message history, shared by MessageListView and
+ChatConsumer's initial load.
+
+Messages are addressed by their ``(timestamp, id)`` sort key, so every page is
+one range scan of the ``(conversation, timestamp, id)`` index, whether a chat
+has ten messages or 100k. The default page is the latest ``limit`` messages.
+``before=<cursor>`` walks back towards the start of the chat and
+``after=<cursor>`` forward towards the live end. Each page is returned oldest
+first, together with the cursors for its neighbours. A cursor is ``None``
+when there is nothing further in that direction.
+
+Cursors are opaque base64-encoded JSON, like the quest board's.
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+import json
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .models import Message
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class HistoryPage:
+    messages: list  # oldest first
+    before: str = None  # cursor for the next older page
+    after: str = None  # cursor for the next newer page
+
+
+def encode_cursor(message):
+    payload = {'t': message.timestamp.isoformat(), 'id': str(message.pk)}
+    return urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+
+def decode_cursor(encoded):
+    """(timestamp, id) for a cursor string; raises InvalidCursor."""
+    try:
+        payload = json.loads(urlsafe_b64decode(encoded.encode()).decode())
+        timestamp = parse_datetime(payload['t'])
+        message_id = uuid.UUID(payload['id'])
+    except (AttributeError, TypeError, ValueError, KeyError, UnicodeDecodeError):
+        raise InvalidCursor('Invalid cursor')
+    if timestamp is None:
+        raise InvalidCursor('Invalid cursor')
+    return timestamp, message_id
+
+
+def clamp_limit(value, default=PAGE_SIZE):
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        limit = default
+    return min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+def history_page(conversation_id, before=None, after=None, limit=PAGE_SIZE):
+    """
+    One page of a conversation's messages: the latest ``limit`` by default,
+    otherwise the ``limit`` messages just before or after a cursor.
+    """
+    queryset = Message.objects.filter(conversation_id=conversation_id).select_related(
+        'sender__presence', 'recipient__presence',
+    ).prefetch_related('attachments')
+
+    if after:
+        timestamp, message_id = decode_cursor(after)
+        rows = list(queryset.filter(
+            Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=message_id)
+        ).order_by('timestamp', 'id')[:limit + 1])
+        has_newer, has_older = len(rows) > limit, True
+        rows = rows[:limit]
+    else:
+        if before:
+            timestamp, message_id = decode_cursor(before)
+            queryset = queryset.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=message_id))
+        rows = list(queryset.order_by('-timestamp', '-id')[:limit + 1])
+        has_older, has_newer = len(rows) > limit, bool(before)
+        rows = rows[:limit]
+        rows.reverse()
+
+    return HistoryPage(
+        messages=rows,
+        before=encode_cursor(rows[0]) if rows and has_older else None,
+        after=encode_cursor(rows[-1]) if rows and has_newer else None,
+    )
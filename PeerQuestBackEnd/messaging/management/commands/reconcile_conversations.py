@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from messaging.models import Conversation
+
+
+class Command(BaseCommand):
+    help = 'Repair conversation last-message pointers, activity timestamps and unread counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Conversations per transaction')
+        parser.add_argument('--conversation', action='append', dest='conversations', default=[],
+                            help='Only this conversation id (repeatable)')
+
+    def handle(self, *args, **options):
+        queryset = Conversation.objects.order_by('pk').values_list('pk', flat=True)
+        if options['conversations']:
+            queryset = queryset.filter(pk__in=options['conversations'])
+        ids = list(queryset)
+        self.stdout.write(f'Reconciling {len(ids)} conversations...')
+
+        totals = {'conversations': 0, 'counters': 0, 'created': 0, 'deleted': 0}
+        chunk_size = max(options['chunk_size'], 1)
+        for start in range(0, len(ids), chunk_size):
+            fixed = Conversation.reconcile(ids[start:start + chunk_size])
+            for key, value in fixed.items():
+                totals[key] += value
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Fixed {totals['conversations']} conversations and {totals['counters']} counters; "
+            f"created {totals['created']} and deleted {totals['deleted']} counters"
+        ))
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_conversation_counters(apps, schema_editor):
+    """Last message/activity per conversation and one unread counter per participant."""
+    Conversation = apps.get_model('messaging', 'Conversation')
+    Message = apps.get_model('messaging', 'Message')
+    UnreadCounter = apps.get_model('messaging', 'UnreadCounter')
+
+    latest = Message.objects.filter(conversation=models.OuterRef('pk')).order_by('-timestamp', '-pk')
+    Conversation.objects.update(
+        last_message=models.Subquery(latest.values('pk')[:1]),
+        last_activity_at=Coalesce(
+            models.Subquery(latest.values('timestamp')[:1]), models.F('created_at'),
+        ),
+    )
+    activity = dict(Conversation.objects.values_list('pk', 'last_activity_at'))
+    unread = {
+        (conversation_id, user_id): total
+        for conversation_id, user_id, total in Message.objects.filter(is_read=False).order_by().values_list(
+            'conversation_id', 'recipient_id',
+        ).annotate(total=models.Count('pk'))
+    }
+    members = Conversation.participants.through.objects.values_list('conversation_id', 'user_id')
+    UnreadCounter.objects.bulk_create([
+        UnreadCounter(conversation_id=conversation_id, user_id=user_id,
+                      unread_count=unread.get((conversation_id, user_id), 0),
+                      last_activity_at=activity[conversation_id])
+        for conversation_id, user_id in members.iterator(chunk_size=2000)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0004_message_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messaging.message'),
+        ),
+        migrations.CreateModel(
+            name='UnreadCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('last_activity_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('conversation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='unread_counters', to='messaging.conversation')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversation_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'last_activity_at'], name='messaging_u_user_id_9e1fae_idx')],
+                'unique_together': {('conversation', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill_conversation_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0005_conversation_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'timestamp', 'id'], name='messages_convers_5131c6_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='message',
+            name='messages_convers_31a2d0_idx',
+        ),
+    ]
@@ -1,10 +1,14 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils import timezone
-from django.db.models.signals import post_save
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_save
 from django.dispatch import receiver
 import uuid
 
+from common.tracking import FieldTrackerMixin
+
 class Conversation(models.Model):
     """
     Represents a conversation between multiple users.
@@ -20,6 +24,16 @@ class Conversation(models.Model):
     # Add conversation metadata
     is_group = models.BooleanField(default=False)
     name = models.CharField(max_length=100, blank=True, null=True)  # For group chats
+
+    # Denormalized by Message.save (see record_message); `manage.py reconcile_conversations` repairs drift
+    last_message = models.ForeignKey(
+        'Message',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    last_activity_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
         ordering = ['-updated_at']
@@ -36,7 +50,7 @@ class Conversation(models.Model):
 
     def get_last_message(self):
         """Get the most recent message in this conversation"""
-        return self.messages.order_by('-timestamp').first()
+        return self.last_message
 
     def update_timestamp(self):
         """Update the conversation timestamp to now"""
@@ -60,8 +74,132 @@ class Conversation(models.Model):
         
         return conversation
 
+    @classmethod
+    def record_message(cls, message):
+        """
+        Point the conversation at a new message and bump every participant's activity
+        and the recipient's unread counter. Plain UPDATEs with F() expressions, so
+        concurrent senders can't lose increments.
+        """
+        now = timezone.now()
+        # An older message committing late must not replace a newer pointer
+        cls.objects.filter(pk=message.conversation_id).filter(
+            Q(last_message__isnull=True) | Q(last_activity_at__lte=message.timestamp)
+        ).update(last_message=message, last_activity_at=message.timestamp, updated_at=now)
+        UnreadCounter.objects.filter(conversation_id=message.conversation_id).update(
+            last_activity_at=Greatest(F('last_activity_at'), Value(message.timestamp)),
+            unread_count=Case(
+                When(user_id=message.recipient_id, then=F('unread_count') + 1),
+                default=F('unread_count'),
+                output_field=models.PositiveIntegerField(),
+            ),
+        )
+
+    @classmethod
+    def reconcile(cls, conversation_ids):
+        """
+        Recompute last_message, last_activity_at and the unread counters of the given
+        conversations from their messages, fixing only rows that drifted. The
+        conversation and counter rows are locked first, so live sends and reads
+        wait and then apply on top of the repaired values.
+        Returns {'conversations': fixed, 'counters': fixed, 'created': n, 'deleted': n}.
+        """
+        latest = Message.objects.filter(conversation=OuterRef('pk')).order_by('-timestamp', '-pk')
+        with transaction.atomic():
+            conversations = list(
+                cls.objects.select_for_update().filter(pk__in=conversation_ids).annotate(
+                    true_last=Subquery(latest.values('pk')[:1]),
+                    true_activity=Subquery(latest.values('timestamp')[:1]),
+                ).order_by('pk')
+            )
+            counters = {
+                (counter.conversation_id, counter.user_id): counter
+                for counter in UnreadCounter.objects.select_for_update().filter(conversation_id__in=conversation_ids)
+            }
+            unread = {
+                (conversation_id, user_id): total
+                for conversation_id, user_id, total in Message.objects.filter(
+                    conversation_id__in=conversation_ids, is_read=False,
+                ).order_by().values_list('conversation_id', 'recipient_id').annotate(total=Count('pk'))
+            }
+            members = set(cls.participants.through.objects.filter(
+                conversation_id__in=conversation_ids,
+            ).values_list('conversation_id', 'user_id'))
+
+            fixed_conversations = []
+            activity = {}
+            for conversation in conversations:
+                last_activity = conversation.true_activity or conversation.created_at
+                activity[conversation.pk] = last_activity
+                if conversation.last_message_id != conversation.true_last or conversation.last_activity_at != last_activity:
+                    conversation.last_message_id = conversation.true_last
+                    conversation.last_activity_at = last_activity
+                    fixed_conversations.append(conversation)
+            cls.objects.bulk_update(fixed_conversations, ['last_message', 'last_activity_at'])
+
+            fixed_counters, missing = [], []
+            for key in members:
+                conversation_id, user_id = key
+                if conversation_id not in activity:
+                    continue
+                count, last_activity = unread.get(key, 0), activity[conversation_id]
+                counter = counters.get(key)
+                if counter is None:
+                    missing.append(UnreadCounter(conversation_id=conversation_id, user_id=user_id,
+                                                 unread_count=count, last_activity_at=last_activity))
+                elif counter.unread_count != count or counter.last_activity_at != last_activity:
+                    counter.unread_count, counter.last_activity_at = count, last_activity
+                    fixed_counters.append(counter)
+            UnreadCounter.objects.bulk_update(fixed_counters, ['unread_count', 'last_activity_at'])
+            UnreadCounter.objects.bulk_create(missing)
+            stale = [counter.pk for key, counter in counters.items() if key not in members]
+            UnreadCounter.objects.filter(pk__in=stale).delete()
+        return {
+            'conversations': len(fixed_conversations),
+            'counters': len(fixed_counters),
+            'created': len(missing),
+            'deleted': len(stale),
+        }
+
+
+class UnreadCounter(models.Model):
+    """
+    One row per conversation participant: their unread message count and the
+    conversation's last activity. The conversation list reads these rows in
+    (user, last_activity_at) index order instead of counting messages per
+    conversation.
+    """
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name='unread_counters'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='conversation_counters'
+    )
+    unread_count = models.PositiveIntegerField(default=0)
+    last_activity_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('conversation', 'user')
+        indexes = [
+            models.Index(fields=['user', 'last_activity_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} in {self.conversation_id}: {self.unread_count} unread"
+
+    @classmethod
+    def message_read(cls, message):
+        """Take one unread message off the recipient's counter."""
+        cls.objects.filter(
+            conversation_id=message.conversation_id, user_id=message.recipient_id, unread_count__gt=0,
+        ).update(unread_count=F('unread_count') - 1)
+
 
-class Message(models.Model):
+class Message(FieldTrackerMixin, models.Model):
     """
     Represents a single message in a conversation.
     """
@@ -123,12 +261,15 @@ class Message(models.Model):
         related_name='replies'
     )
 
+    tracked_fields = ('content',)
+
     class Meta:
         db_table = "messages"
         ordering = ["-timestamp"]
         indexes = [
             models.Index(fields=['sender', 'recipient']),
-            models.Index(fields=['conversation', 'timestamp']),
+            # History pages seek on (timestamp, id) within a conversation (messaging.history)
+            models.Index(fields=['conversation', 'timestamp', 'id']),
             models.Index(fields=['is_read']),
         ]
 
@@ -136,19 +277,33 @@ class Message(models.Model):
         return f"Message {self.id}: {self.sender.username} → {self.recipient.username}"
 
     def save(self, *args, **kwargs):
-        if not self.conversation:
+        if not self.conversation_id:
             self.conversation = Conversation.get_or_create_conversation(
                 self.sender, self.recipient
             )
-        super().save(*args, **kwargs)
-        self.conversation.update_timestamp()
+        # Read/delivery receipts are not conversation activity
+        is_new = self._state.adding
+        is_activity = self.has_changed('content')
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if is_new:
+                Conversation.record_message(self)
+            elif is_activity:
+                self.conversation.update_timestamp()
 
     def mark_as_read(self):
         if not self.is_read:
+            read_at = timezone.now()
+            with transaction.atomic():
+                # Conditional UPDATE: concurrent receipts for one message decrement the counter once
+                updated = Message.objects.filter(pk=self.pk, is_read=False).update(
+                    is_read=True, status='read', read_at=read_at,
+                )
+                if updated:
+                    UnreadCounter.message_read(self)
             self.is_read = True
             self.status = 'read'
-            self.read_at = timezone.now()
-            self.save(update_fields=['is_read', 'status', 'read_at'])
+            self.read_at = read_at
 
     def get_preview(self, max_length=50):
         return self.content if len(self.content) <= max_length else self.content[:max_length] + "..."
@@ -265,6 +420,28 @@ class UserPresence(models.Model):
 
 
 
+@receiver(m2m_changed, sender=Conversation.participants.through)
+def sync_unread_counters(sender, instance, action, reverse, pk_set, **kwargs):
+    """Give each participant an UnreadCounter row and drop it when they leave."""
+    if action == 'post_add' and pk_set:
+        if reverse:
+            conversations = Conversation.objects.filter(pk__in=pk_set).values_list('pk', 'last_activity_at')
+            rows = [(conversation_id, instance.pk, activity) for conversation_id, activity in conversations]
+        else:
+            rows = [(instance.pk, user_id, instance.last_activity_at) for user_id in pk_set]
+        UnreadCounter.objects.bulk_create([
+            UnreadCounter(conversation_id=conversation_id, user_id=user_id, last_activity_at=activity)
+            for conversation_id, user_id, activity in rows
+        ], ignore_conflicts=True)
+    elif action == 'post_remove' and pk_set:
+        if reverse:
+            UnreadCounter.objects.filter(user_id=instance.pk, conversation_id__in=pk_set).delete()
+        else:
+            UnreadCounter.objects.filter(conversation_id=instance.pk, user_id__in=pk_set).delete()
+    elif action == 'post_clear':
+        UnreadCounter.objects.filter(**{'user_id' if reverse else 'conversation_id': instance.pk}).delete()
+
+
 # Signal to create UserPresence when user is created
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_presence(sender, instance, created, **kwargs):
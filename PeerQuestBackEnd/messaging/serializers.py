@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Message, Conversation, MessageAttachment, UserPresence
+from .models import Message, Conversation, MessageAttachment, UnreadCounter, UserPresence
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -60,7 +60,7 @@ class MessageSerializer(serializers.ModelSerializer):
     read = serializers.BooleanField(source='is_read', read_only=True)
     status = serializers.CharField(read_only=True)  # ⬅ Add this for the chat bubble + message list
     attachments = MessageAttachmentSerializer(many=True, read_only=True)
-    conversation_id = serializers.UUIDField(source='conversation.id', read_only=True)  # ⬅ Needed for grouping
+    conversation_id = serializers.UUIDField(read_only=True)  # ⬅ Needed for grouping
 
     class Meta:
         model = Message
@@ -87,7 +87,7 @@ class ConversationSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Conversation
-        fields = ['id', 'participants', 'last_message', 'unread_count', 'is_group', 'name', 'updated_at']
+        fields = ['id', 'participants', 'last_message', 'unread_count', 'is_group', 'name', 'updated_at', 'last_activity_at']
     
     def get_last_message(self, obj):
         
@@ -98,11 +98,14 @@ class ConversationSerializer(serializers.ModelSerializer):
 
     
     def get_unread_count(self, obj):
+        # The conversation list annotates the requesting user's counter
+        annotated = getattr(obj, 'my_unread_count', None)
+        if annotated is not None:
+            return annotated
         request = self.context.get('request')
-        if request and request.user:
-            return Message.objects.filter(
+        if request and request.user and request.user.is_authenticated:
+            return UnreadCounter.objects.filter(
                 conversation=obj,
-                recipient=request.user,
-                is_read=False
-            ).count()
+                user=request.user
+            ).values_list('unread_count', flat=True).first() or 0
         return 0
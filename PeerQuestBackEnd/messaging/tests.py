@@ -1,3 +1,111 @@
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from common.testing import make_user
+from .models import Conversation, Message, UnreadCounter
+
+
+class ConversationCounterTest(TestCase):
+    def setUp(self):
+        self.alice = make_user('alice')
+        self.bob = make_user('bob')
+        self.conversation = Conversation.get_or_create_conversation(self.alice, self.bob)
+
+    def send(self, sender, recipient, content='hi', conversation=None):
+        return Message.objects.create(conversation=conversation or self.conversation, sender=sender,
+                                      recipient=recipient, content=content)
+
+    def counter(self, user, conversation=None):
+        return UnreadCounter.objects.get(conversation=conversation or self.conversation, user=user)
+
+    def test_counters_follow_messages_and_reads(self):
+        self.assertEqual(UnreadCounter.objects.filter(conversation=self.conversation).count(), 2)
+        first = self.send(self.alice, self.bob)
+        last = self.send(self.alice, self.bob, 'second')
+
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.last_message_id, last.pk)
+        self.assertEqual(self.conversation.last_activity_at, last.timestamp)
+        self.assertEqual((self.counter(self.bob).unread_count, self.counter(self.alice).unread_count), (2, 0))
+        self.assertEqual(self.counter(self.alice).last_activity_at, last.timestamp)
+
+        first.mark_as_read()
+        Message.objects.get(pk=first.pk).mark_as_read()  # a second receipt for the same message
+        self.assertEqual(self.counter(self.bob).unread_count, 1)
+
+    def test_list_is_one_query_per_relation(self):
+        carol = make_user('carol')
+        for i in range(5):
+            other = make_user(f'friend-{i}')
+            conversation = Conversation.get_or_create_conversation(carol, other)
+            self.send(other, carol, f'hello {i}', conversation=conversation)
+        client = APIClient()
+        client.force_authenticate(carol)
+
+        # conversations with counters and last messages, then participants and attachments
+        with self.assertNumQueries(3):
+            response = client.get('/api/conversations/')
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual([row['last_message']['content'] for row in response.data],
+                         [f'hello {i}' for i in reversed(range(5))])
+        self.assertTrue(all(row['unread_count'] == 1 for row in response.data))
+
+    def test_reconcile_repairs_drift(self):
+        message = self.send(self.bob, self.alice)
+        Conversation.objects.filter(pk=self.conversation.pk).update(last_message=None)
+        UnreadCounter.objects.filter(user=self.alice).update(unread_count=7)
+        UnreadCounter.objects.filter(user=self.bob).delete()
+
+        call_command('reconcile_conversations', stdout=open('/dev/null', 'w'))
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.last_message_id, message.pk)
+        self.assertEqual((self.counter(self.alice).unread_count, self.counter(self.bob).unread_count), (1, 0))
+        self.assertEqual(Conversation.reconcile([self.conversation.pk]),
+                         {'conversations': 0, 'counters': 0, 'created': 0, 'deleted': 0})
+
+
+class MessageHistoryTest(TestCase):
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        self.alice = make_user('history-alice')
+        self.bob = make_user('history-bob')
+        self.conversation = Conversation.get_or_create_conversation(self.alice, self.bob)
+        Message.objects.bulk_create([
+            Message(conversation=self.conversation, sender=self.alice, recipient=self.bob, content=f'm{i}')
+            for i in range(25)
+        ])
+        # Pairs share a timestamp so the id tie-breaker matters
+        start = timezone.now() - timedelta(hours=1)
+        for message in Message.objects.all():
+            Message.objects.filter(pk=message.pk).update(timestamp=start + timedelta(seconds=int(message.content[1:]) // 2))
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+        self.url = f'/api/conversations/{self.conversation.pk}/messages/'
+
+    def expected(self):
+        return [m.content for m in Message.objects.filter(conversation=self.conversation).order_by('timestamp', 'id')]
+
+    def test_latest_page_and_backward_scroll(self):
+        expected = self.expected()
+        response = self.client.get(self.url, {'limit': 10})
+        self.assertEqual([m['content'] for m in response.data['results']], expected[-10:])
+        self.assertIsNone(response.data['after'])
+
+        seen = [m['content'] for m in response.data['results']]
+        before = response.data['before']
+        while before:
+            with self.assertNumQueries(3):  # membership check, the page with its users, attachments
+                response = self.client.get(self.url, {'limit': 10, 'before': before})
+            seen = [m['content'] for m in response.data['results']] + seen
+            before = response.data['before']
+        self.assertEqual(seen, expected)
+
+        # And forward again from the oldest page
+        response = self.client.get(self.url, {'limit': 10, 'after': response.data['after']})
+        self.assertEqual([m['content'] for m in response.data['results']], expected[5:15])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(self.url, {'before': 'nope'}).status_code, 404)
@@ -5,10 +5,12 @@ from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.utils import timezone
-from .models import Message, Conversation, MessageAttachment, UserPresence
+from .models import Message, Conversation, MessageAttachment, UnreadCounter, UserPresence
 from .serializers import MessageSerializer, ConversationSerializer, MessageAttachmentSerializer
+from .history import InvalidCursor, clamp_limit, history_page
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 from django.contrib.auth import get_user_model
-from django.db.models import Q, Prefetch
+from django.db.models import F, FilteredRelation, Q, Prefetch
 import uuid
 import logging
 from PIL import Image
@@ -25,12 +27,22 @@ class ConversationListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         user = self.request.user
         logger.info(f"[DEBUG] Fetching conversations for user: {user.id} ({user.username})")
-        return Conversation.objects.filter(
-            participants=user
+        # Walk the user's unread counters in (user, last_activity_at) order; the counter
+        # and last message come along in the same query
+        return Conversation.objects.annotate(
+            membership=FilteredRelation('unread_counters', condition=Q(unread_counters__user=user)),
+        ).filter(
+            membership__user=user
+        ).annotate(
+            my_unread_count=F('membership__unread_count'),
+            my_last_activity_at=F('membership__last_activity_at'),
+        ).select_related(
+            'last_message__sender__presence',
+            'last_message__recipient__presence',
         ).prefetch_related(
-            'participants',
-            Prefetch('messages', queryset=Message.objects.order_by('-timestamp'))
-        ).order_by('-updated_at').distinct()
+            Prefetch('participants', queryset=User.objects.select_related('presence')),
+            'last_message__attachments',
+        ).order_by('-my_last_activity_at')
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -76,6 +88,12 @@ class ConversationListCreateView(generics.ListCreateAPIView):
 class MessageListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    def link(self, request, param, cursor):
+        if cursor is None:
+            return None
+        url = remove_query_param(request.build_absolute_uri(), 'before' if param == 'after' else 'after')
+        return replace_query_param(url, param, cursor)
+
     def get(self, request, conversation_id):
         try:
             user = request.user
@@ -86,16 +104,29 @@ class MessageListView(APIView):
             except Conversation.DoesNotExist:
                 return Response({'error': 'Conversation not found'}, status=404)
 
-            messages = Message.objects.filter(
-                conversation=conversation
-            ).select_related('sender', 'recipient').prefetch_related('attachments').order_by('timestamp')
+            # Latest page by default; ?before= / ?after= cursors page through the history
+            try:
+                page = history_page(
+                    conversation.id,
+                    before=request.query_params.get('before'),
+                    after=request.query_params.get('after'),
+                    limit=clamp_limit(request.query_params.get('limit')),
+                )
+            except InvalidCursor:
+                return Response({'error': 'Invalid cursor'}, status=404)
 
             # Do NOT mark messages as read here. Read status should only be updated via WebSocket read_receipt event.
 
-            logger.info(f"[DEBUG] Found {messages.count()} messages")
+            logger.info(f"[DEBUG] Returning {len(page.messages)} messages")
 
-            serializer = MessageSerializer(messages, many=True, context={'request': request})
-            return Response(serializer.data)
+            serializer = MessageSerializer(page.messages, many=True, context={'request': request})
+            return Response({
+                'previous': self.link(request, 'before', page.before),
+                'next': self.link(request, 'after', page.after),
+                'before': page.before,
+                'after': page.after,
+                'results': serializer.data,
+            })
 
         except Exception as e:
             logger.error(f"[DEBUG] Error in MessageListView: {e}")
@@ -299,11 +330,10 @@ class StartConversationView(APIView):
             'participants': participants,
             'last_message': last_message.content if last_message else '',
             'last_message_date': last_message.timestamp if last_message else conversation.created_at,
-            'unread_count': Message.objects.filter(
+            'unread_count': UnreadCounter.objects.filter(
                 conversation=conversation,
-                recipient=request.user,
-                is_read=False
-            ).count(),
+                user=request.user
+            ).values_list('unread_count', flat=True).first() or 0,
             'is_group': conversation.is_group,
             'name': conversation.name,
         })
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0005_alter_notification_guild_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='notif_type',
+            field=models.CharField(choices=[('quest_application', 'Quest Application'), ('quest_application_result', 'Quest Application Result'), ('kicked_from_quest', 'Kicked From Quest'), ('quest_disabled', 'Quest Disabled'), ('quest_deleted', 'Quest Deleted'), ('guild_event', 'Guild Notification'), ('guild_application_approved', 'Guild Application Approved'), ('guild_application_rejected', 'Guild Application Rejected'), ('guild_warned', 'Guild Warned'), ('guild_disabled', 'Guild Disabled'), ('guild_re_enabled', 'Guild Re-enabled'), ('warning_reset', 'Warning Reset'), ('quest_deadline_reminder', 'Quest Deadline Reminder'), ('quest_overdue', 'Quest Overdue')], max_length=32),
+        ),
+    ]
@@ -15,6 +15,8 @@ class Notification(models.Model):
         ("guild_disabled", "Guild Disabled"),
         ("guild_re_enabled", "Guild Re-enabled"),
         ("warning_reset", "Warning Reset"),
+        ("quest_deadline_reminder", "Quest Deadline Reminder"),
+        ("quest_overdue", "Quest Overdue"),
     ]
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="notifications")
@@ -35,6 +37,10 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=['user', 'read']),
+            models.Index(fields=['user', 'created_at']),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.notif_type} - {self.title}"
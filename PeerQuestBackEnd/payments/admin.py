@@ -4,6 +4,8 @@ from django.urls import reverse
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from common.reference_data import gold_packages
+from core.admin_settings import ReferenceDataAdminMixin
 from .models import PaymentProof, GoldPackage
 
 User = get_user_model()
@@ -309,7 +311,8 @@ class PaymentProofAdmin(admin.ModelAdmin):
 
 
 @admin.register(GoldPackage)
-class GoldPackageAdmin(admin.ModelAdmin):
+class GoldPackageAdmin(ReferenceDataAdminMixin, admin.ModelAdmin):
+    reference_cache = gold_packages
     list_display = [
         'name',
         'gold_amount',
@@ -10,6 +10,7 @@ from django.utils import timezone
 from django.db.models import Q
 from .models import PaymentProof, GoldPackage
 from .serializers import PaymentProofSubmissionSerializer, PaymentProofSerializer, GoldPackageSerializer
+from common.reference_data import gold_packages
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,12 +23,9 @@ class GoldPackagesView(APIView):
     def get(self, request):
         """Get all active gold packages"""
         try:
-            packages = GoldPackage.objects.filter(is_active=True).order_by('price_php')
-            serializer = GoldPackageSerializer(packages, many=True)
-            
             return Response({
                 'success': True,
-                'packages': serializer.data
+                'packages': gold_packages.get()
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django import forms
+from common.reference_data import quest_categories
+from core.admin_settings import ReferenceDataAdminMixin
 from .models import Quest, QuestCategory, QuestParticipant, QuestSubmission, QuestSubmissionAttempt, QuestCompletionLog
 
 
@@ -21,7 +23,8 @@ class QuestAdminForm(forms.ModelForm):
 
 
 @admin.register(QuestCategory)
-class QuestCategoryAdmin(admin.ModelAdmin):
+class QuestCategoryAdmin(ReferenceDataAdminMixin, admin.ModelAdmin):
+    reference_cache = quest_categories
     list_display = ['id', 'name', 'description_preview', 'quest_count', 'created_at']
     search_fields = ['name', 'description']
     ordering = ['name']
@@ -6,3 +6,9 @@ class QuestsConfig(AppConfig):
 
     def ready(self):
         import quests.signals  # This line is required!
+
+        from django.conf import settings
+        interval = getattr(settings, 'QUEST_DEADLINE_SWEEP_INTERVAL', 0)
+        if interval:
+            from .deadlines import start_scheduler
+            start_scheduler(interval)
@@ -1,9 +1,15 @@
 """
 WebSocket consumers for real-time quest and application updates.
+
+Quest and application events are published to per-quest and per-user topics
+(see quests.topics). Clients pick topics with ``?topics=quest.12,quest.15`` on
+connect or by sending ``{"type": "subscribe", "topics": [...]}`` /
+``{"type": "unsubscribe", "topics": [...]}``.
 """
 
 import json
 import logging
+from urllib.parse import parse_qs
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import AnonymousUser
@@ -12,6 +18,8 @@ from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.contrib.auth import get_user_model
 from asgiref.sync import sync_to_async
 
+from .topics import BOARD_GROUP, MAX_SUBSCRIPTIONS, can_subscribe, user_topic
+
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
@@ -38,6 +46,10 @@ class AuthenticatedWebSocketConsumer(AsyncWebsocketConsumer):
     @database_sync_to_async
     def get_user_from_token(self):
         """Extract and validate JWT token from query string."""
+        # JWTAuthMiddleware (core.asgi) has usually resolved the user already
+        scope_user = self.scope.get('user')
+        if scope_user is not None and scope_user.is_authenticated:
+            return scope_user
         try:
             # Get token from query string
             query_string = self.scope.get('query_string', b'').decode('utf-8')
@@ -68,32 +80,138 @@ class AuthenticatedWebSocketConsumer(AsyncWebsocketConsumer):
             return AnonymousUser()
 
 
-class QuestConsumer(AuthenticatedWebSocketConsumer):
+class TopicSubscriptionMixin:
+    """Subscribe a connection to quest.<id> / user.<id> topics on request."""
+
+    def initial_topics(self):
+        """Topics requested with ``?topics=`` on the connection URL."""
+        query = parse_qs(self.scope.get('query_string', b'').decode('utf-8'))
+        return [topic for value in query.get('topics', []) for topic in value.split(',') if topic]
+
+    async def subscribe(self, topics):
+        if not hasattr(self, 'topics'):
+            self.topics = set()
+        added, rejected = [], []
+        for topic in topics:
+            if topic in self.topics:
+                continue
+            if len(self.topics) >= MAX_SUBSCRIPTIONS or not can_subscribe(self.user, topic):
+                rejected.append(topic)
+                continue
+            await self.channel_layer.group_add(topic, self.channel_name)
+            self.topics.add(topic)
+            added.append(topic)
+        return added, rejected
+
+    async def unsubscribe(self, topics):
+        removed = []
+        for topic in topics:
+            if topic in getattr(self, 'topics', ()):
+                await self.channel_layer.group_discard(topic, self.channel_name)
+                self.topics.discard(topic)
+                removed.append(topic)
+        return removed
+
+    async def unsubscribe_all(self):
+        await self.unsubscribe(list(getattr(self, 'topics', ())))
+
+    async def handle_subscription(self, data):
+        """Handle a subscribe/unsubscribe message; returns False for other message types."""
+        topics = data.get('topics')
+        if not isinstance(topics, list):
+            topics = []
+        topics = [topic for topic in topics if isinstance(topic, str)]
+        if data.get('type') == 'subscribe':
+            added, rejected = await self.subscribe(topics)
+            await self.send(text_data=json.dumps({'type': 'subscribed', 'topics': added, 'rejected': rejected}))
+            return True
+        if data.get('type') == 'unsubscribe':
+            removed = await self.unsubscribe(topics)
+            await self.send(text_data=json.dumps({'type': 'unsubscribed', 'topics': removed}))
+            return True
+        return False
+    
+    # Handler for quest status updates sent from signals
+    async def quest_status_changed(self, event):
+        """Send quest status change to WebSocket."""
+        logger.info(f"Quest status changed event received: {event}")
+        await self.send(text_data=json.dumps({
+            'type': 'quest_status_changed',
+            'quest_id': event['quest_id'],
+            'status': event['status'],
+            'timestamp': event['timestamp']
+        }))
+    
+    # Handler for quest application count updates
+    async def quest_application_count_changed(self, event):
+        """Send quest application count change to WebSocket."""
+        await self.send(text_data=json.dumps({
+            'type': 'quest_application_count_changed',
+            'quest_id': event['quest_id'],
+            'application_count': event['application_count'],
+            'timestamp': event['timestamp']
+        }))
+    
+    # Handler for quest submission updates
+    async def quest_submission_updated(self, event):
+        """Send quest submission update to WebSocket."""
+        await self.send(text_data=json.dumps({
+            'type': 'quest_submission_updated',
+            'quest_id': event['quest_id'],
+            'submission_id': event['submission_id'],
+            'status': event['status'],
+            'timestamp': event['timestamp']
+        }))
+    
+    # Handler for application status updates
+    async def application_status_changed(self, event):
+        """Send application status change to WebSocket."""
+        await self.send(text_data=json.dumps({
+            'type': 'application_status_changed',
+            'application_id': event['application_id'],
+            'quest_id': event['quest_id'],
+            'status': event['status'],
+            'timestamp': event['timestamp']
+        }))
+    
+    # Handler for bulk review results (one event per applicant)
+    async def applications_decided(self, event):
+        """Send the user's applications decided in one bulk review."""
+        await self.send(text_data=json.dumps({
+            'type': 'applications_decided',
+            'applications': event['applications'],
+            'timestamp': event['timestamp']
+        }))
+
+
+class QuestConsumer(TopicSubscriptionMixin, AuthenticatedWebSocketConsumer):
     """Consumer for quest-related real-time updates."""
     
     async def connect(self):
-        """Connect to quest updates group."""
+        """Connect to the board group and any topics requested in the query string."""
         await super().connect()
         
         if self.user and not self.user.is_anonymous:
-            # Join quest updates group
-            self.group_name = 'quest_updates'
+            # Board-wide events (deadline batches); per-quest events come through quest.<id> topics
+            self.group_name = BOARD_GROUP
             await self.channel_layer.group_add(
                 self.group_name,
                 self.channel_name
             )
+            await self.subscribe(self.initial_topics())
             logger.info(f"User {self.user.username} joined quest updates group: {self.group_name}")
             logger.info(f"Channel name: {self.channel_name}")
         else:
             logger.warning("Anonymous user tried to connect to quest WebSocket")
     
     async def disconnect(self, close_code):
-        """Disconnect from quest updates group."""
+        """Disconnect from quest updates group and topics."""
         if hasattr(self, 'group_name'):
             await self.channel_layer.group_discard(
                 self.group_name,
                 self.channel_name
             )
+        await self.unsubscribe_all()
         await super().disconnect(close_code)
     
     async def receive(self, text_data):
@@ -105,6 +223,8 @@ class QuestConsumer(AuthenticatedWebSocketConsumer):
             logger.info(f"Quest WebSocket received: {message_type} from {self.user.username}")
             
             # Handle different message types
+            if await self.handle_subscription(data):
+                return
             if message_type == 'quest_status_update':
                 await self.handle_quest_status_update(data)
             elif message_type == 'ping':
@@ -120,62 +240,32 @@ class QuestConsumer(AuthenticatedWebSocketConsumer):
         # This could be used for admin users to update quest status
         pass
     
-    # Handler for quest status updates sent from signals
-    async def quest_status_changed(self, event):
-        """Send quest status change to WebSocket."""
-        logger.info(f"Quest status changed event received: {event}")
-        await self.send(text_data=json.dumps({
-            'type': 'quest_status_changed',
-            'quest_id': event['quest_id'],
-            'status': event['status'],
-            'timestamp': event['timestamp']
-        }))
-    
-    # Handler for quest application count updates
-    async def quest_application_count_changed(self, event):
-        """Send quest application count change to WebSocket."""
-        await self.send(text_data=json.dumps({
-            'type': 'quest_application_count_changed',
-            'quest_id': event['quest_id'],
-            'application_count': event['application_count'],
-            'timestamp': event['timestamp']
-        }))
-    
-    # Handler for quest submission updates
-    async def quest_submission_updated(self, event):
-        """Send quest submission update to WebSocket."""
+    # Handler for batched deadline events from the deadline sweeper
+    async def quest_deadlines_changed(self, event):
+        """Send the quests that just got a deadline reminder or went overdue."""
         await self.send(text_data=json.dumps({
-            'type': 'quest_submission_updated',
-            'quest_id': event['quest_id'],
-            'submission_id': event['submission_id'],
-            'status': event['status'],
+            'type': 'quest_deadlines_changed',
+            'kind': event['kind'],
+            'quest_ids': event['quest_ids'],
             'timestamp': event['timestamp']
         }))
 
 
-class ApplicationConsumer(AuthenticatedWebSocketConsumer):
+class ApplicationConsumer(TopicSubscriptionMixin, AuthenticatedWebSocketConsumer):
     """Consumer for application-related real-time updates."""
     
     async def connect(self):
-        """Connect to application updates group."""
+        """Connect to the user's own topic and any quest topics requested in the query string."""
         await super().connect()
         
         if self.user and not self.user.is_anonymous:
-            # Join user-specific application updates group
-            self.group_name = f'user_applications_{self.user.id}'
-            await self.channel_layer.group_add(
-                self.group_name,
-                self.channel_name
-            )
+            # Join the user's topic for their application status changes
+            await self.subscribe([user_topic(self.user.id)] + self.initial_topics())
             logger.info(f"User {self.user.username} joined application updates group")
     
     async def disconnect(self, close_code):
-        """Disconnect from application updates group."""
-        if hasattr(self, 'group_name'):
-            await self.channel_layer.group_discard(
-                self.group_name,
-                self.channel_name
-            )
+        """Disconnect from application topics."""
+        await self.unsubscribe_all()
         await super().disconnect(close_code)
     
     async def receive(self, text_data):
@@ -186,6 +276,8 @@ class ApplicationConsumer(AuthenticatedWebSocketConsumer):
             
             logger.info(f"Application WebSocket received: {message_type} from {self.user.username}")
             
+            if await self.handle_subscription(data):
+                return
             if message_type == 'ping':
                 await self.send(text_data=json.dumps({'type': 'pong'}))
                 
@@ -193,17 +285,6 @@ class ApplicationConsumer(AuthenticatedWebSocketConsumer):
             logger.error(f"Invalid JSON received in application WebSocket")
         except Exception as e:
             logger.error(f"Error handling application WebSocket message: {e}")
-    
-    # Handler for application status updates
-    async def application_status_changed(self, event):
-        """Send application status change to WebSocket."""
-        await self.send(text_data=json.dumps({
-            'type': 'application_status_changed',
-            'application_id': event['application_id'],
-            'quest_id': event['quest_id'],
-            'status': event['status'],
-            'timestamp': event['timestamp']
-        }))
 
 
 class NotificationConsumer(AuthenticatedWebSocketConsumer):
@@ -0,0 +1,196 @@
+"""
+Deadline sweeper for open and in-progress quests.
+
+Two passes run over the ``(status, due_date)`` index:
+
+* reminders -- quests due within ``REMINDER_DAYS`` whose ``reminder_sent_at``
+  is unset notify the assignee and active participants
+* overdue   -- quests past ``due_date`` whose ``overdue_at`` is unset notify
+  the creator, the assignee and active participants
+
+Each chunk runs in its own short transaction. The transaction locks up to
+``chunk_size`` rows (skipping rows another sweeper holds), stamps them with
+one UPDATE and bulk-creates their notifications. After commit it sends one
+``quest_deadlines_changed`` event to the quest board and one
+``notification_created`` event per recipient. The stamps make a sweep
+idempotent: stamped quests are never picked up again until Quest.save clears
+them because the due date moved.
+
+Run it from cron with ``manage.py sweep_quest_deadlines``, or set
+``QUEST_DEADLINE_SWEEP_INTERVAL`` (seconds) to let each web process start a
+background scheduler thread. A cache lock lets only one process sweep per
+interval.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('open', 'in-progress')
+ACTIVE_PARTICIPANT_STATUSES = ('joined', 'in_progress')
+REMINDER_DAYS = 1
+CHUNK_SIZE = 500
+LOCK_KEY = 'quest-deadline-sweep'
+
+REMINDER = 'reminder'
+OVERDUE = 'overdue'
+
+
+@dataclass
+class SweepResult:
+    reminded: int = 0
+    overdue: int = 0
+    notifications: int = 0
+    chunks: int = 0
+
+
+def due_quests(kind, today=None):
+    """Quests the sweeper still has to process for ``kind`` (REMINDER or OVERDUE)."""
+    from .models import Quest
+
+    today = today or timezone.localdate()
+    queryset = Quest.objects.filter(status__in=ACTIVE_STATUSES, is_deleted=False)
+    if kind == OVERDUE:
+        return queryset.filter(due_date__lt=today, overdue_at__isnull=True)
+    return queryset.filter(
+        due_date__gte=today, due_date__lte=today + timedelta(days=REMINDER_DAYS), reminder_sent_at__isnull=True,
+    )
+
+
+def _recipients(kind, quests):
+    """{quest_id: set(user_id)} to notify for the quests in one chunk."""
+    from .models import QuestParticipant
+
+    recipients = defaultdict(set)
+    for quest in quests:
+        if quest['assigned_to_id']:
+            recipients[quest['pk']].add(quest['assigned_to_id'])
+        if kind == OVERDUE:
+            recipients[quest['pk']].add(quest['creator_id'])
+    participants = QuestParticipant.objects.filter(
+        quest_id__in=[quest['pk'] for quest in quests], status__in=ACTIVE_PARTICIPANT_STATUSES,
+    ).values_list('quest_id', 'user_id')
+    for quest_id, user_id in participants:
+        recipients[quest_id].add(user_id)
+    return recipients
+
+
+def _notification(kind, quest, user_id):
+    from notifications.models import Notification
+
+    if kind == OVERDUE:
+        notif_type, title = 'quest_overdue', 'Quest Overdue'
+        message = f"Quest '{quest['title']}' passed its deadline ({quest['due_date']:%Y-%m-%d})."
+    else:
+        notif_type, title = 'quest_deadline_reminder', 'Quest Deadline Approaching'
+        message = f"Quest '{quest['title']}' is due on {quest['due_date']:%Y-%m-%d}."
+    return Notification(
+        user_id=user_id, notif_type=notif_type, title=title, message=message,
+        quest_id=quest['pk'], quest_title=quest['title'], status=quest['status'],
+    )
+
+
+def _push(kind, quests, notifications):
+    """One board event for the chunk and one notification event per recipient."""
+    from .signals import send_to_group
+    from .topics import BOARD_GROUP
+
+    timestamp = datetime.now().isoformat()
+    send_to_group(BOARD_GROUP, {
+        'type': 'quest_deadlines_changed',
+        'kind': kind,
+        'quest_ids': [quest['pk'] for quest in quests],
+        'timestamp': timestamp,
+    })
+    by_user = defaultdict(list)
+    for notification in notifications:
+        by_user[notification.user_id].append(notification)
+    for user_id, user_notifications in by_user.items():
+        first = user_notifications[0]
+        if len(user_notifications) == 1:
+            title, message = first.title, first.message
+        else:
+            title = first.title
+            message = f"{len(user_notifications)} of your quests need attention before or past their deadline."
+        send_to_group(f'user_notifications_{user_id}', {
+            'type': 'notification_created',
+            'notification_id': f'deadline_{kind}_{first.quest_id}',
+            'title': title,
+            'message': message,
+            'timestamp': timestamp,
+        })
+
+
+def sweep_chunk(kind, today, chunk_size=CHUNK_SIZE):
+    """Process one chunk; returns (quests stamped, notifications created)."""
+    from notifications.models import Notification
+    from .models import Quest
+
+    stamp_field = 'overdue_at' if kind == OVERDUE else 'reminder_sent_at'
+    with transaction.atomic():
+        quests = list(
+            due_quests(kind, today).select_for_update(skip_locked=True).order_by('due_date', 'pk').values(
+                'pk', 'title', 'status', 'due_date', 'creator_id', 'assigned_to_id',
+            )[:chunk_size]
+        )
+        if not quests:
+            return 0, 0
+        Quest.objects.filter(pk__in=[quest['pk'] for quest in quests]).update(**{stamp_field: timezone.now()})
+
+        recipients = _recipients(kind, quests)
+        notifications = [
+            _notification(kind, quest, user_id)
+            for quest in quests for user_id in sorted(recipients[quest['pk']], key=str)
+        ]
+        Notification.objects.bulk_create(notifications, batch_size=chunk_size)
+        transaction.on_commit(lambda: _push(kind, quests, notifications))
+    return len(quests), len(notifications)
+
+
+def sweep(today=None, chunk_size=CHUNK_SIZE):
+    """Run the reminder and overdue passes to completion."""
+    today = today or timezone.localdate()
+    result = SweepResult()
+    for kind in (REMINDER, OVERDUE):
+        while True:
+            stamped, created = sweep_chunk(kind, today, chunk_size)
+            if not stamped:
+                break
+            result.chunks += 1
+            result.notifications += created
+            if kind == OVERDUE:
+                result.overdue += stamped
+            else:
+                result.reminded += stamped
+    if result.chunks:
+        logger.info(f"Deadline sweep: {result.reminded} reminded, {result.overdue} overdue, "
+                    f"{result.notifications} notifications in {result.chunks} chunks")
+    return result
+
+
+def _run_scheduler(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            # Only one process sweeps per interval; the lock expires before the next tick
+            if cache.add(LOCK_KEY, 1, timeout=max(interval - 1, 1)):
+                sweep()
+        except Exception as e:
+            logger.error(f"Quest deadline sweep failed: {e}")
+        finally:
+            close_old_connections()
+
+
+def start_scheduler(interval):
+    """Start the background sweeper thread (called from QuestsConfig.ready)."""
+    thread = threading.Thread(target=_run_scheduler, args=(interval,), name='quest-deadline-sweeper', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,47 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from quests.models import Quest, QuestCategory, QuestParticipant
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Benchmark Quest.complete_quest reward distribution (query count and wall time). All data is rolled back.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100],
+                            help='Participant counts to benchmark')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'participants':>12} {'queries':>8} {'wall ms':>10}")
+        for size in options['sizes']:
+            queries, elapsed = self._run(size)
+            self.stdout.write(f"{size:>12} {queries:>8} {elapsed * 1000:>10.1f}")
+
+    def _run(self, size):
+        with transaction.atomic():
+            tag = uuid.uuid4().hex[:8]
+            creator = User.objects.create(username=f'bench-creator-{tag}', email=f'bench-creator-{tag}@example.com')
+            category = QuestCategory.objects.create(name=f'bench-{tag}')
+            quest = Quest.objects.create(
+                title=f'Reward benchmark {tag}', description='benchmark', creator=creator,
+                category=category, difficulty='mythic', gold_reward=1000, status='in-progress',
+            )
+            users = User.objects.bulk_create([
+                User(username=f'bench-{tag}-{i}', email=f'bench-{tag}-{i}@example.com') for i in range(size)
+            ])
+            QuestParticipant.objects.bulk_create([
+                QuestParticipant(quest=quest, user=user, status='joined') for user in users
+            ])
+
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                quest.complete_quest(completion_reason='benchmark')
+                elapsed = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+        return len(ctx.captured_queries), elapsed
@@ -0,0 +1,63 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from common.query_plans import check_plans, report, seed
+
+
+class Command(BaseCommand):
+    help = ('Seed a throwaway SQLite database with a synthetic dataset, EXPLAIN and time the hot endpoint '
+            'queries, and fail on full table scans or blown time budgets. '
+            'Run with DATABASE_URL=sqlite:///plans.sqlite3.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help='Dataset size relative to 100k quests / 1M messages / 500k transactions')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Timed runs per query (the median is compared with the budget)')
+        parser.add_argument('--budget-factor', type=float, default=1.0,
+                            help='Multiply every time budget, e.g. 2 on slow CI machines')
+        parser.add_argument('--report', default='query_plan_report.json',
+                            help="Where to write the JSON report ('-' for stdout)")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"Query plan checks run on SQLite; the default database is {connection.vendor}. "
+                               f"Set DATABASE_URL=sqlite:///plans.sqlite3")
+
+        # Never seed the configured database: build a separate test database and drop it afterwards.
+        # The schema comes straight from the current models, so index changes are checked before
+        # their migrations exist.
+        connection.settings_dict.setdefault('TEST', {})['MIGRATE'] = False
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.stdout.write(f"Seeding synthetic dataset (scale {options['scale']})...")
+            counts = seed(options['scale'], stdout=self.stdout)
+            results = check_plans(repeat=options['repeat'], budget_factor=options['budget_factor'])
+            data = report(results, counts)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(f"{'query':<24} {'median ms':>10} {'budget':>8}  plan")
+        for result in results:
+            status = 'ok' if result.ok else 'FAIL'
+            notes = []
+            if result.full_scans:
+                notes.append(f"full scan of {', '.join(result.full_scans)}")
+            if result.temp_sorts:
+                notes.append(f"temp sort for {', '.join(result.temp_sorts)}")
+            self.stdout.write(f"{result.name:<24} {result.median_ms:>10.2f} {result.budget_ms:>8.0f}  "
+                              f"{status} {'; '.join(notes)}")
+
+        payload = json.dumps(data, indent=2, default=str)
+        if options['report'] == '-':
+            self.stdout.write(payload)
+        else:
+            with open(options['report'], 'w') as handle:
+                handle.write(payload)
+            self.stdout.write(f"Report written to {options['report']}")
+
+        if not data['passed']:
+            raise CommandError(f"{sum(not result.ok for result in results)} hot queries failed their plan checks")
+        self.stdout.write(self.style.SUCCESS(f"All {len(results)} hot queries use indexes within budget"))
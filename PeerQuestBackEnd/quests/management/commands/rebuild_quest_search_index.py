@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from quests.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the quest full-text search index from the quests table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Number of quests read and indexed per batch')
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        indexed = backend.rebuild(chunk_size=options['chunk_size'])
+        if backend.name in ('mysql', 'icontains'):
+            self.stdout.write(self.style.WARNING(
+                f"The {backend.name} backend maintains its index automatically; nothing to rebuild"
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} quests with the {backend.name} backend"))
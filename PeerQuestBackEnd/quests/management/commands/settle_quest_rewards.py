@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from quests.unit_of_work import settle_completed_participants, unsettled_participants
+
+
+class Command(BaseCommand):
+    help = 'Pay completed quest participants that have no completion log yet (safe to run repeatedly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quest', type=int, action='append', dest='quests', default=[],
+                            help='Only this quest id (repeatable)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only list the participants that would be paid')
+
+    def handle(self, *args, **options):
+        unsettled = unsettled_participants(options['quests'])
+        total = sum(len(user_ids) for user_ids in unsettled.values())
+        if options['dry_run']:
+            for quest_id, user_ids in unsettled.items():
+                self.stdout.write(f"Quest {quest_id}: {len(user_ids)} unpaid participants")
+            self.stdout.write(f"{total} participants in {len(unsettled)} quests need settling")
+            return
+
+        for quest_id, user_ids in unsettled.items():
+            try:
+                settle_completed_participants(quest_id, user_ids)
+            except Exception as exc:
+                self.stderr.write(f"Quest {quest_id}: {exc}")
+        remaining = sum(len(user_ids) for user_ids in unsettled_participants(list(unsettled)).values()) if unsettled else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Settled {total - remaining} participants in {len(unsettled)} quests"
+        ))
+        if remaining:
+            self.stdout.write(self.style.WARNING(f"{remaining} participants could not be settled"))
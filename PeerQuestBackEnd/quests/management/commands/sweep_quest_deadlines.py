@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from quests.deadlines import CHUNK_SIZE, OVERDUE, REMINDER, due_quests, sweep
+
+
+class Command(BaseCommand):
+    help = 'Send deadline reminders and mark overdue quests (safe to run repeatedly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help='Quests locked, stamped and notified per transaction')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only count the quests that would be processed')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(
+                f"{due_quests(REMINDER).count()} quests due for a reminder, "
+                f"{due_quests(OVERDUE).count()} newly overdue"
+            )
+            return
+        result = sweep(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Reminded {result.reminded} quests, marked {result.overdue} overdue, "
+            f"created {result.notifications} notifications in {result.chunks} chunks"
+        ))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.3 on 2026-10-17 11:40
+
+from django.db import migrations
+
+FULLTEXT_INDEX = 'quests_quest_search_ft'
+FTS_TABLE = 'quests_quest_fts'
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'mysql':
+        schema_editor.execute(
+            f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX} ON quests_quest (title, description, requirements)"
+        )
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5(title, description, requirements, tokenize='unicode61')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, requirements) "
+            f"SELECT id, title, description, requirements FROM quests_quest"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'mysql':
+        schema_editor.execute(f"DROP INDEX {FULLTEXT_INDEX} ON quests_quest")
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quests', '0006_questcompletionlog'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
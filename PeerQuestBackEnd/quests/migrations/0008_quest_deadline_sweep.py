@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quests', '0007_quest_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quest',
+            name='overdue_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='quest',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='quest',
+            index=models.Index(fields=['status', 'due_date'], name='quests_ques_status_d8857a_idx'),
+        ),
+    ]
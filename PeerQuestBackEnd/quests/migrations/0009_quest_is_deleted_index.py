@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quests', '0008_quest_deadline_sweep'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quest',
+            index=models.Index(fields=['is_deleted', 'created_at'], name='quests_ques_is_dele_c7398b_idx'),
+        ),
+    ]
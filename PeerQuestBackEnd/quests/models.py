@@ -1,9 +1,12 @@
 from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 import logging
 
+from common.tracking import FieldTrackerMixin
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,8 +22,35 @@ class QuestCategory(models.Model):
         verbose_name_plural = "Quest Categories"
 
 
-class Quest(models.Model):
-    class QuestObjects(models.Manager):
+def _count_subquery(model, **filters):
+    """Correlated ``(SELECT COUNT(*) ... WHERE quest_id = quest.id)`` for annotations."""
+    return Coalesce(
+        models.Subquery(
+            model.objects.filter(quest=models.OuterRef('pk'), **filters)
+            .order_by().values('quest').annotate(total=models.Count('pk')).values('total')[:1],
+            output_field=models.IntegerField(),
+        ),
+        0,
+    )
+
+
+class QuestQuerySet(models.QuerySet):
+    def with_board_stats(self):
+        """
+        Join creator/assignee/category and annotate the participant and pending
+        application counts read by the quest serializers, so listing quests costs
+        a fixed number of queries.
+        """
+        from applications.models import Application
+
+        return self.select_related('creator', 'assigned_to', 'category').annotate(
+            annotated_participant_count=_count_subquery(QuestParticipant),
+            annotated_pending_applications=_count_subquery(Application, status='pending'),
+        )
+
+
+class Quest(FieldTrackerMixin, models.Model):
+    class QuestObjects(models.Manager.from_queryset(QuestQuerySet)):
         def get_queryset(self):
             return super().get_queryset().filter(status='open')
 
@@ -100,6 +130,9 @@ class Quest(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     due_date = models.DateField(null=True, blank=True, help_text="Deadline date for quest completion")
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Set by the deadline sweeper (quests.deadlines); cleared when due_date changes
+    reminder_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
+    overdue_at = models.DateTimeField(null=True, blank=True, editable=False)
     
     # Quest content / FOR CHECKING
     requirements = models.TextField(blank=True, help_text="What needs to be done to complete this quest")
@@ -111,8 +144,11 @@ class Quest(models.Model):
     # Soft delete flag
     is_deleted = models.BooleanField(default=False, help_text="If true, this quest is soft-deleted and hidden from normal queries.")
 
+    # Loaded values remembered by FieldTrackerMixin (status transitions, search reindexing)
+    tracked_fields = ('status', 'title', 'description', 'requirements', 'due_date')
+
     # Custom managers
-    objects = models.Manager()  # Default manager
+    objects = QuestQuerySet.as_manager()  # Default manager
     active_quests = QuestObjects()  # Custom manager for active quests only
 
     class Meta:
@@ -122,6 +158,8 @@ class Quest(models.Model):
             models.Index(fields=['creator', 'status']),
             models.Index(fields=['assigned_to', 'status']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['status', 'due_date']),
+            models.Index(fields=['is_deleted', 'created_at']),
         ]
 
     def __str__(self):
@@ -133,32 +171,54 @@ class Quest(models.Model):
             self.xp_reward = self.DIFFICULTY_XP_MAPPING[self.difficulty]
 
         # Detect status change to 'completed' and trigger reward logic
-        status_changing_to_completed = False
-        if self.pk:
-            old = Quest.objects.get(pk=self.pk)
-            if old.status != 'completed' and self.status == 'completed':
-                status_changing_to_completed = True
+        old_status = None
+        if not self._state.adding:
+            if self.is_tracked('status'):
+                old_status = self.loaded_value('status')
+            else:
+                # Built in Python rather than loaded from the database; read the stored status
+                old_status = Quest.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+        status_changing_to_completed = (
+            old_status is not None and old_status != 'completed' and self.status == 'completed'
+        )
+
+        if self.is_tracked('due_date') and self.has_changed('due_date'):
+            # A moved deadline gets a fresh reminder/overdue cycle from the sweeper. Only
+            # a known loaded value counts: instances built in Python or loaded with
+            # due_date deferred keep their stamps.
+            self.reminder_sent_at = None
+            self.overdue_at = None
 
         if not self.slug:
             from django.utils.text import slugify
             import uuid
             self.slug = f"{slugify(self.title)}-{str(uuid.uuid4())[:8]}"
 
-        super().save(*args, **kwargs)
-
-        # After saving, if status just changed to completed, trigger reward logic
-        if status_changing_to_completed:
-            # Ensure assigned user is a participant
-            if self.assigned_to:
-                from .models import QuestParticipant
-                participant, created = QuestParticipant.objects.get_or_create(
-                    quest=self, user=self.assigned_to,
-                    defaults={'status': 'joined'}
+        # Rewards for this transition are settled by the batched reward engine below;
+        # handle_quest_completion checks this flag so it doesn't pay participants again.
+        self._rewards_pending = status_changing_to_completed
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._rewards_pending = False
+
+            if old_status is not None and old_status != self.status:
+                from transactions.transaction_utils import sync_reserved_gold_for_status_change
+                sync_reserved_gold_for_status_change(self, old_status)
+
+            # After saving, if status just changed to completed, trigger reward logic
+            if status_changing_to_completed:
+                # Ensure assigned user is a participant
+                if self.assigned_to:
+                    participant, created = QuestParticipant.objects.get_or_create(
+                        quest=self, user=self.assigned_to,
+                        defaults={'status': 'joined'}
+                    )
+                    if not created and participant.status not in ('completed', 'joined'):
+                        QuestParticipant.objects.filter(pk=participant.pk).update(status='joined')
+                from .reward_engine import RewardDistributor
+                self._completion_result = RewardDistributor(self).distribute(
+                    completion_reason=getattr(self, '_completion_reason', "Quest completed")
                 )
-                if participant.status != 'completed':
-                    participant.status = 'joined'
-                    participant.save()
-            self.complete_quest()
 
     @property
     def is_completed(self):
@@ -166,8 +226,18 @@ class Quest(models.Model):
 
     @property
     def participant_count(self):
+        annotated = getattr(self, 'annotated_participant_count', None)
+        if annotated is not None:
+            return annotated
         return self.participants.count()
 
+    @property
+    def pending_applications_count(self):
+        annotated = getattr(self, 'annotated_pending_applications', None)
+        if annotated is not None:
+            return annotated
+        return self.applications.filter(status='pending').count()
+
     @property
     def can_accept_participants(self):
         return self.status == 'open'
@@ -346,146 +416,18 @@ class Quest(models.Model):
         """
         Complete the quest and dynamically divide XP and gold among all eligible participants.
         Any remainder is given to the admin account. Rewards are tracked in transaction tables.
-        This version is robust: it rewards all participants who are not dropped, and logs all actions.
+        The settlement itself is done by quests.reward_engine.RewardDistributor in a bounded
+        number of queries, triggered by the status transition in save().
         """
-        from users.models import User
-        from decimal import Decimal
-        import logging
-        logger = logging.getLogger("quest-rewards")
-        from transactions.models import Transaction, TransactionType, UserBalance
-        from .models import QuestParticipant
-        # XP is now tracked in Transaction table as type='REWARD', with a new 'xp' field or as a negative gold value if not supported
-        # For now, we will use Transaction for both XP and Gold, and UserBalance for gold only
-
         if self.status == 'completed':
             logger.warning(f"Quest '{self.title}' is already completed. No rewards distributed.")
             return {"error": "Quest is already completed"}
 
         self.status = 'completed'
         self.completed_at = timezone.now()
+        self._completion_reason = completion_reason
         self.save()
-
-        # Reward all participants who are not dropped
-        participants = QuestParticipant.objects.filter(
-            quest=self,
-            status__in=['joined', 'in_progress', 'approved', 'completed']
-        ).exclude(status='dropped')
-        num_participants = participants.count()
-        if num_participants == 0:
-            logger.warning(f"Quest '{self.title}' has no eligible participants for rewards.")
-            return {"error": "No participants to complete this quest."}
-
-        # Calculate divided rewards
-        xp_per = int(self.xp_reward // num_participants)
-        gold_per = int(self.gold_reward // num_participants)
-        xp_excess = int(self.xp_reward - (xp_per * num_participants))
-        gold_excess = int(self.gold_reward - (gold_per * num_participants))
-
-        # Find admin account (first with is_admin True, fallback to role=ADMIN)
-        admin_user = User.objects.filter(is_admin=True).first()
-        if not admin_user:
-            admin_user = User.objects.filter(role='admin').first()
-
-        completion_results = []
-
-        from .models import QuestCompletionLog
-        for participant in participants:
-            # Mark as completed if not already
-            if participant.status != 'completed':
-                participant.status = 'completed'
-                participant.completed_at = timezone.now()
-                participant.save()
-            user = participant.user
-            # Create Transaction records for XP and Gold (for unified transaction history)
-            Transaction.objects.create(
-                user=user,
-                type=TransactionType.REWARD,
-                amount=Decimal(xp_per),
-                description=f"XP for quest '{self.title}' completion",
-                quest=self
-            )
-            Transaction.objects.create(
-                user=user,
-                type=TransactionType.REWARD,
-                amount=Decimal(gold_per),
-                description=f"Gold for quest '{self.title}' completion",
-                quest=self
-            )
-            # Update UserBalance for gold
-            balance, _ = UserBalance.objects.get_or_create(user=user)
-            balance.gold_balance += Decimal(gold_per)
-            balance.save()
-            # Create QuestCompletionLog if not already exists, with debug logging
-            log_obj, created = QuestCompletionLog.objects.get_or_create(
-                quest=self,
-                adventurer=user,
-                defaults={
-                    'xp_earned': xp_per,
-                    'gold_earned': gold_per,
-                    'completed_at': timezone.now()
-                }
-            )
-            if created:
-                logger.info(f"[QuestCompletionLog] Created for {user.username} on quest '{self.title}' (XP: {xp_per}, Gold: {gold_per})")
-            else:
-                logger.warning(f"[QuestCompletionLog] Already exists for {user.username} on quest '{self.title}'")
-            completion_results.append({
-                "user": user.username,
-                "xp_awarded": xp_per,
-                "gold_awarded": gold_per
-            })
-
-        # Give excess to admin
-        admin_award = None
-        if admin_user and (xp_excess > 0 or gold_excess > 0):
-            if xp_excess > 0:
-                Transaction.objects.create(
-                    user=admin_user,
-                    type=TransactionType.REWARD,
-                    amount=Decimal(xp_excess),
-                    description=f"Excess XP from quest '{self.title}'",
-                    quest=self
-                )
-            if gold_excess > 0:
-                Transaction.objects.create(
-                    user=admin_user,
-                    type=TransactionType.REWARD,
-                    amount=Decimal(gold_excess),
-                    description=f"Excess gold from quest '{self.title}'",
-                    quest=self
-                )
-                balance, _ = UserBalance.objects.get_or_create(user=admin_user)
-                balance.gold_balance += Decimal(gold_excess)
-                balance.save()
-            logger.info(f"Admin {admin_user.username} received excess: {xp_excess} XP, {gold_excess} Gold from quest '{self.title}' (new system)")
-            admin_award = {
-                "user": admin_user.username,
-                "xp_awarded": xp_excess,
-                "gold_awarded": gold_excess
-            }
-
-        logger.info(f"Quest '{self.title}' completed. Rewards distributed to {num_participants} participants. (new system)")
-
-        # Return updated balances for admin/creator if needed
-        admin_balance = None
-        if admin_user:
-            admin_balance = {
-                "xp": int(sum([t.amount for t in Transaction.objects.filter(user=admin_user, description__icontains="XP")])) or 0,
-                "gold": float(UserBalance.objects.get(user=admin_user).gold_balance) if UserBalance.objects.filter(user=admin_user).exists() else 0.0
-            }
-
-        return {
-            "quest_title": self.title,
-            "completion_reason": completion_reason,
-            "participants_completed": num_participants,
-            "xp_per_participant": xp_per,
-            "gold_per_participant": gold_per,
-            "total_xp_awarded": self.xp_reward,
-            "total_gold_awarded": self.gold_reward,
-            "participant_results": completion_results,
-            "admin_award": admin_award,
-            "admin_balance": admin_balance
-        }
+        return getattr(self, '_completion_result', {"error": "Quest is already completed"})
 
     def delete(self, using=None, keep_parents=False):
         # Soft delete: mark as deleted instead of removing from DB.
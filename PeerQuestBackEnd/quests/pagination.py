@@ -0,0 +1,185 @@
+"""
+Keyset (cursor) pagination for quest lists.
+
+Pages are addressed by the sort key of their boundary row instead of an
+OFFSET, so fetching page 500 costs the same index range scan as page 1. The
+sort key is whatever ordering the view applied (``?ordering=`` from
+``ordering_fields``, the search rank, or the default ``-created_at``) followed
+by ``created_at`` and ``id`` as tie-breakers, which makes every position unique
+and the cursors stable while new quests are inserted. Subclasses for other
+models set ``tie_breakers`` and ``default_ordering``.
+
+Cursors are opaque base64-encoded JSON. ``?include_count=true`` adds a total
+that comes from a cached estimate rather than a per-request ``COUNT(*)``.
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import datetime
+from decimal import Decimal
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+TIE_BREAKERS = ('created_at', 'id')
+COUNT_CACHE_SECONDS = 300
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _after(keys, values):
+    """
+    Q matching rows strictly after ``values`` in the ordering ``keys``
+    ([(field, descending), ...]). NULLs sort first ascending and last
+    descending, matching MySQL and SQLite.
+    """
+    (field, descending), value = keys[0], values[0]
+    isnull = Q(**{f'{field}__isnull': True})
+    if value is None:
+        beyond = None if descending else ~isnull
+        same = isnull
+    else:
+        beyond = Q(**{f'{field}__lt' if descending else f'{field}__gt': value})
+        if descending:
+            beyond |= isnull
+        same = Q(**{field: value})
+
+    if len(keys) > 1:
+        tail = same & _after(keys[1:], values[1:])
+        return tail if beyond is None else beyond | tail
+    return beyond if beyond is not None else Q(pk__in=[])
+
+
+def estimated_count(queryset):
+    """
+    Row-count estimate for ``queryset``: InnoDB table statistics for an
+    unfiltered MySQL table, otherwise a COUNT(*) cached for a few minutes.
+    """
+    if connection.vendor == 'mysql' and not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] is not None:
+            return int(row[0])
+    key = 'quest-count:' + hashlib.md5(str(queryset.order_by().query).encode()).hexdigest()
+    return cache.get_or_set(key, lambda: queryset.order_by().count(), COUNT_CACHE_SECONDS)
+
+
+class KeysetPagination(BasePagination):
+    page_size = 20
+    tie_breakers = TIE_BREAKERS
+    default_ordering = ('-created_at',)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'include_count'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            size = self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_count(self, queryset, request):
+        if request.query_params.get(self.count_query_param) == 'true':
+            return estimated_count(queryset)
+        return None
+
+    def get_keys(self, queryset):
+        """The effective ordering as [(field, descending), ...] plus the tie-breakers."""
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering) or list(self.default_ordering)
+        keys = []
+        for term in ordering:
+            if not isinstance(term, str):
+                continue
+            field = term.lstrip('-')
+            keys.append(('id' if field == 'pk' else field, term.startswith('-')))
+        names = {field for field, _ in keys}
+        descending = keys[0][1] if keys else True
+        keys += [(field, descending) for field in self.tie_breakers if field not in names]
+        return keys
+
+    def encode_cursor(self, row, keys, reverse):
+        payload = {'v': [_encode_value(getattr(row, field)) for field, _ in keys], 'r': reverse}
+        return urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode()).decode())
+            return list(payload['v']), bool(payload['r'])
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.keys = keys = self.get_keys(queryset)
+        cursor = self.decode_cursor(request)
+        self.count = self.get_count(queryset, request)
+
+        reverse = bool(cursor and cursor[1])
+        walk = [(field, desc != reverse) for field, desc in keys]
+        queryset = queryset.order_by(*[
+            F(field).desc(nulls_last=True) if desc else F(field).asc(nulls_first=True) for field, desc in walk
+        ])
+        if cursor:
+            values = cursor[0]
+            if len(values) != len(keys):
+                raise NotFound('Invalid cursor')
+            queryset = queryset.filter(_after(walk, values))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Moving forward there is a previous page whenever we came from a cursor, and vice versa
+        has_next = has_more if not reverse else bool(cursor)
+        has_previous = bool(cursor) if not reverse else has_more
+        self.next_cursor = self.encode_cursor(rows[-1], keys, False) if rows and has_next else None
+        self.previous_cursor = self.encode_cursor(rows[0], keys, True) if rows and has_previous else None
+        return rows
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        payload = {'next': self._link(self.next_cursor), 'previous': self._link(self.previous_cursor)}
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer', 'description': 'Estimated total (only with include_count=true)'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,211 @@
+"""
+Skill-based quest recommendations.
+
+Open quests are indexed in process memory as sparse term vectors over their
+title (counted twice), description, requirements and category name. Weighting
+follows the SMART ``lnc.ltc`` scheme: documents use log term frequency with
+cosine normalization and no idf, while the user's query vector carries the
+idf. Because document vectors never depend on collection statistics, adding
+or dropping one quest only touches that quest's postings.
+
+A user's query vector comes from their ``UserSkill`` rows: the terms of each
+skill name, weighted by proficiency. The score is a sparse dot product
+computed from the postings of the query terms only (an inverted index is a
+column-major sparse matrix). Top-k uses a heap, so a request scales with the
+quests that share a term with the user's skills, not with the whole board.
+
+The index is built lazily. Every Quest write bumps the ``quests.quest`` table
+version (see quests.response_cache). When a request sees a new version it
+pulls only the quests whose ``updated_at`` passed the last watermark and
+re-indexes or drops them. A full rebuild still runs every ``FULL_REBUILD_SECONDS``
+to catch writes that bypassed ``updated_at``.
+"""
+from collections import Counter
+import heapq
+import logging
+import math
+import threading
+import time
+from datetime import timedelta
+
+from .response_cache import table_versions
+from .search import TOKEN_RE
+
+logger = logging.getLogger(__name__)
+
+FULL_REBUILD_SECONDS = 3600
+# Re-read a little before the watermark so rows from transactions that committed late are not missed
+REFRESH_OVERLAP = timedelta(seconds=60)
+TITLE_WEIGHT = 2
+MIN_TOKEN_LENGTH = 2
+
+PROFICIENCY_WEIGHTS = {
+    'beginner': 1.0,
+    'intermediate': 2.0,
+    'advanced': 3.0,
+    'expert': 4.0,
+}
+
+STOP_WORDS = frozenset("""
+    a an and are as at be by for from has have in is it its of on or our that the their this to was
+    were will with you your we us i me my need needs looking help can do should must any all some
+""".split())
+
+INDEXED_FIELDS = ('pk', 'creator_id', 'status', 'is_deleted', 'title', 'description', 'requirements',
+                  'category__name', 'updated_at')
+
+
+def terms(text):
+    return [
+        token for token in (match.lower() for match in TOKEN_RE.findall(text or ''))
+        if len(token) >= MIN_TOKEN_LENGTH and token not in STOP_WORDS
+    ]
+
+
+def document_vector(title, description='', requirements='', category=''):
+    """Cosine-normalized log-tf vector ({term: weight}) for a quest."""
+    counts = Counter(terms(title) * TITLE_WEIGHT + terms(description) + terms(requirements) + terms(category))
+    weights = {term: 1 + math.log(count) for term, count in counts.items()}
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    return {term: weight / norm for term, weight in weights.items()} if norm else {}
+
+
+class RecommendationIndex:
+    """In-memory inverted index over open quests."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.postings = {}  # term -> {quest_id: weight}
+            self.documents = {}  # quest_id -> {term: weight}
+            self.creators = {}  # quest_id -> creator_id
+            self.version = None
+            self.watermark = None
+            self.built_at = None
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add(self, quest_id, creator_id, vector):
+        with self.lock:
+            self.remove(quest_id)
+            if not vector:
+                return
+            self.documents[quest_id] = vector
+            self.creators[quest_id] = creator_id
+            for term, weight in vector.items():
+                self.postings.setdefault(term, {})[quest_id] = weight
+
+    def remove(self, quest_id):
+        with self.lock:
+            vector = self.documents.pop(quest_id, None)
+            self.creators.pop(quest_id, None)
+            for term in vector or ():
+                posting = self.postings[term]
+                posting.pop(quest_id, None)
+                if not posting:
+                    del self.postings[term]
+
+    def apply(self, rows):
+        """Index open quests and drop everything else. ``rows`` are INDEXED_FIELDS dicts."""
+        with self.lock:
+            for row in rows:
+                if row['status'] == 'open' and not row['is_deleted']:
+                    vector = document_vector(row['title'], row['description'], row['requirements'],
+                                             row['category__name'] or '')
+                    self.add(row['pk'], row['creator_id'], vector)
+                else:
+                    self.remove(row['pk'])
+                if row['updated_at'] and (self.watermark is None or row['updated_at'] > self.watermark):
+                    self.watermark = row['updated_at']
+
+    def idf(self, term):
+        return math.log((1 + len(self.documents)) / (1 + len(self.postings.get(term, ())))) + 1
+
+    def query_vector(self, weighted_terms):
+        """Cosine-normalized ltc vector from {term: raw weight}."""
+        with self.lock:
+            weights = {term: weight * self.idf(term) for term, weight in weighted_terms.items()
+                       if term in self.postings}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {term: weight / norm for term, weight in weights.items()} if norm else {}
+
+    def top_k(self, query, k=10, exclude=(), exclude_creator=None):
+        """[(score, quest_id)] best first, scoring only quests that share a term with ``query``."""
+        scores = {}
+        with self.lock:
+            for term, query_weight in query.items():
+                for quest_id, weight in self.postings.get(term, {}).items():
+                    scores[quest_id] = scores.get(quest_id, 0.0) + query_weight * weight
+            if exclude_creator is not None:
+                scores = {quest_id: score for quest_id, score in scores.items()
+                          if self.creators.get(quest_id) != exclude_creator}
+        excluded = set(exclude)
+        candidates = ((score, quest_id) for quest_id, score in scores.items() if quest_id not in excluded)
+        return heapq.nlargest(k, candidates)
+
+
+_index = RecommendationIndex()
+
+
+def get_index():
+    """The process-wide index, rebuilt or incrementally refreshed if quests changed."""
+    from .models import Quest
+
+    version = table_versions(['quests.quest'])[0]
+    with _index.lock:
+        if _index.built_at is None or time.monotonic() - _index.built_at > FULL_REBUILD_SECONDS:
+            started = time.perf_counter()
+            _index.clear()
+            _index.apply(Quest.objects.filter(status='open', is_deleted=False).values(*INDEXED_FIELDS).iterator())
+            latest = Quest.objects.order_by('-updated_at').values_list('updated_at', flat=True).first()
+            if latest and (_index.watermark is None or latest > _index.watermark):
+                _index.watermark = latest
+            _index.version = version
+            _index.built_at = time.monotonic()
+            logger.info(f"Built quest recommendation index: {len(_index)} quests, "
+                        f"{len(_index.postings)} terms in {(time.perf_counter() - started) * 1000:.1f}ms")
+        elif version != _index.version:
+            changed = Quest.objects.all()
+            if _index.watermark is not None:
+                changed = changed.filter(updated_at__gte=_index.watermark - REFRESH_OVERLAP)
+            _index.apply(changed.values(*INDEXED_FIELDS).iterator())
+            _index.version = version
+    return _index
+
+
+def skill_terms(user):
+    """{term: weight} from the user's skills, weighted by proficiency."""
+    from users.models import UserSkill
+
+    weighted = Counter()
+    skills = UserSkill.objects.filter(user=user, skill__isnull=False, skill__is_active=True).values_list(
+        'skill__name', 'proficiency_level',
+    )
+    for name, proficiency in skills:
+        for term in set(terms(name)):
+            weighted[term] += PROFICIENCY_WEIGHTS.get(proficiency, 1.0)
+    return dict(weighted)
+
+
+def recommend_for_user(user, k=10):
+    """[(score, quest_id)] for the open quests that best match ``user``'s skills, best first."""
+    from applications.models import Application
+    from .models import QuestParticipant
+
+    weighted_terms = skill_terms(user)
+    if not weighted_terms:
+        return []
+    index = get_index()
+    query = index.query_vector(weighted_terms)
+    if not query:
+        return []
+    involved = set(
+        QuestParticipant.objects.filter(user=user).order_by().values_list('quest_id', flat=True).union(
+            Application.objects.filter(applicant=user).order_by().values_list('quest_id', flat=True)
+        )
+    )
+    return index.top_k(query, k, exclude=involved, exclude_creator=user.pk)
@@ -0,0 +1,144 @@
+"""
+Versioned response cache for anonymous quest board reads.
+
+Cached list responses are keyed by the endpoint scope, the normalized query
+string and the current version number of every table the response depends on.
+Writes never delete cache entries: Quest, QuestParticipant, Application and
+QuestCategory signals just INCR the version of their table, which moves readers
+onto fresh keys (the old entries expire on their own). Invalidation is O(1)
+and needs no key scanning.
+
+``touch()`` / ``touched_at()`` keep a per-row "last changed" timestamp in the
+same namespace (e.g. ``quests.quest:42``) for changes that don't move the row's
+own ``updated_at``, such as a participant's status; quest detail ETags read it.
+
+Recomputation is single-flight: on a miss one request takes a short lock with
+``cache.add`` and rebuilds the entry while concurrent requests for the same
+key poll for it instead of stampeding the database.
+"""
+import hashlib
+import logging
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_TTL = 300
+LOCK_TTL = 10
+WAIT_INTERVAL = 0.05
+WAIT_ATTEMPTS = 40
+
+QUEST_BOARD_TABLES = ('quests.quest', 'quests.questparticipant', 'applications.application', 'quests.questcategory')
+CATEGORY_TABLES = ('quests.questcategory',)
+
+
+def _version_key(table):
+    return f'table-version:{table}'
+
+
+def table_versions(tables):
+    """Current version of each table (one cache round trip; missing versions start at 1)."""
+    keys = [_version_key(table) for table in tables]
+    found = cache.get_many(keys)
+    missing = {key: 1 for key in keys if key not in found}
+    if missing:
+        for key in missing:
+            cache.add(key, 1, timeout=None)
+        found.update(cache.get_many(list(missing)))
+    return [found.get(key, 1) for key in keys]
+
+
+def bump_table_version(table):
+    key = _version_key(table)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # First write since the cache was cleared; anything cached under version 1 is discarded
+        cache.add(key, 1, timeout=None)
+        cache.incr(key)
+
+
+def _now_version():
+    return time.time_ns() // 1000
+
+
+def touch(scope):
+    """Record that the rows under ``scope`` (e.g. ``'quests.quest:42'``) changed now."""
+    cache.set(_version_key(scope), _now_version(), timeout=None)
+
+
+def touched_at(scope):
+    """
+    Microsecond timestamp of the last ``touch(scope)``. An unknown scope (never
+    touched, or the cache was flushed) is seeded with the current time, so a
+    lost timestamp can only cause a spurious miss, never a stale 304.
+    """
+    key = _version_key(scope)
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, _now_version(), timeout=None)
+        value = cache.get(key)
+    return value or _now_version()
+
+
+def is_cacheable(request):
+    user = getattr(request, 'user', None)
+    return request.method == 'GET' and not (user is not None and user.is_authenticated)
+
+
+def response_key(scope, request, tables):
+    params = sorted((key, sorted(request.query_params.getlist(key))) for key in request.query_params)
+    fingerprint = hashlib.md5(repr((request.scheme, request.get_host(), params)).encode()).hexdigest()
+    versions = '.'.join(str(version) for version in table_versions(tables))
+    return f'response:{scope}:{versions}:{fingerprint}'
+
+
+def get_or_compute(key, compute):
+    """
+    Return the cached value for ``key`` or compute it once. ``compute`` returns
+    ``(value, cacheable)``; uncacheable results (e.g. errors) are returned uncached.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f'{key}:lock'
+    if not cache.add(lock_key, 1, timeout=LOCK_TTL):
+        for _ in range(WAIT_ATTEMPTS):
+            time.sleep(WAIT_INTERVAL)
+            value = cache.get(key)
+            if value is not None:
+                return value
+        logger.warning(f"Timed out waiting for {key} to be recomputed; computing it directly")
+        return compute()[0]
+
+    try:
+        value, cacheable = compute()
+        if cacheable:
+            cache.set(key, value, timeout=RESPONSE_TTL)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+class VersionedResponseCacheMixin:
+    """
+    Cache ``list()`` responses of anonymous GETs. Views set ``cache_scope`` and
+    ``cache_tables`` (the app_label.model names the response depends on).
+    """
+    cache_scope = None
+    cache_tables = ()
+
+    def list(self, request, *args, **kwargs):
+        if not is_cacheable(request):
+            return super().list(request, *args, **kwargs)
+
+        from rest_framework.response import Response
+
+        def compute():
+            response = super(VersionedResponseCacheMixin, self).list(request, *args, **kwargs)
+            return (response.status_code, response.data), response.status_code == 200
+
+        status_code, data = get_or_compute(response_key(self.cache_scope, request, self.cache_tables), compute)
+        return Response(data, status=status_code)
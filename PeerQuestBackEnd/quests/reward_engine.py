@@ -0,0 +1,272 @@
+"""
+Batched reward distribution for quest completion.
+
+The engine computes every participant's payout up front and then writes the
+whole settlement in a fixed number of statements, regardless of how many
+participants the quest has:
+
+* one UPDATE marking the eligible participants completed
+* one bulk INSERT each for Transaction (gold only), QuestCompletionLog,
+  XPTransaction and GoldTransaction rows, plus the matching LedgerRollup upsert
+* one ``UPDATE ... SET col = col + CASE ...`` for UserBalance and one for the
+  denormalized User.xp_total/gold_total columns
+* one level recompute pass (SELECT + bulk UPDATE)
+* one pipelined batch of leaderboard increments, sent after commit
+
+Bulk writes intentionally bypass the per-row post_save handlers (UserBalance
+bump in transactions.signals, the participant reward signals in
+quests.signals and transactions.quest_integration), which used to pay the
+same reward several times over.
+"""
+from dataclasses import dataclass, field
+from decimal import Decimal
+import logging
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, DecimalField, Value, When
+from django.utils import timezone
+
+from transactions.rollups import record_entries
+from xp import leaderboards
+
+logger = logging.getLogger("quest-rewards")
+
+ELIGIBLE_PARTICIPANT_STATUSES = ['joined', 'in_progress', 'approved', 'completed']
+
+
+@dataclass
+class Payout:
+    user: object
+    xp: int
+    gold: int
+    is_admin_excess: bool = False
+
+
+@dataclass
+class RewardPlan:
+    quest: object
+    participants: list
+    payouts: list = field(default_factory=list)
+    xp_per: int = 0
+    gold_per: int = 0
+    xp_excess: int = 0
+    gold_excess: int = 0
+    admin_user: object = None
+
+    @property
+    def num_participants(self):
+        return len(self.participants)
+
+
+def _case_increment(column, deltas, output_field, key='pk'):
+    """Build ``column + CASE key WHEN ... THEN delta ... ELSE 0 END`` for a single UPDATE."""
+    return F(column) + Case(
+        *[When(**{key: pk}, then=Value(delta)) for pk, delta in deltas.items()],
+        default=Value(0),
+        output_field=output_field,
+    )
+
+
+class RewardDistributor:
+    """Plans and applies the XP/gold settlement for a single quest completion."""
+
+    def __init__(self, quest):
+        self.quest = quest
+
+    def plan(self):
+        from users.models import User
+        from .models import QuestParticipant
+
+        quest = self.quest
+        participants = list(
+            QuestParticipant.objects.filter(quest=quest, status__in=ELIGIBLE_PARTICIPANT_STATUSES)
+            .select_related('user')
+        )
+        plan = RewardPlan(quest=quest, participants=participants)
+        if not participants:
+            return plan
+
+        count = len(participants)
+        plan.xp_per = int(quest.xp_reward // count)
+        plan.gold_per = int(quest.gold_reward // count)
+        plan.xp_excess = int(quest.xp_reward - plan.xp_per * count)
+        plan.gold_excess = int(quest.gold_reward - plan.gold_per * count)
+        plan.payouts = [Payout(user=p.user, xp=plan.xp_per, gold=plan.gold_per) for p in participants]
+
+        # Admin account: first with is_admin True, fallback to role=ADMIN
+        plan.admin_user = (
+            User.objects.filter(is_admin=True).first()
+            or User.objects.filter(role='admin').first()
+        )
+        if plan.admin_user and (plan.xp_excess > 0 or plan.gold_excess > 0):
+            plan.payouts.append(Payout(
+                user=plan.admin_user, xp=plan.xp_excess, gold=plan.gold_excess, is_admin_excess=True
+            ))
+        return plan
+
+    @transaction.atomic
+    def apply(self, plan):
+        from users.models import User
+        from users.models_reward import XPTransaction, GoldTransaction
+        from transactions.models import Transaction, TransactionType, UserBalance
+        from .models import QuestParticipant, QuestCompletionLog
+
+        quest = self.quest
+        now = timezone.now()
+
+        QuestParticipant.objects.filter(
+            pk__in=[p.pk for p in plan.participants]
+        ).exclude(status='completed').update(status='completed', completed_at=now)
+
+        # Completion logs (and every ledger row) are only written once per adventurer,
+        # and the admin's rounding excess only with the first logs, so repeated
+        # completions pay nothing twice.
+        already_logged = set(
+            QuestCompletionLog.objects.filter(quest=quest).values_list('adventurer_id', flat=True)
+        )
+        new_logs = [p for p in plan.payouts if not p.is_admin_excess and p.user.pk not in already_logged]
+        excess = [p for p in plan.payouts if p.is_admin_excess] if new_logs else []
+        paid = new_logs + excess
+
+        # Gold goes to the balance ledger; XP only ever goes to the XP ledger.
+        ledger = []
+        for payout in paid:
+            if payout.gold <= 0:
+                continue
+            description = (
+                f"Excess gold from quest '{quest.title}'" if payout.is_admin_excess
+                else f"Gold for quest '{quest.title}' completion"
+            )
+            ledger.append(Transaction(
+                user=payout.user, type=TransactionType.REWARD, amount=Decimal(payout.gold),
+                description=description, quest=quest,
+            ))
+        Transaction.objects.bulk_create(ledger)
+
+        logs = QuestCompletionLog.objects.bulk_create([
+            QuestCompletionLog(quest=quest, adventurer=p.user, xp_earned=p.xp, gold_earned=p.gold, completed_at=now)
+            for p in new_logs
+        ])
+        reason = f"Quest '{quest.title}' completion log"
+        xp_rows = [XPTransaction(user=p.user, amount=p.xp, reason=reason) for p in new_logs]
+        xp_rows += [XPTransaction(user=p.user, amount=p.xp, reason=f"Excess XP from quest '{quest.title}'") for p in excess if p.xp > 0]
+        gold_rows = [GoldTransaction(user=p.user, amount=p.gold, reason=reason) for p in new_logs]
+        XPTransaction.objects.bulk_create(xp_rows)
+        GoldTransaction.objects.bulk_create(gold_rows)
+        record_entries(ledger + xp_rows + gold_rows + logs)
+
+        xp_deltas, gold_deltas = {}, {}
+        for row in xp_rows:
+            xp_deltas[row.user_id] = xp_deltas.get(row.user_id, 0) + row.amount
+        for row in gold_rows:
+            gold_deltas[row.user_id] = gold_deltas.get(row.user_id, 0) + row.amount
+        if xp_deltas or gold_deltas:
+            leaderboards.record('xp', xp_deltas)
+            User.objects.filter(pk__in=set(xp_deltas) | set(gold_deltas)).update(
+                xp_total=_case_increment('xp_total', xp_deltas, IntegerField()),
+                gold_total=_case_increment('gold_total', gold_deltas, IntegerField()),
+                updated_at=now,
+            )
+
+        balance_deltas = {}
+        for payout in paid:
+            if payout.gold:
+                balance_deltas[payout.user.pk] = balance_deltas.get(payout.user.pk, 0) + payout.gold
+        if balance_deltas:
+            leaderboards.record('gold', balance_deltas)
+            UserBalance.objects.bulk_create(
+                [UserBalance(user_id=pk) for pk in balance_deltas], ignore_conflicts=True
+            )
+            UserBalance.objects.filter(user_id__in=list(balance_deltas)).update(
+                gold_balance=_case_increment(
+                    'gold_balance', balance_deltas, DecimalField(max_digits=12, decimal_places=2), key='user_id'
+                ),
+                last_updated=now,
+            )
+
+        self._recompute_levels(list(xp_deltas))
+        self._award_first_quest_achievements([p.user.pk for p in new_logs])
+
+    def _recompute_levels(self, user_ids):
+        from users.models import User
+        from xp.levels import recompute_levels
+        if user_ids:
+            recompute_levels(User.objects.filter(pk__in=user_ids))
+
+    def _award_first_quest_achievements(self, user_ids):
+        from users.models import Achievement, UserAchievement
+        if not user_ids:
+            return
+        achievement = Achievement.objects.filter(name="First Quest").first()
+        if achievement is None:
+            return
+        UserAchievement.objects.bulk_create(
+            [UserAchievement(user_id=pk, achievement=achievement) for pk in user_ids],
+            ignore_conflicts=True,
+        )
+
+    def distribute(self, completion_reason="Quest completed"):
+        quest = self.quest
+        plan = self.plan()
+        if not plan.participants:
+            logger.warning(f"Quest '{quest.title}' has no eligible participants for rewards.")
+            return {"error": "No participants to complete this quest."}
+
+        self.apply(plan)
+
+        admin_award = None
+        if plan.admin_user and (plan.xp_excess > 0 or plan.gold_excess > 0):
+            logger.info(
+                f"Admin {plan.admin_user.username} received excess: {plan.xp_excess} XP, "
+                f"{plan.gold_excess} Gold from quest '{quest.title}'"
+            )
+            admin_award = {
+                "user": plan.admin_user.username,
+                "xp_awarded": plan.xp_excess,
+                "gold_awarded": plan.gold_excess,
+            }
+        logger.info(f"Quest '{quest.title}' completed. Rewards distributed to {plan.num_participants} participants.")
+
+        return {
+            "quest_title": quest.title,
+            "completion_reason": completion_reason,
+            "participants_completed": plan.num_participants,
+            "xp_per_participant": plan.xp_per,
+            "gold_per_participant": plan.gold_per,
+            "total_xp_awarded": quest.xp_reward,
+            "total_gold_awarded": quest.gold_reward,
+            "participant_results": [
+                {"user": p.user.username, "xp_awarded": p.xp, "gold_awarded": p.gold}
+                for p in plan.payouts if not p.is_admin_excess
+            ],
+            "admin_award": admin_award,
+            "admin_balance": self._admin_balance(plan.admin_user),
+        }
+
+    def settle(self, user_ids):
+        """
+        Pay the given participants whose QuestParticipant row is already completed
+        but who have no QuestCompletionLog yet (used by quests.unit_of_work).
+        Safe to call repeatedly; returns the number of participants paid.
+        """
+        from .models import QuestCompletionLog
+
+        plan = self.plan()
+        logged = set(QuestCompletionLog.objects.filter(quest=self.quest).values_list('adventurer_id', flat=True))
+        plan.participants = [
+            p for p in plan.participants
+            if p.user_id in user_ids and p.status == 'completed' and p.completed_at and p.user_id not in logged
+        ]
+        settled = {p.user_id for p in plan.participants}
+        plan.payouts = [p for p in plan.payouts if not p.is_admin_excess and p.user.pk in settled]
+        if plan.payouts:
+            self.apply(plan)
+        return len(plan.payouts)
+
+    def _admin_balance(self, admin_user):
+        from transactions.models import LedgerRollup, UserBalance
+        if not admin_user:
+            return None
+        lifetime = LedgerRollup.lifetime_for(admin_user)
+        gold = UserBalance.objects.filter(user=admin_user).values_list('gold_balance', flat=True).first()
+        return {"xp": int(lifetime.xp_earned), "gold": float(gold or 0)}
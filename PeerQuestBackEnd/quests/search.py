@@ -0,0 +1,214 @@
+"""
+Pluggable full-text search for quests.
+
+``search_quests()`` filters a Quest queryset by a free-text query, annotates a
+``search_rank`` relevance score and applies the optional status, difficulty and
+category filters. The backend is chosen from the database vendor:
+
+* MySQL  -- a FULLTEXT index on (title, description, requirements) queried with
+  ``MATCH ... AGAINST`` in boolean mode. InnoDB maintains the index itself.
+* SQLite -- an FTS5 table (``quests_quest_fts``) ranked with bm25(). The table
+  is kept in sync by the Quest signals in quests.signals and can be rebuilt with
+  ``manage.py rebuild_quest_search_index``.
+* Anything else, or ``QUEST_SEARCH_BACKEND = 'icontains'`` -- the original
+  ``icontains`` filters, ranked title matches first.
+
+Every search term is prefix-matched, so "drag sla" finds "Dragon slaying".
+"""
+import logging
+import re
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TERMS = 8
+
+
+def tokenize(query):
+    return TOKEN_RE.findall(query or '')[:MAX_TERMS]
+
+
+class IcontainsSearchBackend:
+    name = 'icontains'
+
+    def search(self, queryset, terms):
+        match = Q()
+        for term in terms:
+            match &= Q(title__icontains=term) | Q(description__icontains=term) | Q(requirements__icontains=term)
+        title_match = Q()
+        for term in terms:
+            title_match &= Q(title__icontains=term)
+        return queryset.filter(match).annotate(search_rank=Case(
+            When(title_match, then=Value(2.0)), default=Value(1.0), output_field=FloatField(),
+        ))
+
+    def index(self, quest_ids):
+        pass
+
+    def remove(self, quest_ids):
+        pass
+
+    def rebuild(self, chunk_size=1000):
+        return 0
+
+
+class MySQLFulltextSearchBackend(IcontainsSearchBackend):
+    name = 'mysql'
+    # InnoDB ignores tokens shorter than innodb_ft_min_token_size (3 by default)
+    min_token_length = 3
+
+    def search(self, queryset, terms):
+        if any(len(term) < self.min_token_length for term in terms):
+            return super().search(queryset, terms)
+        against = ' '.join(f'+{term}*' for term in terms)
+        table = queryset.model._meta.db_table
+        rank = RawSQL(
+            f"MATCH ({table}.title, {table}.description, {table}.requirements) AGAINST (%s IN BOOLEAN MODE)",
+            [against], output_field=FloatField(),
+        )
+        return queryset.annotate(search_rank=rank).filter(search_rank__gt=0)
+
+
+class SQLiteFTS5SearchBackend(IcontainsSearchBackend):
+    name = 'sqlite-fts5'
+    table = 'quests_quest_fts'
+
+    def ensure_table(self):
+        # Cheap no-op once the table exists; also covers databases created without migrations
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} "
+                f"USING fts5(title, description, requirements, tokenize='unicode61')"
+            )
+
+    def search(self, queryset, terms):
+        self.ensure_table()
+        match = ' '.join('"{}"*'.format(term.replace('"', '')) for term in terms)
+        quest_table = queryset.model._meta.db_table
+        # bm25() is lower-is-better, so negate it for a descending search_rank
+        rank = RawSQL(
+            f"SELECT -bm25({self.table}) FROM {self.table} "
+            f"WHERE {self.table} MATCH %s AND {self.table}.rowid = {quest_table}.id",
+            [match], output_field=FloatField(),
+        )
+        matches = RawSQL(f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", [match])
+        return queryset.filter(pk__in=matches).annotate(search_rank=rank)
+
+    def index(self, quest_ids):
+        from .models import Quest
+
+        self.ensure_table()
+        rows = Quest.objects.filter(pk__in=quest_ids).values_list('pk', 'title', 'description', 'requirements')
+        with connection.cursor() as cursor:
+            self._delete(cursor, quest_ids)
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, title, description, requirements) VALUES (%s, %s, %s, %s)",
+                list(rows),
+            )
+
+    def remove(self, quest_ids):
+        self.ensure_table()
+        with connection.cursor() as cursor:
+            self._delete(cursor, quest_ids)
+
+    def _delete(self, cursor, quest_ids):
+        quest_ids = list(quest_ids)
+        if quest_ids:
+            placeholders = ', '.join(['%s'] * len(quest_ids))
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid IN ({placeholders})", quest_ids)
+
+    def rebuild(self, chunk_size=1000):
+        from .models import Quest
+
+        self.ensure_table()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            indexed = 0
+            batch = []
+            for row in Quest.objects.order_by('pk').values_list(
+                'pk', 'title', 'description', 'requirements'
+            ).iterator(chunk_size=chunk_size):
+                batch.append(row)
+                if len(batch) >= chunk_size:
+                    indexed += self._insert(cursor, batch)
+                    batch = []
+            indexed += self._insert(cursor, batch)
+        return indexed
+
+    def _insert(self, cursor, rows):
+        if rows:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, title, description, requirements) VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+        return len(rows)
+
+
+_backend = None
+
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        choice = getattr(settings, 'QUEST_SEARCH_BACKEND', 'auto')
+        if choice == 'auto':
+            choice = {'mysql': 'mysql', 'sqlite': 'sqlite-fts5'}.get(connection.vendor, 'icontains')
+        backends = {
+            'mysql': MySQLFulltextSearchBackend,
+            'sqlite-fts5': SQLiteFTS5SearchBackend,
+            'icontains': IcontainsSearchBackend,
+        }
+        _backend = backends[choice]()
+    return _backend
+
+
+def search_quests(queryset, query=None, status=None, difficulty=None, category=None):
+    """
+    Apply the free-text query and the board filters to ``queryset``.
+    Returns ``(queryset, ranked)``; ``ranked`` is True when a ``search_rank``
+    annotation is present to order by.
+    """
+    if status:
+        queryset = queryset.filter(status=status)
+    if difficulty:
+        queryset = queryset.filter(difficulty=difficulty)
+    if category:
+        queryset = queryset.filter(category_id=category)
+
+    terms = tokenize(query)
+    if not terms:
+        return queryset, False
+    backend = get_search_backend()
+    try:
+        # Querysets are lazy, so run a cheap EXISTS here: a broken index or
+        # MATCH syntax must fail inside this block, not later in the view.
+        # The savepoint keeps a failed probe from breaking the outer transaction.
+        with transaction.atomic():
+            results = backend.search(queryset, terms)
+            if backend.name != IcontainsSearchBackend.name:
+                results.exists()
+        return results, True
+    except DatabaseError as e:
+        logger.warning(f"Full-text quest search failed, falling back to icontains: {e}")
+        return IcontainsSearchBackend().search(queryset, terms), True
+
+
+def sync_quests(quest_ids, removed=False):
+    """Index (or drop) quests once the current transaction commits. Never raises."""
+    quest_ids = list(quest_ids)
+
+    def apply():
+        try:
+            backend = get_search_backend()
+            if removed:
+                backend.remove(quest_ids)
+            else:
+                backend.index(quest_ids)
+        except DatabaseError as e:
+            logger.error(f"Failed to sync quest search index for {quest_ids}: {e}")
+    transaction.on_commit(apply)
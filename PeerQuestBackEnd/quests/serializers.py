@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from common.reference_data import quest_categories
 from .models import Quest, QuestCategory, QuestParticipant, QuestSubmission, QuestSubmissionAttempt, QuestCompletionLog
 
 User = get_user_model()
@@ -74,7 +75,7 @@ class QuestListSerializer(serializers.ModelSerializer):
     
     def get_applications_count(self, obj):
         """Return the number of pending applications for this quest"""
-        return obj.applications.filter(status='pending').count()
+        return obj.pending_applications_count
     
     def get_description(self, obj):
         """Return truncated description for quest cards"""
@@ -124,7 +125,7 @@ class QuestDetailSerializer(serializers.ModelSerializer):
 
     def get_applications_count(self, obj):
         """Return the number of pending applications for this quest"""
-        return obj.applications.filter(status='pending').count()
+        return obj.pending_applications_count
 
 
 class QuestCreateUpdateSerializer(serializers.ModelSerializer):
@@ -160,11 +161,11 @@ class QuestCreateUpdateSerializer(serializers.ModelSerializer):
         if category:
             print(f"🔍 Category validation: {category} (type: {type(category)})")
             try:
-                from .models import QuestCategory
-                category_id = int(category) if category else None
-                if not category_id or not QuestCategory.objects.filter(id=category_id).exists():
+                categories = quest_categories.get()
+                category_id = int(getattr(category, 'pk', category))
+                if category_id not in categories:
                     print(f"❌ Category validation failed: Category {category_id} does not exist")
-                    raise serializers.ValidationError({'category': f'Invalid category selected: {category_id}. Available categories: {list(QuestCategory.objects.values_list("id", "name"))}'})
+                    raise serializers.ValidationError({'category': f'Invalid category selected: {category_id}. Available categories: {list(categories.items())}'})
             except (ValueError, TypeError) as e:
                 print(f"❌ Category conversion error: {e}")
                 raise serializers.ValidationError({'category': f'Category must be a valid number. Received: {category} ({type(category)})'})
@@ -1,12 +1,15 @@
 from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
+from collections import defaultdict
 from datetime import datetime
-from .models import Quest, QuestParticipant, QuestSubmission
+from django.db import transaction
+from .models import Quest, QuestCategory, QuestParticipant, QuestSubmission
 from applications.models import Application
-from xp.utils import award_xp
-from transactions.transaction_utils import award_gold
-from transactions.models import TransactionType
+from .response_cache import bump_table_version, touch
+from .search import sync_quests
+from .topics import quest_topic, user_topic, schedule_count_push
+from .unit_of_work import emit, PARTICIPANT_CHANGED, PARTICIPANT_COMPLETED
 import logging
 
 # WebSocket imports
@@ -43,91 +46,42 @@ def auto_set_xp_reward(sender, instance, **kwargs):
 def award_xp_and_gold_on_quest_completion(sender, instance, created, **kwargs):
     """
     Award XP and gold to participants when they complete a quest.
+    Payment is deferred to the unit of work, which settles each (quest, user)
+    once at commit through the batched reward engine.
     """
-    # Only award XP and gold when status changes to 'completed'
     if instance.status == 'completed' and instance.completed_at:
-        quest = instance.quest
-        user = instance.user
-        
-        # Award XP based on quest difficulty
-        xp_amount = quest.xp_reward
-        xp_result = award_xp(
-            user=user,
-            xp_amount=xp_amount,
-            reason=f"Completed quest: {quest.title}"
-        )
-        
-        # Award gold based on quest gold_reward
-        gold_amount = quest.gold_reward
-        if gold_amount > 0:
-            gold_result = award_gold(
-                user=user,
-                amount=gold_amount,
-                description=f"Reward for completing quest: {quest.title}",
-                quest=quest,
-                transaction_type=TransactionType.QUEST_REWARD
-            )
-            print(f"User {user.username} received {gold_amount} gold for completing quest: {quest.title}")
-            # Commission is handled through the reservation system - the total reserved amount
-            # included both the reward and commission, and we only award the reward amount
-            # to participants, effectively keeping the commission in the system
-        # Handle level up notifications
-        if xp_result.get("leveled_up"):
-            print(f"User {user.username} leveled up to level {xp_result['new_level']}!")
-
-        # Award 'First Quest' achievement if this is the user's first completed quest
-        try:
-            from quests.achievement_award import award_first_quest_achievement
-            award_first_quest_achievement(user)
-        except Exception as e:
-            logger.error(f"Error awarding 'First Quest' achievement: {e}")
+        emit(PARTICIPANT_COMPLETED, instance.quest_id, instance.user_id)
 
 
 @receiver(post_save, sender=Quest)
 def handle_quest_completion(sender, instance, created, **kwargs):
     """
     Handle quest completion logic when quest status changes to completed.
+    Completions that go through Quest.save() are settled in bulk by
+    quests.reward_engine, so those are skipped here.
     """
+    if getattr(instance, '_rewards_pending', False):
+        return
     if not created and instance.status == 'completed' and instance.completed_at:
-        # Mark all participants as completed if not already
+        # Mark all participants as completed if not already, then settle them in one unit of work
         participants = QuestParticipant.objects.filter(
             quest=instance,
             status__in=['joined', 'in_progress']
         )
-        
-        for participant in participants:
-            participant.status = 'completed'
-            participant.completed_at = timezone.now()
-            participant.save()  # This will trigger the XP award signal above
+        user_ids = list(participants.values_list('user_id', flat=True))
+        participants.update(status='completed', completed_at=timezone.now())
+        for user_id in user_ids:
+            emit(PARTICIPANT_COMPLETED, instance.pk, user_id)
 
 
 @receiver(post_save, sender=QuestParticipant)
 def handle_assignment_on_participant_change(sender, instance, created, **kwargs):
     """
     Handle quest assignment when participant status changes.
+    The assignment is reconciled once per quest when the transaction commits.
     """
-    quest = instance.quest
-    
-    # If participant dropped out, check if quest should be unassigned
-    if instance.status == 'dropped':
-        # If the assigned user dropped out, clear the assignment
-        if quest.assigned_to == instance.user:
-            quest.assigned_to = None
-            quest.save()
-            print(f"Cleared assignment for quest {quest.title} - participant {instance.user.username} dropped out")
-    
-    # If this is the only active participant, they should be assigned
-    elif instance.status in ['joined', 'in_progress']:
-        active_participants = QuestParticipant.objects.filter(
-            quest=quest,
-            status__in=['joined', 'in_progress']
-        )
-        
-        # If there's only one active participant and no one is assigned, assign to them
-        if active_participants.count() == 1 and not quest.assigned_to:
-            quest.assigned_to = instance.user
-            quest.save()
-            print(f"Assigned quest {quest.title} to {instance.user.username}")
+    if instance.status == 'dropped' or instance.status in ['joined', 'in_progress']:
+        emit(PARTICIPANT_CHANGED, instance.quest_id)
 
 
 @receiver(post_delete, sender=QuestParticipant)
@@ -154,58 +108,121 @@ def handle_assignment_on_participant_delete(sender, instance, **kwargs):
         quest.save()
         print(f"Quest '{quest.title}' set to 'open' as no participants remain.")
 
+@receiver(post_save, sender=Quest)
+def index_quest_for_search(sender, instance, **kwargs):
+    """Keep the full-text search index in step with quest edits."""
+    if any(instance.has_changed(field) for field in ('title', 'description', 'requirements')):
+        sync_quests([instance.pk])
+
+
+@receiver(post_delete, sender=Quest)
+def remove_quest_from_search(sender, instance, **kwargs):
+    sync_quests([instance.pk], removed=True)
+
+@receiver(post_save, sender=Quest)
+@receiver(post_delete, sender=Quest)
+@receiver(post_save, sender=QuestParticipant)
+@receiver(post_delete, sender=QuestParticipant)
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+@receiver(post_save, sender=QuestCategory)
+@receiver(post_delete, sender=QuestCategory)
+def invalidate_quest_board_cache(sender, **kwargs):
+    """Move cached quest board responses onto a new version once the write commits."""
+    table = sender._meta.label_lower
+    transaction.on_commit(lambda: bump_table_version(table))
+    quest_id = getattr(kwargs['instance'], 'quest_id', None)
+    if quest_id is not None:
+        # Participant/application changes don't touch Quest.updated_at; keep quest detail ETags honest
+        transaction.on_commit(lambda: touch(f'quests.quest:{quest_id}'))
+
 # WebSocket Signal Handlers for Real-time Updates
 
 @receiver(post_save, sender=Quest)
 def quest_status_websocket_update(sender, instance, created, **kwargs):
     """Send WebSocket update when quest status changes."""
-    if not created:  # Only for updates, not creation
+    if not created and instance.has_changed('status'):  # Only for status updates, not creation
         message = {
             'type': 'quest_status_changed',
             'quest_id': instance.id,
             'status': instance.status,
             'timestamp': datetime.now().isoformat()
         }
-        send_to_group('quest_updates', message)
+        send_to_group(quest_topic(instance.id), message)
 
 
 @receiver(post_save, sender=Application)
 def application_status_websocket_update(sender, instance, created, **kwargs):
     """Send WebSocket updates when application status changes."""
-    # Send to user-specific group for application status
-    user_group = f'user_applications_{instance.applicant.id}'
+    if not instance.has_changed('status'):
+        return
+    # Send to the applicant's own topic
     message = {
         'type': 'application_status_changed',
         'application_id': instance.id,
-        'quest_id': instance.quest.id,
+        'quest_id': instance.quest_id,
         'status': instance.status,
         'timestamp': datetime.now().isoformat()
     }
-    send_to_group(user_group, message)
+    send_to_group(user_topic(instance.applicant_id), message)
     
-    # Also update quest application count
-    application_count = Application.objects.filter(quest=instance.quest).count()
-    quest_message = {
-        'type': 'quest_application_count_changed',
-        'quest_id': instance.quest.id,
-        'application_count': application_count,
-        'timestamp': datetime.now().isoformat()
-    }
-    send_to_group('quest_updates', quest_message)
+    # Also update quest application count (coalesced per quest, see quests.topics)
+    quest_id = instance.quest_id
+    transaction.on_commit(lambda: schedule_count_push(quest_id))
+
+
+def applications_bulk_updated(quest_id, applications, status):
+    """
+    Post-commit counterpart of the Application receivers for bulk status changes
+    made with queryset.update(): invalidate cached board reads, push the new status
+    to each applicant, and schedule one application count push for the quest.
+    ``applications`` is a list of (application_id, applicant_id).
+    """
+    bump_table_version('applications.application')
+    touch(f'quests.quest:{quest_id}')
+    timestamp = datetime.now().isoformat()
+    for application_id, applicant_id in applications:
+        send_to_group(user_topic(applicant_id), {
+            'type': 'application_status_changed',
+            'application_id': application_id,
+            'quest_id': quest_id,
+            'status': status,
+            'timestamp': timestamp
+        })
+    schedule_count_push(quest_id)
+
+
+def applications_decided(quest_ids, changes):
+    """
+    Post-commit side effects of applications.decisions.decide(): invalidate cached
+    board reads, send each applicant one event listing all of their decided
+    applications, and schedule one application count push per quest.
+    ``changes`` is a list of (application_id, quest_id, applicant_id, status).
+    """
+    bump_table_version('applications.application')
+    bump_table_version('quests.questparticipant')
+    for quest_id in quest_ids:
+        touch(f'quests.quest:{quest_id}')
+    timestamp = datetime.now().isoformat()
+    by_applicant = defaultdict(list)
+    for application_id, quest_id, applicant_id, status in changes:
+        by_applicant[applicant_id].append({'application_id': application_id, 'quest_id': quest_id, 'status': status})
+    for applicant_id, applications in by_applicant.items():
+        send_to_group(user_topic(applicant_id), {
+            'type': 'applications_decided',
+            'applications': applications,
+            'timestamp': timestamp
+        })
+    for quest_id in quest_ids:
+        schedule_count_push(quest_id)
 
 
 @receiver(post_delete, sender=Application)
 def application_deleted_websocket_update(sender, instance, **kwargs):
     """Send WebSocket update when application is deleted."""
-    # Update quest application count
-    application_count = Application.objects.filter(quest=instance.quest).count()
-    message = {
-        'type': 'quest_application_count_changed',
-        'quest_id': instance.quest.id,
-        'application_count': application_count,
-        'timestamp': datetime.now().isoformat()
-    }
-    send_to_group('quest_updates', message)
+    # Update quest application count (coalesced per quest, see quests.topics)
+    quest_id = instance.quest_id
+    transaction.on_commit(lambda: schedule_count_push(quest_id))
 
 
 @receiver(post_save, sender=QuestSubmission)
@@ -218,7 +235,7 @@ def quest_submission_websocket_update(sender, instance, created, **kwargs):
         'status': instance.status,
         'timestamp': datetime.now().isoformat()
     }
-    send_to_group('quest_updates', message)
+    send_to_group(quest_topic(instance.quest_participant.quest.id), message)
     
     # Also send to quest creator
     creator_group = f'user_notifications_{instance.quest_participant.quest.creator.id}'
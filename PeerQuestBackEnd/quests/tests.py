@@ -1,3 +1,715 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from common.testing import make_user
+from transactions.models import UserBalance
+from .models import Quest, QuestCategory, QuestCompletionLog, QuestParticipant
+
+
+class QuestRewardEngineTest(TestCase):
+    def setUp(self):
+        self.creator = make_user('creator')
+        self.admin = make_user('admin', is_admin=True)
+        self.category = QuestCategory.objects.create(name='Testing')
+
+    def make_quest(self, participants, gold_reward=100):
+        quest = Quest.objects.create(
+            title='Reward quest', description='desc', creator=self.creator, category=self.category,
+            difficulty='adventurer', gold_reward=gold_reward, status='in-progress',
+        )
+        users = [make_user(f'adv-{quest.pk}-{i}') for i in range(participants)]
+        QuestParticipant.objects.bulk_create([QuestParticipant(quest=quest, user=u, status='joined') for u in users])
+        return quest, users
+
+    def complete_counting_queries(self, quest):
+        with CaptureQueriesContext(connection) as ctx:
+            result = quest.complete_quest()
+        return result, len(ctx.captured_queries)
+
+    def test_rewards_are_split_and_paid_once(self):
+        quest, users = self.make_quest(3, gold_reward=100)
+        result = quest.complete_quest()
+
+        self.assertEqual(result['participants_completed'], 3)
+        self.assertEqual(result['gold_per_participant'], 33)
+        self.assertEqual(result['admin_award']['gold_awarded'], 1)
+        for user in users:
+            user.refresh_from_db()
+            self.assertEqual(user.gold, 33)
+            self.assertEqual(user.xp, 16)
+            self.assertEqual(UserBalance.objects.get(user=user).gold_balance, 33)
+        self.assertEqual(UserBalance.objects.get(user=self.admin).gold_balance, 1)
+        self.assertEqual(QuestCompletionLog.objects.filter(quest=quest).count(), 3)
+        self.assertFalse(QuestParticipant.objects.filter(quest=quest).exclude(status='completed').exists())
+
+    def test_repeated_completion_pays_nothing_twice(self):
+        from transactions.models import Transaction
+        from .reward_engine import RewardDistributor
+
+        quest, users = self.make_quest(3, gold_reward=100)
+        quest.complete_quest()
+        RewardDistributor(quest).distribute()
+
+        for user in users:
+            user.refresh_from_db()
+            self.assertEqual((user.gold, user.xp), (33, 16))
+            self.assertEqual(UserBalance.objects.get(user=user).gold_balance, 33)
+        self.assertEqual(UserBalance.objects.get(user=self.admin).gold_balance, 1)
+        self.assertEqual(Transaction.objects.filter(quest=quest).count(), 4)
+
+    def test_query_count_does_not_grow_with_participants(self):
+        small, _ = self.make_quest(1)
+        large, _ = self.make_quest(25)
+        _, small_queries = self.complete_counting_queries(small)
+        _, large_queries = self.complete_counting_queries(large)
+        self.assertEqual(small_queries, large_queries)
+
+    def test_completion_updates_ledger_rollups(self):
+        from transactions.models import LedgerRollup
+        quest, users = self.make_quest(2, gold_reward=100)
+        result = quest.complete_quest()
+
+        lifetime = LedgerRollup.lifetime_for(users[0])
+        self.assertEqual(lifetime.xp_earned, 25)
+        self.assertEqual(lifetime.gold_earned, 50)
+        self.assertEqual(lifetime.gold_in, 50)
+        self.assertEqual(LedgerRollup.objects.filter(user=users[0]).count(), 2)
+        self.assertEqual(result['admin_balance']['xp'], 0)
+
+    def test_stats_count_quest_rewards_only(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from rest_framework.test import APIClient
+        from users.models_reward import GoldTransaction, XPTransaction
+
+        quest, users = self.make_quest(2, gold_reward=100)
+        quest.complete_quest()
+        # Ledger entries that are not quest rewards stay out of the quest totals
+        XPTransaction.objects.create(user=users[0], amount=500, reason='Event bonus')
+        GoldTransaction.objects.create(user=users[0], amount=70, reason='Gift')
+
+        client = APIClient()
+        client.force_authenticate(users[0])
+        stats = client.get('/api/quests/stats/').data
+        self.assertEqual((stats['total_xp_earned'], stats['total_gold_earned']), (25, 50))
+
+        call_command('rebuild_ledger_rollups', stdout=StringIO())
+        stats = client.get('/api/quests/stats/').data
+        self.assertEqual((stats['total_xp_earned'], stats['total_gold_earned']), (25, 50))
+
+    def test_failed_settlement_is_logged_and_repairable(self):
+        from io import StringIO
+        from unittest import mock
+        from django.core.management import call_command
+        from django.utils import timezone
+        from .reward_engine import RewardDistributor
+
+        quest, users = self.make_quest(2, gold_reward=100)
+        Quest.objects.filter(pk=quest.pk).update(status='completed', completed_at=timezone.now())
+        with mock.patch.object(RewardDistributor, 'settle', side_effect=RuntimeError('ledger down')), \
+                self.assertLogs('quests.unit_of_work', level='ERROR') as logs, \
+                self.captureOnCommitCallbacks(execute=True):
+            QuestParticipant.objects.filter(quest=quest).update(status='completed', completed_at=timezone.now())
+            for participant in QuestParticipant.objects.filter(quest=quest):
+                participant.save()
+        self.assertIn(f'quest {quest.pk}', logs.output[0])
+        self.assertFalse(QuestCompletionLog.objects.filter(quest=quest).exists())
+
+        out = StringIO()
+        call_command('settle_quest_rewards', '--dry-run', stdout=out)
+        self.assertIn('2 participants in 1 quests need settling', out.getvalue())
+        call_command('settle_quest_rewards', stdout=out)
+        self.assertEqual(QuestCompletionLog.objects.filter(quest=quest).count(), 2)
+        for user in users:
+            self.assertEqual(UserBalance.objects.get(user=user).gold_balance, 50)
+
+    def test_migration_backfills_lifetime_rollups(self):
+        import importlib
+        from django.apps import apps
+        from rest_framework.test import APIClient
+        from transactions.models import LedgerRollup
+
+        quest, users = self.make_quest(2, gold_reward=100)
+        quest.complete_quest()
+        # Rows that predate the rollup table
+        LedgerRollup.objects.all().delete()
+        migration = importlib.import_module('transactions.migrations.0007_backfill_ledger_rollups')
+        migration.backfill_ledger_rollups(apps, None)
+
+        client = APIClient()
+        client.force_authenticate(users[0])
+        stats = client.get('/api/quests/stats/').data
+        self.assertEqual((stats['total_xp_earned'], stats['total_gold_earned']), (25, 50))
+        self.assertEqual(LedgerRollup.lifetime_for(users[0]).gold_in, 50)
+
+    def test_participant_saves_are_coalesced_at_commit(self):
+        from django.utils import timezone
+        from .unit_of_work import collect_stats
+
+        quest, users = self.make_quest(3, gold_reward=90)
+        Quest.objects.filter(pk=quest.pk).update(status='completed', completed_at=timezone.now())
+        with collect_stats() as stats, self.captureOnCommitCallbacks(execute=True):
+            for participant in QuestParticipant.objects.filter(quest=quest):
+                participant.status = 'completed'
+                participant.completed_at = timezone.now()
+                participant.save()
+                participant.save()
+
+        self.assertEqual(QuestCompletionLog.objects.filter(quest=quest).count(), 3)
+        for user in users:
+            self.assertEqual(UserBalance.objects.get(user=user).gold_balance, 30)
+        # Two receivers per save, two saves per participant, one batched settlement
+        self.assertEqual(stats.events_received, 12)
+        self.assertEqual(stats.handlers_dispatched, 1)
+        self.assertEqual(stats.collapsed, 11)
+
+
+class QuestBoardQueryCountTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = QuestCategory.objects.create(name='Board')
+
+    def add_quests(self, count):
+        from applications.models import Application
+        start = Quest.objects.count()
+        for i in range(start, start + count):
+            creator = make_user(f'board-creator-{i}')
+            adventurer = make_user(f'board-adventurer-{i}')
+            quest = Quest.objects.create(
+                title=f'Board quest {i}', description='desc', creator=creator, category=self.category,
+                difficulty='initiate', gold_reward=0, status='open', assigned_to=adventurer,
+            )
+            QuestParticipant.objects.bulk_create([QuestParticipant(quest=quest, user=adventurer, status='joined')])
+            Application.objects.bulk_create([Application(quest=quest, applicant=creator, status='pending')])
+
+    def list_counting_queries(self):
+        cache.clear()  # measure the uncached board, not the response cache
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/quests/quests/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results'], len(ctx.captured_queries)
+
+    def test_list_query_count_is_constant(self):
+        self.add_quests(2)
+        small, small_queries = self.list_counting_queries()
+        self.add_quests(10)
+        large, large_queries = self.list_counting_queries()
+
+        self.assertEqual(len(large), 12)  # within the default page size
+        self.assertEqual(small_queries, large_queries)
+        self.assertLessEqual(large_queries, 3)
+        self.assertTrue(all(q['participant_count'] == 1 and q['applications_count'] == 1 for q in large))
+
+    def test_my_quests_is_complete_and_constant(self):
+        from rest_framework.test import APIClient
+
+        self.add_quests(25)  # more than one board page
+        me = make_user('board-me')
+        mine = Quest.objects.filter(title__startswith='Board quest')
+        Quest.objects.filter(pk__in=mine.values('pk')[:21]).update(creator=me)
+        joined = mine.exclude(creator=me).first()
+        QuestParticipant.objects.create(quest=joined, user=me, status='joined')
+        Quest.objects.filter(pk=mine.filter(creator=me).first().pk).update(is_deleted=True)
+        client = APIClient()
+        client.force_authenticate(me)
+
+        with self.assertNumQueries(1):
+            created = client.get('/api/quests/quests/my_quests/', {'type': 'created'}).json()
+        self.assertEqual(len(created), 20)
+        self.assertTrue(all(q['participant_count'] == 1 for q in created))
+        participating = client.get('/api/quests/quests/my_quests/', {'type': 'participating'}).json()
+        self.assertEqual([q['id'] for q in participating], [joined.pk])
+        self.assertEqual(len(client.get('/api/quests/quests/my_quests/').json()), 21)
+
+
+class QuestSearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        creator = make_user('search-creator')
+        category = QuestCategory.objects.create(name='Search')
+        with self.captureOnCommitCallbacks(execute=True):
+            for title, description in [
+                ('Dragon slaying', 'Defeat the dragon in the northern caves'),
+                ('Herb gathering', 'Collect herbs; beware of the dragon nearby'),
+                ('Bridge repair', 'Fix the old bridge'),
+            ]:
+                Quest.objects.create(
+                    title=title, description=description, creator=creator, category=category,
+                    difficulty='initiate', gold_reward=0, status='open',
+                )
+
+    def search(self, query, **params):
+        response = self.client.get('/api/quests/quests/', {'search': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [quest['title'] for quest in response.json()['results']]
+
+    def test_prefix_terms_are_ranked_by_relevance(self):
+        self.assertEqual(self.search('drag'), ['Dragon slaying', 'Herb gathering'])
+        self.assertEqual(self.search('drag sla'), ['Dragon slaying'])
+        self.assertEqual(self.search('brid', status='completed'), [])
+
+    def test_index_follows_edits(self):
+        quest = Quest.objects.get(title='Bridge repair')
+        quest.title = 'Tower repair'
+        with self.captureOnCommitCallbacks(execute=True):
+            quest.save()
+        self.assertEqual(self.search('tower'), ['Tower repair'])
+
+    def test_falls_back_to_icontains_when_full_text_fails(self):
+        from unittest import mock
+        from . import search
+
+        class MissingTableBackend(search.SQLiteFTS5SearchBackend):
+            table = 'quests_quest_fts_missing'
+
+            def ensure_table(self):
+                pass
+
+        with mock.patch.object(search, '_backend', MissingTableBackend()):
+            self.assertEqual(self.search('drag'), ['Dragon slaying', 'Herb gathering'])
+
+
+class QuestBoardPaginationTest(TestCase):
+    def setUp(self):
+        from django.utils import timezone
+        cache.clear()
+        creator = make_user('paging-creator')
+        category = QuestCategory.objects.create(name='Paging')
+        same_instant = timezone.now()
+        for i in range(12):
+            quest = Quest.objects.create(
+                title=f'Paged quest {i}', description='desc', creator=creator, category=category,
+                difficulty='initiate', gold_reward=0, status='open', created_at=same_instant,
+            )
+            Quest.objects.filter(pk=quest.pk).update(xp_reward=[10, 20, 30][i % 3])
+
+    def walk(self, url, params):
+        ids, response = [], self.client.get(url, params)
+        while True:
+            body = response.json()
+            ids.extend(quest['id'] for quest in body['results'])
+            if not body['next']:
+                return ids, body
+            response = self.client.get(body['next'])
+
+    def test_cursors_visit_every_quest_once_despite_ties(self):
+        ids, last_page = self.walk('/api/quests/quests/', {'page_size': 5})
+        self.assertEqual(len(ids), 12)
+        self.assertEqual(len(set(ids)), 12)
+        self.assertEqual(ids, sorted(ids, reverse=True))
+
+        previous = self.client.get(last_page['previous']).json()
+        self.assertEqual([quest['id'] for quest in previous['results']], ids[5:10])
+
+    def test_ordering_fields_are_kept(self):
+        ids, _ = self.walk('/api/quests/quests/', {'page_size': 4, 'ordering': 'xp_reward'})
+        rewards = dict(Quest.objects.values_list('id', 'xp_reward'))
+        self.assertEqual(len(set(ids)), 12)
+        self.assertEqual([rewards[pk] for pk in ids], sorted(rewards.values()))
+
+    def test_count_is_optional(self):
+        body = self.client.get('/api/quests/quests/').json()
+        self.assertNotIn('count', body)
+        body = self.client.get('/api/quests/quests/', {'include_count': 'true'}).json()
+        self.assertEqual(body['count'], 12)
+
+
+class QuestBoardResponseCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = make_user('cache-creator')
+        self.category = QuestCategory.objects.create(name='Cached')
+        self.quest = Quest.objects.create(
+            title='Cached quest', description='desc', creator=self.creator, category=self.category,
+            difficulty='initiate', gold_reward=0, status='open',
+        )
+
+    def titles(self, url='/api/quests/quests/'):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [quest['title'] for quest in response.json()['results']], len(ctx.captured_queries)
+
+    def test_anonymous_list_is_served_from_cache(self):
+        first, _ = self.titles()
+        second, queries = self.titles()
+        self.assertEqual(first, second)
+        self.assertEqual(queries, 0)
+
+    def test_key_includes_the_scheme(self):
+        # The cached body holds absolute next/previous links, so http and https need separate entries
+        Quest.objects.bulk_create([
+            Quest(title=f'Filler {i}', slug=f'filler-{i}', description='desc', creator=self.creator,
+                  category=self.category, difficulty='initiate', gold_reward=0, status='open')
+            for i in range(20)
+        ])
+        self.assertTrue(self.client.get('/api/quests/quests/').json()['next'].startswith('http://'))
+        self.assertTrue(self.client.get('/api/quests/quests/', secure=True).json()['next'].startswith('https://'))
+
+    def test_writes_bump_the_table_version(self):
+        self.assertEqual(self.titles()[0], ['Cached quest'])
+        self.quest.title = 'Renamed quest'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.quest.save()
+        titles, queries = self.titles()
+        self.assertEqual(titles, ['Renamed quest'])
+        self.assertGreater(queries, 0)
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        from rest_framework.test import APIClient
+        self.titles()
+        self.client = APIClient()
+        self.client.force_authenticate(self.creator)
+        _, queries = self.titles()
+        self.assertGreater(queries, 0)
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = make_user('etag-creator')
+        self.quest = Quest.objects.create(
+            title='Polled quest', description='desc', creator=self.creator,
+            category=QuestCategory.objects.create(name='Polled'),
+            difficulty='initiate', gold_reward=0, status='open',
+        )
+        self.url = f'/api/quests/quests/{self.quest.slug}/'
+
+    def get(self, url, **headers):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, **headers)
+        return response, len(ctx.captured_queries)
+
+    def test_quest_detail_revalidates_with_one_query(self):
+        response, _ = self.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response, queries = self.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertLessEqual(queries, 1)
+
+        response, _ = self.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_participant_changes_invalidate_quest_etag(self):
+        etag = self.get(self.url)[0]['ETag']
+        adventurer = make_user('etag-adventurer')
+        participant = QuestParticipant.objects.create(quest=self.quest, user=adventurer, status='joined')
+        etag = self.get(self.url)[0]['ETag']
+
+        participant.progress_notes = 'Halfway there'
+        with self.captureOnCommitCallbacks(execute=True):
+            participant.save()
+        response, _ = self.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['participants_detail'][0]['progress_notes'], 'Halfway there')
+
+    def test_related_user_changes_invalidate_quest_etag(self):
+        from users.models_reward import XPTransaction
+        adventurer = make_user('etag-member')
+        QuestParticipant.objects.create(quest=self.quest, user=adventurer, status='joined')
+        etag = self.get(self.url)[0]['ETag']
+
+        # Ledger entries bump the creator's totals with an F() update, not save()
+        XPTransaction.objects.create(user=self.creator, amount=40, reason='bonus')
+        response, _ = self.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        adventurer.username = 'etag-renamed'
+        adventurer.save()
+        response, _ = self.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['participants_detail'][0]['user']['username'], 'etag-renamed')
+
+    def test_current_user_revalidates_with_one_query(self):
+        from rest_framework.test import APIClient
+        # Forced authentication, so only the view's own queries are counted (JWT auth adds its own lookups)
+        self.client = APIClient()
+        self.client.force_authenticate(self.creator)
+        response, _ = self.get('/api/users/me/')
+        self.assertEqual(response.status_code, 200)
+
+        response, queries = self.get('/api/users/me/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertLessEqual(queries, 1)
+
+        self.creator.xp_total = 50
+        response, _ = self.get('/api/users/me/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['xp'], 50)
+
+
+class FieldTrackingTest(TestCase):
+    def setUp(self):
+        self.creator = make_user('tracked-creator')
+        self.category = QuestCategory.objects.create(name='Tracked')
+        Quest.objects.create(
+            title='Tracked quest', description='desc', creator=self.creator, category=self.category,
+            difficulty='initiate', gold_reward=0, status='open',
+        )
+
+    def test_loaded_values_are_tracked(self):
+        quest = Quest.objects.get(title='Tracked quest')
+        self.assertFalse(quest.has_changed('status'))
+        quest.status = 'in-progress'
+        self.assertTrue(quest.has_changed('status'))
+        self.assertEqual(quest.loaded_value('status'), 'open')
+        self.assertEqual(quest.changed_fields(), {'status': 'open'})
+        quest.save()
+        self.assertFalse(quest.has_changed('status'))
+
+        deferred = Quest.objects.only('id').get(pk=quest.pk)
+        self.assertTrue(deferred.has_changed('status'))
+        self.assertIsNone(deferred.loaded_value('status'))
+
+    def test_save_does_not_reread_the_quest(self):
+        quest = Quest.objects.get(title='Tracked quest')
+        quest.status = 'in-progress'
+        with CaptureQueriesContext(connection) as ctx:
+            quest.save()
+        quest_selects = [q for q in ctx.captured_queries if q['sql'].startswith('SELECT') and '"quests_quest"' in q['sql'].split('WHERE')[0]]
+        self.assertEqual(quest_selects, [])
+
+    def test_application_approval_query_count(self):
+        from applications.models import Application
+        quest = Quest.objects.get(title='Tracked quest')
+        applications = [
+            Application.objects.create(quest=quest, applicant=make_user(f'tracked-applicant-{i}'))
+            for i in range(3)
+        ]
+        application = Application.objects.select_related('quest', 'applicant').get(pk=applications[0].pk)
+        with CaptureQueriesContext(connection) as ctx:
+            application.approve(self.creator)
+        # 37 before dirty-field tracking: a pre-save quest SELECT per Quest.save, an owner
+        # notification on every application save, and status pushes loading applicant and quest
+        self.assertLessEqual(len(ctx.captured_queries), 28)
+
+
+class QuestRecommendationTest(TestCase):
+    def setUp(self):
+        from rest_framework.test import APIClient
+        from users.models import Skill, UserSkill
+        from . import recommendations
+
+        cache.clear()
+        recommendations._index.clear()
+        self.user = make_user('recommended-user')
+        for name, level in [('Python', 'expert'), ('Graphic Design', 'beginner')]:
+            UserSkill.objects.create(user=self.user, skill=Skill.objects.create(name=name, category='Test'),
+                                     proficiency_level=level)
+        self.creator = make_user('recommending-creator')
+        self.category = QuestCategory.objects.create(name='Work')
+        self.add_quest('Python data cleanup', 'Write a python script to clean survey data')
+        self.add_quest('Poster design', 'Graphic design for a club poster')
+        self.add_quest('Move boxes', 'Carry boxes to the new dorm')
+        self.add_quest('My own python quest', 'python', creator=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_quest(self, title, description, creator=None, status='open'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Quest.objects.create(
+                title=title, description=description, creator=creator or self.creator, category=self.category,
+                difficulty='initiate', gold_reward=0, status=status,
+            )
+
+    def recommended(self):
+        response = self.client.get('/api/quests/recommended/')
+        self.assertEqual(response.status_code, 200)
+        return [quest['title'] for quest in response.json()['results']]
+
+    def test_quests_are_ranked_by_skill_match(self):
+        self.assertEqual(self.recommended(), ['Python data cleanup', 'Poster design'])
+
+    def test_index_refreshes_incrementally(self):
+        self.recommended()
+        self.add_quest('Python tutoring', 'Teach python basics')
+        quest = Quest.objects.get(title='Python data cleanup')
+        quest.status = 'in-progress'
+        with self.captureOnCommitCallbacks(execute=True):
+            quest.save()
+        self.assertEqual(self.recommended(), ['Python tutoring', 'Poster design'])
+
+
+class DeadlineSweepTest(TestCase):
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        self.today = timezone.localdate()
+        self.creator = make_user('deadline-creator')
+        self.adventurer = make_user('deadline-adventurer')
+        category = QuestCategory.objects.create(name='Deadlines')
+
+        def quest(title, days, status='in-progress', assigned=True):
+            quest = Quest.objects.create(
+                title=title, description='desc', creator=self.creator, category=category,
+                difficulty='initiate', gold_reward=0, status=status, due_date=self.today + timedelta(days=days),
+                assigned_to=self.adventurer if assigned else None,
+            )
+            if assigned:
+                QuestParticipant.objects.create(quest=quest, user=self.adventurer, status='in_progress')
+            return quest
+
+        self.late = [quest(f'Late quest {i}', -i - 1) for i in range(3)]
+        self.unassigned_late = quest('Unclaimed late quest', -2, status='open', assigned=False)
+        self.soon = quest('Due tomorrow', 1)
+        quest('Finished late quest', -3, status='completed')
+        quest('Far away quest', 30)
+
+    def test_sweep_is_chunked_and_idempotent(self):
+        from notifications.models import Notification
+        from .deadlines import sweep
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = sweep(self.today, chunk_size=2)
+        self.assertEqual((result.reminded, result.overdue), (1, 4))
+        self.assertEqual(result.chunks, 3)  # 1 reminder chunk + 2 overdue chunks of 2
+        # creator + adventurer for each assigned late quest, creator for the unclaimed one, adventurer reminded
+        self.assertEqual(result.notifications, 3 * 2 + 1 + 1)
+        self.assertEqual(Notification.objects.filter(notif_type='quest_overdue').count(), 7)
+        self.assertEqual(Notification.objects.filter(notif_type='quest_deadline_reminder', user=self.adventurer).count(), 1)
+        self.assertFalse([q for q in ctx.captured_queries if q['sql'].startswith('SELECT') and 'notifications_notification' in q['sql']])
+
+        self.assertEqual(sweep(self.today).notifications, 0)
+        self.assertEqual(Quest.objects.exclude(overdue_at=None).count(), 4)
+
+    def test_moving_the_deadline_restarts_the_cycle(self):
+        from datetime import timedelta
+        from .deadlines import sweep
+
+        sweep(self.today)
+        quest = Quest.objects.get(pk=self.late[0].pk)
+        quest.due_date = self.today - timedelta(days=10)
+        quest.save()
+        self.assertIsNone(Quest.objects.get(pk=quest.pk).overdue_at)
+        self.assertEqual(sweep(self.today).overdue, 1)
+
+    def test_saves_without_a_loaded_deadline_keep_the_stamps(self):
+        from .deadlines import sweep
+
+        sweep(self.today)
+        deferred = Quest.objects.defer('due_date').get(pk=self.late[1].pk)
+        deferred.title = 'Renamed late quest'
+        deferred.save()
+        self.assertIsNotNone(Quest.objects.get(pk=deferred.pk).overdue_at)
+
+        # Built in Python for an existing row, like the instances bulk_create returns
+        built = Quest(**Quest.objects.values().get(pk=self.late[2].pk))
+        built._state.adding = False
+        built.save()
+        self.assertIsNotNone(Quest.objects.get(pk=built.pk).overdue_at)
+        self.assertEqual(sweep(self.today).notifications, 0)
+
+
+class ReferenceDataCacheTest(TestCase):
+    def setUp(self):
+        from common.reference_data import quest_categories
+        cache.clear()
+        self.categories = quest_categories
+        self.categories._value = None
+        self.categories._pending.clear()
+        self.category = QuestCategory.objects.create(name='Design')
+
+    def test_lookups_hit_process_memory(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.categories.get(), {self.category.pk: 'Design'})
+            self.categories.get()
+            self.categories.get()
+        stats = self.categories.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+
+    def test_other_workers_reuse_the_shared_copy(self):
+        self.categories.get()
+        self.categories._value = None  # a fresh process with the same version
+        with self.assertNumQueries(0):
+            self.assertIn(self.category.pk, self.categories.get())
+        self.assertEqual(self.categories.stats()['shared_hits'], 1)
+
+    def test_saves_bump_the_version(self):
+        self.categories.get()
+        version = self.categories.stats()['version']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Visual Design'
+            self.category.save()
+        self.assertEqual(self.categories.get(), {self.category.pk: 'Visual Design'})
+        self.assertEqual(self.categories.stats()['version'], version + 1)
+
+
+class QueryPlanRegressionTest(TestCase):
+    """Small-scale run of common.query_plans; `manage.py check_query_plans` is the full-size version."""
+
+    def test_hot_queries_use_indexes(self):
+        from unittest import SkipTest
+        from common.query_plans import check_plans, seed
+
+        if connection.vendor != 'sqlite':
+            raise SkipTest('query plan checks run on SQLite')
+        seed(scale=0.005)
+        failures = {result.name: result.plan for result in check_plans(repeat=1) if not result.ok}
+        self.assertEqual(failures, {})
+
+    def test_full_scans_are_detected(self):
+        from common.query_plans import full_scans
+
+        self.assertEqual(full_scans(['SCAN guilds_guild', 'USE TEMP B-TREE FOR ORDER BY'], bounded=True),
+                         ['guilds_guild'])
+        # An ordered index walk is fine when a LIMIT stops it, not when it has to read everything
+        walk = ['SCAN quests_quest USING INDEX quests_ques_created_57a5fa_idx']
+        self.assertEqual(full_scans(walk, bounded=True), [])
+        self.assertEqual(full_scans(walk, bounded=False), ['quests_quest'])
+
+
+class QuestTopicTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = make_user('topic-creator')
+        category = QuestCategory.objects.create(name='Topics')
+        self.quest = Quest.objects.create(title='Busy quest', description='desc', creator=self.creator,
+                                          category=category)
+
+    def test_application_burst_sends_one_count_push(self):
+        from unittest import mock
+        from applications.models import Application
+        from .topics import _deferred_push
+
+        with mock.patch('quests.signals.send_to_group') as send, \
+                mock.patch('quests.topics.threading.Timer') as timer:
+            with self.captureOnCommitCallbacks(execute=True):
+                for i in range(50):
+                    Application.objects.create(quest=self.quest, applicant=make_user(f'topic-applicant-{i}'))
+            self.assertEqual(timer.call_count, 1)
+            _deferred_push(*timer.call_args.kwargs['args'])
+
+        messages = [call.args for call in send.call_args_list]
+        counts = [(group, message) for group, message in messages
+                  if message['type'] == 'quest_application_count_changed']
+        self.assertEqual(len(counts), 1)
+        self.assertEqual(counts[0][0], f'quest.{self.quest.pk}')
+        self.assertEqual(counts[0][1]['application_count'], 50)
+        statuses = {group for group, message in messages if message['type'] == 'application_status_changed'}
+        self.assertEqual(len(statuses), 50)
+        self.assertTrue(all(group.startswith('user.') for group in statuses))
+
+    def test_quest_events_go_to_the_quest_topic(self):
+        from unittest import mock
+
+        with mock.patch('quests.signals.send_to_group') as send:
+            self.quest.status = 'in-progress'
+            self.quest.save()
+        send.assert_called_once()
+        self.assertEqual(send.call_args.args[0], f'quest.{self.quest.pk}')
+
+    def test_subscription_rules(self):
+        from .topics import can_subscribe
+
+        other = make_user('topic-other')
+        self.assertTrue(can_subscribe(self.creator, f'quest.{self.quest.pk}'))
+        self.assertTrue(can_subscribe(self.creator, f'user.{self.creator.pk}'))
+        self.assertFalse(can_subscribe(self.creator, f'user.{other.pk}'))
+        self.assertFalse(can_subscribe(self.creator, 'quest_updates'))
+        self.assertFalse(can_subscribe(self.creator, 'quest.1;drop'))
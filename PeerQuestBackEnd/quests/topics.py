@@ -0,0 +1,111 @@
+"""
+Per-quest and per-user WebSocket topics.
+
+Quest and application events used to go to the single ``quest_updates`` group,
+so every connected client received (and filtered) every change on the site.
+They now go to narrow topics that map one-to-one onto channel-layer groups:
+
+* ``quest.<id>`` -- status, application count and submission events for one
+  quest; clients subscribe to the quests they are showing
+* ``user.<id>``  -- a user's own application status changes; only that user
+  may subscribe
+
+``quest_updates`` is kept for board-wide events (the deadline sweeper's
+batches) that are not about a single quest.
+
+Application count pushes are coalesced per quest. The first change in a
+``QUEST_COUNT_PUSH_WINDOW`` (seconds) takes a cache lock and schedules one
+push at the end of the window; later changes in the window find the lock and
+do nothing. The push counts once and sends once, so a burst of 50
+applications costs one COUNT(*) and one message instead of 50 of each. The
+lock is released before counting, so a change that lands while the push runs
+schedules the next one rather than being lost.
+"""
+from datetime import datetime
+import logging
+import re
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+BOARD_GROUP = 'quest_updates'
+COUNT_PUSH_KEY = 'quest-count-push:{}'
+MAX_SUBSCRIPTIONS = 200
+
+_TOPIC = re.compile(r'^(quest)\.(\d+)$|^(user)\.([0-9a-fA-F-]{1,36})$')
+
+
+def quest_topic(quest_id):
+    return f'quest.{quest_id}'
+
+
+def user_topic(user_id):
+    return f'user.{user_id}'
+
+
+def parse_topic(topic):
+    """(kind, id) for a well-formed topic name, or None."""
+    match = _TOPIC.match(topic) if isinstance(topic, str) else None
+    if not match:
+        return None
+    if match.group(1):
+        return 'quest', match.group(2)
+    return 'user', match.group(4).lower()
+
+
+def can_subscribe(user, topic):
+    """Quest topics are public to any signed-in user; user topics only to their owner."""
+    parsed = parse_topic(topic)
+    if parsed is None:
+        return False
+    kind, ident = parsed
+    if kind == 'user':
+        return ident == str(user.pk).lower()
+    return True
+
+
+def push_window():
+    return float(getattr(settings, 'QUEST_COUNT_PUSH_WINDOW', 1.0))
+
+
+def push_application_count(quest_id):
+    """Count the quest's applications and send the total to its topic."""
+    from applications.models import Application
+    from .signals import send_to_group
+
+    cache.delete(COUNT_PUSH_KEY.format(quest_id))
+    send_to_group(quest_topic(quest_id), {
+        'type': 'quest_application_count_changed',
+        'quest_id': quest_id,
+        'application_count': Application.objects.filter(quest_id=quest_id).count(),
+        'timestamp': datetime.now().isoformat()
+    })
+
+
+def _deferred_push(quest_id):
+    try:
+        push_application_count(quest_id)
+    except Exception as e:
+        logger.error(f"Application count push for quest {quest_id} failed: {e}")
+    finally:
+        close_old_connections()
+
+
+def schedule_count_push(quest_id):
+    """
+    Push the quest's application count once per window. Call after commit;
+    with a window of 0 the push happens immediately.
+    """
+    window = push_window()
+    if window <= 0:
+        push_application_count(quest_id)
+        return
+    if not cache.add(COUNT_PUSH_KEY.format(quest_id), 1, timeout=max(int(window) + 5, 5)):
+        return
+    timer = threading.Timer(window, _deferred_push, args=(quest_id,))
+    timer.daemon = True
+    timer.start()
@@ -0,0 +1,200 @@
+"""
+Unit of work for the quest/participant reward signal chains.
+
+Completing a quest used to fan out through several post_save receivers, each
+re-querying and re-saving rows (and re-triggering the quest receivers). Those
+receivers now only ``emit()`` a domain event. Events are buffered per database
+transaction, de-duplicated per (event, quest, user) and dispatched once when
+the transaction commits, with batched writes:
+
+* ``participant_completed`` -> RewardDistributor.settle() for the quest's
+  newly completed participants (idempotent: already logged users are skipped)
+* ``participant_changed`` -> one assignment reconcile per quest
+
+Handlers re-read current database state, so events left over from a rolled
+back savepoint are harmless. Outside an atomic block events dispatch
+immediately.
+
+Handlers run after the triggering writes have committed, so a failing handler
+is rolled back to its own savepoint and logged instead of failing the request.
+A participant left completed but unpaid that way is picked up by
+``unsettled_participants()`` and the ``settle_quest_rewards`` command. UnitOfWorkMiddleware collects per-request counts of received
+events versus dispatched handlers and reports the collapsed difference.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from .response_cache import bump_table_version
+
+logger = logging.getLogger(__name__)
+
+PARTICIPANT_COMPLETED = 'participant_completed'
+PARTICIPANT_CHANGED = 'participant_changed'
+
+ACTIVE_PARTICIPANT_STATUSES = ('joined', 'in_progress')
+
+
+@dataclass
+class UnitOfWorkStats:
+    units: int = 0
+    events_received: int = 0
+    handlers_dispatched: int = 0
+
+    @property
+    def collapsed(self):
+        return self.events_received - self.handlers_dispatched
+
+
+_pending = ContextVar('quest_unit_of_work', default=None)
+_stats = ContextVar('quest_unit_of_work_stats', default=None)
+
+
+def settle_completed_participants(quest_id, user_ids):
+    from .models import Quest
+    from .reward_engine import RewardDistributor
+
+    quest = Quest.objects.filter(pk=quest_id).first()
+    if quest is not None:
+        RewardDistributor(quest).settle(user_ids)
+
+
+def unsettled_participants(quest_ids=None):
+    """{quest_id: {user_id, ...}} of completed participants that have no QuestCompletionLog."""
+    from django.db.models import Exists, OuterRef
+    from .models import QuestCompletionLog, QuestParticipant
+
+    queryset = QuestParticipant.objects.filter(status='completed', completed_at__isnull=False).exclude(
+        Exists(QuestCompletionLog.objects.filter(quest_id=OuterRef('quest_id'), adventurer_id=OuterRef('user_id')))
+    )
+    if quest_ids:
+        queryset = queryset.filter(quest_id__in=quest_ids)
+    unsettled = defaultdict(set)
+    for quest_id, user_id in queryset.order_by('quest_id').values_list('quest_id', 'user_id'):
+        unsettled[quest_id].add(user_id)
+    return dict(unsettled)
+
+
+def reconcile_assignment(quest_id, user_ids):
+    """Clear a dropped assignee, or assign the quest to its only active participant."""
+    from .models import Quest, QuestParticipant
+
+    assigned_to_id = Quest.objects.filter(pk=quest_id).values_list('assigned_to_id', flat=True).first()
+    statuses = dict(QuestParticipant.objects.filter(quest_id=quest_id).values_list('user_id', 'status'))
+    active = [user_id for user_id, status in statuses.items() if status in ACTIVE_PARTICIPANT_STATUSES]
+
+    new_assignee = assigned_to_id
+    if new_assignee and statuses.get(new_assignee) == 'dropped':
+        new_assignee = None
+    if new_assignee is None and len(active) == 1:
+        new_assignee = active[0]
+    if new_assignee != assigned_to_id:
+        Quest.objects.filter(pk=quest_id).update(assigned_to_id=new_assignee, updated_at=timezone.now())
+        transaction.on_commit(lambda: bump_table_version('quests.quest'))
+        logger.info(f"Quest {quest_id} assignment reconciled: {assigned_to_id} -> {new_assignee}")
+
+
+HANDLERS = {
+    PARTICIPANT_COMPLETED: settle_completed_participants,
+    PARTICIPANT_CHANGED: reconcile_assignment,
+}
+
+
+class UnitOfWork:
+    """Buffered domain events for one transaction."""
+
+    def __init__(self, using=None):
+        self.using = using
+        self.events = set()
+        self.received = 0
+
+    def add(self, kind, quest_id, user_id=None):
+        self.received += 1
+        self.events.add((kind, quest_id, user_id))
+
+    def is_scheduled(self):
+        connection = transaction.get_connection(self.using)
+        return any(func == self.flush for _, func, _ in connection.run_on_commit)
+
+    def flush(self):
+        if _pending.get() is self:
+            _pending.set(None)
+        grouped = defaultdict(lambda: defaultdict(set))
+        for kind, quest_id, user_id in self.events:
+            grouped[kind][quest_id].add(user_id)
+        self.events = set()
+
+        dispatched = 0
+        for kind, quests in grouped.items():
+            for quest_id, user_ids in quests.items():
+                try:
+                    with transaction.atomic(using=self.using):
+                        HANDLERS[kind](quest_id, user_ids)
+                except Exception:
+                    # The triggering writes are already committed; leave the rows for
+                    # settle_quest_rewards rather than surfacing a 500 after the fact
+                    logger.exception(
+                        f"Unit of work handler {kind} failed for quest {quest_id}, "
+                        f"users {sorted(str(user_id) for user_id in user_ids)}"
+                    )
+                dispatched += 1
+
+        stats = _stats.get()
+        if stats is not None:
+            stats.units += 1
+            stats.events_received += self.received
+            stats.handlers_dispatched += dispatched
+        if self.received > dispatched:
+            logger.debug(f"Unit of work collapsed {self.received - dispatched} of {self.received} handler invocations")
+        return dispatched
+
+
+def emit(kind, quest_id, user_id=None, using=None):
+    """Queue a domain event for the current transaction (dispatches immediately in autocommit mode)."""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown unit of work event: {kind}")
+    if not transaction.get_connection(using).in_atomic_block:
+        unit = UnitOfWork(using)
+        unit.add(kind, quest_id, user_id)
+        unit.flush()
+        return
+    unit = _pending.get()
+    if unit is None or unit.using != using or not unit.is_scheduled():
+        unit = UnitOfWork(using)
+        _pending.set(unit)
+        transaction.on_commit(unit.flush, using=using)
+    unit.add(kind, quest_id, user_id)
+
+
+@contextmanager
+def collect_stats():
+    """Count events and dispatched handlers for every unit flushed inside the block."""
+    stats = UnitOfWorkStats()
+    token = _stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _stats.reset(token)
+
+
+class UnitOfWorkMiddleware:
+    """Scopes unit-of-work stats to a request and reports collapsed handler invocations."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with collect_stats() as stats:
+            response = self.get_response(request)
+        if stats.units:
+            response['X-Unit-Of-Work-Collapsed'] = str(stats.collapsed)
+            logger.info(
+                f"{request.method} {request.path}: {stats.events_received} reward events, "
+                f"{stats.handlers_dispatched} handlers run, {stats.collapsed} collapsed"
+            )
+        return response
@@ -10,6 +10,7 @@ from .views import (
     
     # Quest Search and Filters
     QuestSearchView,
+    QuestRecommendationView,
     
     # Quest Participants
     QuestParticipantListView,
@@ -57,6 +58,7 @@ urlpatterns = [
     
     # Quest Search and Discovery
     path('search/', QuestSearchView.as_view(), name='quest-search'),
+    path('recommended/', QuestRecommendationView.as_view(), name='quest-recommended'),
     
     # Quest Participants
     path('quests/<slug:quest_slug>/participants/', QuestParticipantListView.as_view(), name='quest-participants'),
@@ -109,6 +111,7 @@ Categories:
 
 Search and Discovery:
 - GET /api/quests/search/ - Advanced quest search
+- GET /api/quests/recommended/ - Open quests matching the user's skills
 
 Participants:
 - GET /api/quests/quests/{slug}/participants/ - List quest participants
@@ -89,7 +89,13 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny, SAFE_METHODS, BasePermission
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import Q, Count, F
+from django.db.models import Q, Count, F, Max, OuterRef, Prefetch, Subquery
+from datetime import datetime, timezone as dt_timezone
+from core.conditional import make_etag, not_modified, set_validators
+from .pagination import KeysetPagination
+from .recommendations import recommend_for_user
+from .response_cache import CATEGORY_TABLES, QUEST_BOARD_TABLES, VersionedResponseCacheMixin, touched_at
+from .search import search_quests
 from .models import Quest, QuestCategory, QuestParticipant, QuestSubmission, QuestSubmissionAttempt, QuestCompletionLog
 from .serializers import (
     QuestListSerializer, QuestDetailSerializer, QuestCreateUpdateSerializer,
@@ -130,10 +136,12 @@ class IsQuestCreatorForReview(BasePermission):
 
 
 # Quest Category Views
-class QuestCategoryListCreateView(generics.ListCreateAPIView):
+class QuestCategoryListCreateView(VersionedResponseCacheMixin, generics.ListCreateAPIView):
     """
     List all quest categories or create a new one.
     """
+    cache_scope = 'quest-categories'
+    cache_tables = CATEGORY_TABLES
     queryset = QuestCategory.objects.all()
     serializer_class = QuestCategorySerializer
     permission_classes = [AllowAny]
@@ -149,15 +157,23 @@ class QuestCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # Main Quest ViewSet with full CRUD
-class QuestViewSet(viewsets.ModelViewSet):
+def participants_detail_prefetch():
+    """Prefetch feeding QuestDetailSerializer.participants_detail in one query."""
+    return Prefetch('questparticipant_set', queryset=QuestParticipant.objects.select_related('user'))
+
+
+class QuestViewSet(VersionedResponseCacheMixin, viewsets.ModelViewSet):
     """
     ViewSet for full CRUD operations on quests.
     Provides: list, create, retrieve, update, partial_update, destroy
     """
+    cache_scope = 'quest-board'
+    cache_tables = QUEST_BOARD_TABLES
     queryset = Quest.objects.all()
     lookup_field = 'slug'
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'description']
+    pagination_class = KeysetPagination
+    # ?search= is handled by quests.search in get_queryset
+    filter_backends = [filters.OrderingFilter]
     ordering_fields = ['created_at', 'due_date', 'xp_reward', 'difficulty']
     ordering = ['-created_at']
 
@@ -176,33 +192,24 @@ class QuestViewSet(viewsets.ModelViewSet):
         return [AllowAny()]
 
     def get_queryset(self):
-        queryset = Quest.objects.all()
+        queryset = Quest.objects.with_board_stats()
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(participants_detail_prefetch())
         
         # Exclude soft-deleted quests
         queryset = queryset.filter(is_deleted=False)
         
-        # Get the search query first
-        search = self.request.query_params.get('search', None)
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(description__icontains=search)
-            )
-        
-        # Filter by status
-        status_filter = self.request.query_params.get('status', None)
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        
-        # Filter by difficulty
-        difficulty = self.request.query_params.get('difficulty', None)
-        if difficulty:
-            queryset = queryset.filter(difficulty=difficulty)
-        
-        # Filter by category
-        category = self.request.query_params.get('category', None)
-        if category:
-            queryset = queryset.filter(category_id=category)
+        params = self.request.query_params
+        queryset, ranked = search_quests(
+            queryset,
+            query=params.get('search'),
+            status=params.get('status'),
+            difficulty=params.get('difficulty'),
+            category=params.get('category'),
+        )
+        # Best matches first unless the client asked for an explicit ordering
+        if ranked and 'ordering' not in params:
+            self.ordering = ['-search_rank', '-created_at']
         
         # Filter by creator
         creator = self.request.query_params.get('creator', None)
@@ -211,6 +218,46 @@ class QuestViewSet(viewsets.ModelViewSet):
             
         return queryset
 
+    def get_detail_validators(self):
+        """
+        (etag, last_modified) for the quest being retrieved, from one aggregate
+        query plus the participant/application touch timestamp; None if not found.
+
+        The detail payload embeds the creator, assignee and participants, so
+        their ``updated_at`` stamps are part of the fingerprint too.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        participants_updated = Subquery(
+            QuestParticipant.objects.filter(quest=OuterRef('pk')).order_by().values('quest')
+            .annotate(latest=Max('user__updated_at')).values('latest')[:1]
+        )
+        row = self.get_queryset().filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]}).annotate(
+            participants_updated_at=participants_updated,
+        ).values_list(
+            'pk', 'updated_at', 'annotated_participant_count', 'annotated_pending_applications',
+            'creator__updated_at', 'assigned_to__updated_at', 'participants_updated_at',
+        ).first()
+        if row is None:
+            return None
+        pk, updated_at, participants, pending = row[:4]
+        people = [stamp for stamp in row[4:] if stamp is not None]
+        touched = touched_at(f'quests.quest:{pk}')
+        last_modified = max(updated_at, datetime.fromtimestamp(touched / 1_000_000, tz=dt_timezone.utc), *people)
+        etag = make_etag(pk, updated_at.isoformat(), participants, pending, touched,
+                         *[stamp.isoformat() if stamp else None for stamp in row[4:]])
+        return etag, last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        """Quest detail with ETag/Last-Modified; unchanged quests answer 304 without serializing."""
+        validators = self.get_detail_validators()
+        if validators is None:
+            return super().retrieve(request, *args, **kwargs)
+        etag, last_modified = validators
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        return set_validators(super().retrieve(request, *args, **kwargs), etag, last_modified)
+
     def create(self, request, *args, **kwargs):
         """Custom create method with enhanced debugging"""
         print(f"🔍 QuestViewSet.create called")
@@ -275,22 +322,22 @@ class QuestViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_quests(self, request):
         """
-        Get quests created by or participated in by the current user.
+        Get quests created by or participated in by the current user (?type=all|created|participating).
+        Unpaginated: this is the user's own working set, not the board.
         """
-        created_quests = Quest.objects.filter(creator=request.user)
-        participating_quests = Quest.objects.filter(
-            questparticipant__user=request.user
-        ).distinct()
+        created = Q(creator=request.user)
+        participating = Q(pk__in=QuestParticipant.objects.filter(user=request.user).values('quest_id'))
         
         quest_type = request.query_params.get('type', 'all')
         
         if quest_type == 'created':
-            queryset = created_quests
+            match = created
         elif quest_type == 'participating':
-            queryset = participating_quests
+            match = participating
         else:
-            queryset = created_quests.union(participating_quests)
+            match = created | participating
         
+        queryset = Quest.objects.with_board_stats().filter(match, is_deleted=False).order_by('-created_at', '-id')
         serializer = QuestListSerializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -410,19 +457,20 @@ class QuestSearchView(generics.ListAPIView):
     """
     serializer_class = QuestListSerializer
     permission_classes = [AllowAny]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title', 'description', 'requirements']
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        queryset = Quest.active_quests.all()
+        queryset = Quest.active_quests.with_board_stats()
         
-        # Text search
-        search = self.request.query_params.get('search', None)
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(description__icontains=search)
-            )
+        # Full-text search (ranked by relevance)
+        queryset, ranked = search_quests(
+            queryset,
+            query=self.request.query_params.get('search'),
+            difficulty=self.request.query_params.get('difficulty'),
+            category=self.request.query_params.get('category'),
+        )
+        if ranked:
+            queryset = queryset.order_by('-search_rank', '-created_at')
         
         # Filter by available spots - now just checks if quest is open
         available_only = self.request.query_params.get('available_only', None)
@@ -432,6 +480,34 @@ class QuestSearchView(generics.ListAPIView):
         return queryset
 
 
+class QuestRecommendationView(generics.GenericAPIView):
+    """
+    Open quests matching the current user's skills, best match first.
+    ?limit= sets the number of results (default 10, max 50).
+    """
+    serializer_class = QuestListSerializer
+    permission_classes = [IsAuthenticated]
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except (TypeError, ValueError):
+            limit = self.default_limit
+        limit = min(max(limit, 1), self.max_limit)
+
+        ranked = recommend_for_user(request.user, k=limit)
+        scores = {quest_id: score for score, quest_id in ranked}
+        quests = Quest.objects.with_board_stats().filter(pk__in=scores, status='open', is_deleted=False)
+        quests = sorted(quests, key=lambda quest: -scores[quest.pk])
+
+        results = self.get_serializer(quests, many=True).data
+        for item in results:
+            item['recommendation_score'] = round(scores[item['id']], 4)
+        return Response({'results': results})
+
+
 # Quest Participant Views
 class QuestParticipantListView(generics.ListAPIView):
     """
@@ -670,27 +746,19 @@ class QuestStatsView(generics.GenericAPIView):
             user=user, status='completed'
         ).count()
         
-        # Total XP earned from completed quests
-        total_xp_earned = sum([
-            participant.quest.xp_reward 
-            for participant in QuestParticipant.objects.filter(
-                user=user, status='completed'
-            )
-        ])
-        
-        # Total gold earned from completed quests
-        total_gold_earned = sum([
-            participant.quest.gold_reward 
-            for participant in QuestParticipant.objects.filter(
-                user=user, status='completed'
-            )
-        ])
+        # XP and gold earned from completed quests, read from the pre-aggregated
+        # lifetime ledger rollup (quest completion logs only, not bonuses or transfers)
+        from transactions.models import LedgerRollup
+        lifetime = LedgerRollup.lifetime_for(user)
+        total_xp_earned = lifetime.quest_xp_earned
+        total_gold_earned = lifetime.quest_gold_earned
         
         # Get user's gold balance
-        from transactions.transaction_utils import get_user_balance, get_available_balance
-        total_gold_balance = get_user_balance(user)
-        available_gold_balance = get_available_balance(user)
-        reserved_gold = total_gold_balance - available_gold_balance
+        from transactions.models import UserBalance
+        balance, _ = UserBalance.objects.get_or_create(user=user)
+        total_gold_balance = balance.gold_balance
+        reserved_gold = balance.reserved_gold
+        available_gold_balance = balance.available_gold
         
         return Response({
             'created_quests': created_quests,
@@ -709,9 +777,10 @@ class AdminQuestListView(generics.ListAPIView):
     """
     Admin view to list all quests with full details.
     """
-    queryset = Quest.objects.all()
+    queryset = Quest.objects.with_board_stats().prefetch_related(participants_detail_prefetch())
     serializer_class = QuestDetailSerializer
     permission_classes = [IsAuthenticated]  # Add admin permission in production
+    pagination_class = KeysetPagination
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'creator__username']
     ordering_fields = ['created_at', 'status', 'participant_count']
@@ -721,7 +790,7 @@ class AdminQuestDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Admin view for detailed quest management.
     """
-    queryset = Quest.objects.all()
+    queryset = Quest.objects.with_board_stats().prefetch_related(participants_detail_prefetch())
     serializer_class = QuestDetailSerializer
     permission_classes = [IsAuthenticated]  # Add admin permission in production
     lookup_field = 'slug'
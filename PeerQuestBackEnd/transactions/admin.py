@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Transaction, UserBalance
+from common.reference_data import cashout_methods
+from core.admin_settings import ReferenceDataAdminMixin
+from .models import Transaction, UserBalance, LedgerRollup, CashoutMethodConfig
 
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
@@ -26,7 +28,23 @@ class TransactionAdmin(admin.ModelAdmin):
 
 @admin.register(UserBalance)
 class UserBalanceAdmin(admin.ModelAdmin):
-    list_display = ('user', 'gold_balance', 'last_updated')
+    list_display = ('user', 'gold_balance', 'reserved_gold', 'last_updated')
     search_fields = ('user__username',)
     autocomplete_fields = ['user']
-    readonly_fields = ('last_updated',)
+    readonly_fields = ('reserved_gold', 'last_updated')
+
+
+@admin.register(LedgerRollup)
+class LedgerRollupAdmin(admin.ModelAdmin):
+    list_display = ('user', 'day', 'xp_earned', 'gold_earned', 'quest_xp_earned', 'quest_gold_earned', 'gold_in', 'gold_out', 'commission_paid', 'refunds', 'transaction_count')
+    list_filter = ('day',)
+    search_fields = ('user__username',)
+    readonly_fields = [f.name for f in LedgerRollup._meta.fields]
+
+
+@admin.register(CashoutMethodConfig)
+class CashoutMethodConfigAdmin(ReferenceDataAdminMixin, admin.ModelAdmin):
+    reference_cache = cashout_methods
+    list_display = ('method', 'display_name', 'minimum_amount', 'maximum_amount', 'fee_percentage', 'is_active', 'is_popular')
+    list_filter = ('is_active',)
+    list_editable = ('is_active',)
@@ -1,6 +1,12 @@
-from django.db import models
+from decimal import Decimal
+
+from django.db import models, transaction
 from quests.models import Quest
 
+# Quest statuses whose reservations count towards UserBalance.reserved_gold
+ACTIVE_RESERVATION_STATUSES = ('open', 'in-progress')
+
+
 class QuestGoldReservation(models.Model):
     """
     Tracks gold reserved for quests, ensuring quest creators can't exceed their balance
@@ -17,3 +23,20 @@ class QuestGoldReservation(models.Model):
     
     def __str__(self):
         return f"Gold Reservation: {self.amount} for Quest {self.quest.id}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_amount = instance.amount
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Keep the creator's UserBalance.reserved_gold in step with this reservation."""
+        from .transaction_utils import adjust_reserved_gold
+
+        previous = Decimal('0') if self._state.adding else getattr(self, '_loaded_amount', self.amount)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if self.quest.status in ACTIVE_RESERVATION_STATUSES:
+                adjust_reserved_gold(self.quest.creator_id, Decimal(str(self.amount)) - Decimal(str(previous)))
+        self._loaded_amount = self.amount
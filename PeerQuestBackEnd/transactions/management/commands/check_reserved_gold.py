@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from transactions.models import UserBalance
+from transactions.transaction_utils import find_reserved_gold_drift
+
+
+class Command(BaseCommand):
+    help = 'Check UserBalance.reserved_gold against the QuestGoldReservation table and optionally repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true',
+                            help='Rewrite drifted counters from the reservation table')
+
+    def handle(self, *args, **options):
+        drift = find_reserved_gold_drift()
+        for user_id, reserved, expected in drift:
+            self.stdout.write(f'  {user_id}: reserved_gold {reserved} -> {expected}')
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('All reserved gold counters are consistent'))
+            return
+        if not options['fix']:
+            self.stdout.write(self.style.WARNING(f'{len(drift)} balances have drifted reserved gold (run with --fix to repair)'))
+            return
+
+        with transaction.atomic():
+            UserBalance.objects.bulk_create(
+                [UserBalance(user_id=user_id) for user_id, _, _ in drift], ignore_conflicts=True
+            )
+            # Recheck under the transaction so concurrent reservations aren't overwritten with stale totals
+            for user_id, _, expected in find_reserved_gold_drift([user_id for user_id, _, _ in drift]):
+                UserBalance.objects.filter(user_id=user_id).update(reserved_gold=expected)
+        self.stdout.write(self.style.SUCCESS(f'Repaired reserved gold for {len(drift)} balances'))
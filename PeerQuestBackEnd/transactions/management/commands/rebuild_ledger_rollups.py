@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from transactions.rollups import rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Rebuild LedgerRollup daily/lifetime aggregates from the ledgers, one chunk of users at a time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Number of users rebuilt per transaction')
+
+    def handle(self, *args, **options):
+        rebuilt_users, rebuilt_rows = rebuild_all(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {rebuilt_rows} rollup rows for {rebuilt_users} users"
+        ))
@@ -1,40 +1,154 @@
+import multiprocessing
+import uuid
+from decimal import Decimal
+
 from django.core.management.base import BaseCommand
-from django.db import transaction
-from transactions.models import Transaction
-from django.db.models import Sum
+from django.db import connections, transaction
+from django.db.models import DecimalField, Sum, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from transactions.models import Transaction, UserBalance
 
 User = get_user_model()
 
+ZERO = Decimal('0.00')
+
+
+def user_id_ranges(workers):
+    """Split the UUID primary-key space into ``workers`` contiguous [lo, hi) ranges (None = open end)."""
+    step = (1 << 128) // workers
+    bounds = [None] + [uuid.UUID(int=step * i) for i in range(1, workers)] + [None]
+    return list(zip(bounds, bounds[1:]))
+
+
+def reconcile_range(lo=None, hi=None, chunk_size=1000, dry_run=False):
+    """
+    Diff ledger totals against UserBalance for users with lo <= id < hi.
+
+    One GROUP BY query (users LEFT JOIN transactions LEFT JOIN balance) is
+    streamed in primary-key order to find drifted users. That read is only a
+    candidate list: each chunk is then fixed in its own short transaction that
+    locks the candidates' balance rows, recomputes their ledger totals under the
+    lock and writes only rows that still drift, so a balance changed since the
+    streamed read is never overwritten with a stale total. A dry run reports
+    the streamed diff and takes no locks.
+    """
+    users = User.objects.all()
+    if lo is not None:
+        users = users.filter(pk__gte=lo)
+    if hi is not None:
+        users = users.filter(pk__lt=hi)
+    rows = (
+        users.order_by('pk')
+        .values('pk', 'username', 'balance__pk', 'balance__gold_balance')
+        .annotate(total=Coalesce(
+            Sum('transactions__amount'), Value(ZERO), output_field=DecimalField(max_digits=12, decimal_places=2)
+        ))
+        .values_list('pk', 'username', 'balance__pk', 'balance__gold_balance', 'total')
+    )
+
+    stats = {'scanned': 0, 'updated': 0, 'created': 0, 'drift': []}
+    candidates = {}  # user_id -> username
+
+    def flush():
+        if not candidates:
+            return
+        now = timezone.now()
+        to_update, to_create = [], []
+        with transaction.atomic():
+            balances = {
+                balance.user_id: balance
+                for balance in UserBalance.objects.select_for_update().filter(user_id__in=candidates).order_by('pk')
+            }
+            totals = dict(
+                Transaction.objects.filter(user_id__in=candidates).order_by().values_list('user_id')
+                .annotate(total=Sum('amount'))
+            )
+            for user_id, username in candidates.items():
+                total = Decimal(totals.get(user_id) or ZERO).quantize(ZERO)
+                balance = balances.get(user_id)
+                if balance is None:
+                    stats['created'] += 1
+                    to_create.append(UserBalance(user_id=user_id, gold_balance=total))
+                elif balance.gold_balance != total:
+                    stats['updated'] += 1
+                    stats['drift'].append((username, balance.gold_balance, total))
+                    balance.gold_balance = total
+                    balance.last_updated = now
+                    to_update.append(balance)
+            UserBalance.objects.bulk_update(to_update, ['gold_balance', 'last_updated'])
+            # A balance created concurrently since the streamed read wins; a later run checks it
+            UserBalance.objects.bulk_create(to_create, ignore_conflicts=True)
+        candidates.clear()
+
+    for user_id, username, balance_pk, current, total in rows.iterator(chunk_size=chunk_size):
+        stats['scanned'] += 1
+        total = Decimal(total).quantize(ZERO)
+        if balance_pk is not None and current == total:
+            continue
+        if dry_run:
+            if balance_pk is None:
+                stats['created'] += 1
+            else:
+                stats['updated'] += 1
+                stats['drift'].append((username, current, total))
+            continue
+        candidates[user_id] = username
+        if len(candidates) >= chunk_size:
+            flush()
+    flush()
+    return stats
+
+
+def _reconcile_worker(args):
+    # Forked workers must not share the parent's database connection
+    connections.close_all()
+    try:
+        return reconcile_range(*args)
+    finally:
+        connections.close_all()
+
 
 class Command(BaseCommand):
     help = 'Recalculate user balances from transaction history'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report drifted balances without writing them')
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Rows streamed and balances written per transaction')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Number of processes, each reconciling a slice of the user-id space')
+
     def handle(self, *args, **options):
-        from transactions.models import UserBalance
-        
-        users = User.objects.all()
-        updated = 0
-        created = 0
-        
-        with transaction.atomic():
-            for user in users:
-                # Calculate total from transactions
-                total = Transaction.objects.filter(user=user).aggregate(
-                    total=Sum('amount')
-                )['total'] or 0
-                
-                # Update or create balance
-                balance, is_new = UserBalance.objects.update_or_create(
-                    user=user,
-                    defaults={'gold_balance': total}
-                )
-                
-                if is_new:
-                    created += 1
-                else:
-                    updated += 1
-        
-        self.stdout.write(self.style.SUCCESS(
-            f"Successfully recalculated balances: {updated} updated, {created} created"
-        ))
+        dry_run = options['dry_run']
+        chunk_size = options['chunk_size']
+        workers = max(options['workers'], 1)
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
+
+        jobs = [(lo, hi, chunk_size, dry_run) for lo, hi in user_id_ranges(workers)]
+        if workers == 1:
+            results = [reconcile_range(*jobs[0])]
+        else:
+            connections.close_all()
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                results = pool.map(_reconcile_worker, jobs)
+
+        scanned = sum(r['scanned'] for r in results)
+        updated = sum(r['updated'] for r in results)
+        created = sum(r['created'] for r in results)
+        for result in results:
+            for username, current, total in result['drift']:
+                self.stdout.write(f'  {username}: {current} -> {total} ({total - current:+})')
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(
+                f"Scanned {scanned} users: {updated} balances drifted, {created} missing"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Successfully recalculated balances: {updated} updated, {created} created ({scanned} scanned)"
+            ))
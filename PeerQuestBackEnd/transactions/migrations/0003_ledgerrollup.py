@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0002_cashoutmethodconfig_cashoutrequest_method_config'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='Calendar day of the bucket (1970-01-01 = lifetime totals)')),
+                ('xp_earned', models.BigIntegerField(default=0)),
+                ('gold_earned', models.BigIntegerField(default=0, help_text='Sum of GoldTransaction amounts')),
+                ('gold_in', models.DecimalField(decimal_places=2, default=0, help_text='Positive Transaction amounts', max_digits=14)),
+                ('gold_out', models.DecimalField(decimal_places=2, default=0, help_text='Negative Transaction amounts (absolute)', max_digits=14)),
+                ('commission_paid', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('refunds', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('transaction_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['user', '-day'],
+                'unique_together': {('user', 'day')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-17 09:12
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_reserved_gold(apps, schema_editor):
+    UserBalance = apps.get_model('transactions', 'UserBalance')
+    QuestGoldReservation = apps.get_model('transactions', 'QuestGoldReservation')
+    totals = (
+        QuestGoldReservation.objects.filter(quest__status__in=['open', 'in-progress'])
+        .order_by().values('quest__creator_id').annotate(total=Sum('amount'))
+        .values_list('quest__creator_id', 'total')
+    )
+    for user_id, total in totals.iterator():
+        UserBalance.objects.update_or_create(user_id=user_id, defaults={'reserved_gold': total})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0003_ledgerrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userbalance',
+            name='reserved_gold',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, help_text="Gold held by QuestGoldReservation rows of the user's open/in-progress quests", max_digits=12),
+        ),
+        migrations.RunPython(backfill_reserved_gold, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quests', '0009_quest_is_deleted_index'),
+        ('transactions', '0004_userbalance_reserved_gold'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'created_at'], name='transaction_user_id_f5864b_idx'),
+        ),
+    ]
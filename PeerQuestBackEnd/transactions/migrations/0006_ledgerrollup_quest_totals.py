@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-17 03:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0005_transaction_user_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ledgerrollup',
+            name='quest_gold_earned',
+            field=models.BigIntegerField(default=0, help_text='Gold from quest completions (QuestCompletionLog)'),
+        ),
+        migrations.AddField(
+            model_name='ledgerrollup',
+            name='quest_xp_earned',
+            field=models.BigIntegerField(default=0, help_text='XP from quest completions (QuestCompletionLog)'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-17 10:05
+
+from django.db import migrations
+
+
+def backfill_ledger_rollups(apps, schema_editor):
+    from transactions.rollups import rebuild_all
+    rebuild_all(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0006_ledgerrollup_quest_totals'),
+        ('quests', '0006_questcompletionlog'),
+        ('users', '0008_user_ledger_totals'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ledger_rollups, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from django.conf import settings
 from quests.models import Quest
 from .gold_reservation_models import QuestGoldReservation
+from .rollup_models import LedgerRollup
 
 class TransactionType(models.TextChoices):
     PURCHASE = 'PURCHASE', 'Purchase'
@@ -54,6 +55,9 @@ class Transaction(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
         verbose_name = 'Transaction'
         verbose_name_plural = 'Transactions'
 
@@ -74,6 +78,13 @@ class UserBalance(models.Model):
         default=0.00,
         help_text='Current gold balance'
     )
+    reserved_gold = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        help_text='Gold held by QuestGoldReservation rows of the user\'s open/in-progress quests'
+    )
     last_updated = models.DateTimeField(
         auto_now=True,
         help_text='Last update timestamp'
@@ -82,6 +93,10 @@ class UserBalance(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.gold_balance} gold"
 
+    @property
+    def available_gold(self):
+        return self.gold_balance - self.reserved_gold
+
 
 class CashoutStatus(models.TextChoices):
     PENDING = 'PENDING', 'Pending'
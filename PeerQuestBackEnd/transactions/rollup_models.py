@@ -0,0 +1,48 @@
+import datetime
+
+from django.db import models
+from django.conf import settings
+
+
+class LedgerRollup(models.Model):
+    """
+    Pre-aggregated ledger totals per user, kept for each calendar day plus one
+    lifetime row (stored under LIFETIME_DAY). Maintained incrementally from
+    Transaction, XPTransaction, GoldTransaction and QuestCompletionLog writes by
+    transactions.rollups.
+    """
+    LIFETIME_DAY = datetime.date(1970, 1, 1)
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='ledger_rollups'
+    )
+    day = models.DateField(help_text='Calendar day of the bucket (1970-01-01 = lifetime totals)')
+    xp_earned = models.BigIntegerField(default=0)
+    gold_earned = models.BigIntegerField(default=0, help_text='Sum of GoldTransaction amounts')
+    quest_xp_earned = models.BigIntegerField(default=0, help_text='XP from quest completions (QuestCompletionLog)')
+    quest_gold_earned = models.BigIntegerField(default=0, help_text='Gold from quest completions (QuestCompletionLog)')
+    gold_in = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text='Positive Transaction amounts')
+    gold_out = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text='Negative Transaction amounts (absolute)')
+    commission_paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    refunds = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    transaction_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'day')
+        ordering = ['user', '-day']
+
+    def __str__(self):
+        label = 'lifetime' if self.day == self.LIFETIME_DAY else self.day.isoformat()
+        return f"Ledger rollup {self.user_id} @ {label}"
+
+    @property
+    def is_lifetime(self):
+        return self.day == self.LIFETIME_DAY
+
+    @classmethod
+    def lifetime_for(cls, user):
+        """Lifetime rollup for a user, or an unsaved zero row when nothing has been recorded."""
+        return cls.objects.filter(user=user, day=cls.LIFETIME_DAY).first() or cls(user=user, day=cls.LIFETIME_DAY)
@@ -0,0 +1,183 @@
+"""
+Incremental maintenance of LedgerRollup rows.
+
+Every ledger entry contributes to two rollup rows: the user's bucket for the
+entry's calendar day and the user's lifetime bucket. Deltas for any number of
+entries are applied in two statements: an INSERT that ignores existing rows,
+followed by one UPDATE that adds a per-row CASE delta to every metric.
+
+``rebuild_users`` recomputes a set of users' rows from scratch; it backs both the
+``rebuild_ledger_rollups`` command and the backfill migration.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.db import transaction as db_transaction
+from django.db.models import Case, Count, DecimalField, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .rollup_models import LedgerRollup
+
+ROLLUP_METRICS = {
+    'xp_earned': IntegerField(),
+    'gold_earned': IntegerField(),
+    'quest_xp_earned': IntegerField(),
+    'quest_gold_earned': IntegerField(),
+    'gold_in': DecimalField(max_digits=14, decimal_places=2),
+    'gold_out': DecimalField(max_digits=14, decimal_places=2),
+    'commission_paid': DecimalField(max_digits=14, decimal_places=2),
+    'refunds': DecimalField(max_digits=14, decimal_places=2),
+    'transaction_count': IntegerField(),
+}
+
+
+def entry_metrics(entry):
+    """Map a ledger row (Transaction, XPTransaction, GoldTransaction or QuestCompletionLog) to rollup metric deltas."""
+    from quests.models import QuestCompletionLog
+    from users.models_reward import XPTransaction, GoldTransaction
+    from .models import Transaction, TransactionType
+
+    if isinstance(entry, QuestCompletionLog):
+        return {'quest_xp_earned': entry.xp_earned, 'quest_gold_earned': entry.gold_earned}
+    if isinstance(entry, XPTransaction):
+        return {'xp_earned': entry.amount}
+    if isinstance(entry, GoldTransaction):
+        return {'gold_earned': entry.amount}
+    if isinstance(entry, Transaction):
+        amount = Decimal(entry.amount)
+        metrics = {'transaction_count': 1}
+        if amount > 0:
+            metrics['gold_in'] = amount
+        elif amount < 0:
+            metrics['gold_out'] = -amount
+        if entry.commission_fee:
+            metrics['commission_paid'] = Decimal(entry.commission_fee)
+        if entry.type == TransactionType.REFUND:
+            metrics['refunds'] = amount
+        return metrics
+    raise TypeError(f"Unsupported ledger entry: {entry!r}")
+
+
+def entry_user_id(entry):
+    # Completion logs belong to their adventurer; every other ledger row has a user
+    return entry.adventurer_id if hasattr(entry, 'adventurer_id') else entry.user_id
+
+
+def entry_day(entry):
+    created_at = getattr(entry, 'completed_at', None) or getattr(entry, 'created_at', None) or timezone.now()
+    return timezone.localdate(created_at) if timezone.is_aware(created_at) else created_at.date()
+
+
+def collect_deltas(entries, sign=1):
+    """Fold ledger entries into {(user_id, day): {metric: delta}}, including lifetime buckets."""
+    deltas = defaultdict(lambda: defaultdict(int))
+    for entry in entries:
+        metrics = entry_metrics(entry)
+        for day in (entry_day(entry), LedgerRollup.LIFETIME_DAY):
+            bucket = deltas[(entry_user_id(entry), day)]
+            for metric, value in metrics.items():
+                bucket[metric] += sign * value
+    return deltas
+
+
+def apply_deltas(deltas, create_missing=True):
+    """Apply folded deltas to LedgerRollup in two statements."""
+    if not deltas:
+        return
+    keys = list(deltas)
+    with db_transaction.atomic():
+        if create_missing:
+            LedgerRollup.objects.bulk_create(
+                [LedgerRollup(user_id=user_id, day=day) for user_id, day in keys],
+                ignore_conflicts=True,
+            )
+        updates = {}
+        for metric, output_field in ROLLUP_METRICS.items():
+            whens = [
+                When(Q(user_id=user_id, day=day), then=Value(bucket[metric]))
+                for (user_id, day), bucket in deltas.items() if bucket.get(metric)
+            ]
+            if whens:
+                updates[metric] = F(metric) + Case(*whens, default=Value(0), output_field=output_field)
+        if not updates:
+            return
+        match = Q()
+        for user_id, day in keys:
+            match |= Q(user_id=user_id, day=day)
+        LedgerRollup.objects.filter(match).update(updated_at=timezone.now(), **updates)
+
+
+def record_entries(entries, sign=1):
+    """
+    Roll freshly written (sign=1) or deleted (sign=-1) ledger entries into LedgerRollup.
+    Deletions never create buckets, so cascading user deletes don't resurrect rollup rows.
+    """
+    apply_deltas(collect_deltas(entries, sign=sign), create_missing=sign > 0)
+
+
+
+def rebuild_users(user_ids, apps=global_apps):
+    """
+    Replace every LedgerRollup row (daily and lifetime) of ``user_ids`` with
+    sums read from the ledgers; returns the number of rows written. ``apps`` is
+    the model registry, so migrations can pass their historical one.
+    """
+    XPTransaction = apps.get_model('users', 'XPTransaction')
+    GoldTransaction = apps.get_model('users', 'GoldTransaction')
+    QuestCompletionLog = apps.get_model('quests', 'QuestCompletionLog')
+    Transaction = apps.get_model('transactions', 'Transaction')
+    Rollup = apps.get_model('transactions', 'LedgerRollup')
+    money = DecimalField(max_digits=14, decimal_places=2)
+    buckets = defaultdict(lambda: defaultdict(int))
+
+    def fold(rows):
+        for row in rows:
+            user_id, day = row.pop('user_id'), row.pop('day')
+            for key in ((user_id, day), (user_id, LedgerRollup.LIFETIME_DAY)):
+                for metric, value in row.items():
+                    buckets[key][metric] += value or 0
+
+    def by_day(manager):
+        return manager.filter(user_id__in=user_ids).annotate(day=TruncDate('created_at')).values('user_id', 'day')
+
+    fold(by_day(XPTransaction.objects).annotate(xp_earned=Sum('amount')))
+    fold(by_day(GoldTransaction.objects).annotate(gold_earned=Sum('amount')))
+    fold(
+        QuestCompletionLog.objects.filter(adventurer_id__in=user_ids)
+        .values(user_id=F('adventurer_id'), day=TruncDate('completed_at'))
+        .annotate(quest_xp_earned=Sum('xp_earned'), quest_gold_earned=Sum('gold_earned'))
+    )
+    fold(by_day(Transaction.objects).annotate(
+        gold_in=Sum(Case(When(amount__gt=0, then=F('amount')), default=Decimal('0'), output_field=money)),
+        gold_out=Sum(Case(When(amount__lt=0, then=-F('amount')), default=Decimal('0'), output_field=money)),
+        commission_paid=Sum('commission_fee'),
+        refunds=Sum(Case(When(type='REFUND', then=F('amount')), default=Decimal('0'), output_field=money)),
+        transaction_count=Count('pk'),
+    ))
+
+    with db_transaction.atomic():
+        Rollup.objects.filter(user_id__in=user_ids).delete()
+        Rollup.objects.bulk_create([
+            Rollup(user_id=user_id, day=day, **metrics)
+            for (user_id, day), metrics in buckets.items()
+        ])
+    return len(buckets)
+
+
+def rebuild_all(apps=global_apps, chunk_size=500):
+    """rebuild_users over every user, one chunk per transaction; returns (users, rows)."""
+    User = apps.get_model('users', 'User')
+    rebuilt_users = rebuilt_rows = 0
+    chunk = []
+    for user_id in User.objects.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=chunk_size):
+        chunk.append(user_id)
+        if len(chunk) >= chunk_size:
+            rebuilt_rows += rebuild_users(chunk, apps)
+            rebuilt_users += len(chunk)
+            chunk = []
+    if chunk:
+        rebuilt_rows += rebuild_users(chunk, apps)
+        rebuilt_users += len(chunk)
+    return rebuilt_users, rebuilt_rows
@@ -32,8 +32,8 @@ class UserBalanceSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = UserBalance
-        fields = ['user', 'username', 'gold_balance', 'last_updated']
-        read_only_fields = ['last_updated']
+        fields = ['user', 'username', 'gold_balance', 'reserved_gold', 'last_updated']
+        read_only_fields = ['reserved_gold', 'last_updated']
     
     def get_username(self, obj):
         return obj.user.username if obj.user else None
@@ -2,7 +2,12 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.db import transaction as db_transaction
 
-from .models import Transaction, UserBalance
+from quests.models import Quest, QuestCompletionLog
+from .models import Transaction, UserBalance, QuestGoldReservation
+from .gold_reservation_models import ACTIVE_RESERVATION_STATUSES
+from .transaction_utils import adjust_reserved_gold
+from .rollups import record_entries
+from users.models_reward import XPTransaction, GoldTransaction
 
 # Import quest integration signals
 try:
@@ -43,3 +48,31 @@ def revert_balance_on_transaction_delete(sender, instance, **kwargs):
         except UserBalance.DoesNotExist:
             # No balance to update
             pass
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_save, sender=XPTransaction)
+@receiver(post_save, sender=GoldTransaction)
+@receiver(post_save, sender=QuestCompletionLog)
+def rollup_ledger_entry(sender, instance, created, **kwargs):
+    """Fold a newly written ledger row into the user's daily and lifetime LedgerRollup."""
+    if created:
+        record_entries([instance])
+
+
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=XPTransaction)
+@receiver(post_delete, sender=GoldTransaction)
+@receiver(post_delete, sender=QuestCompletionLog)
+def rollup_ledger_entry_delete(sender, instance, **kwargs):
+    """Back a deleted ledger row out of the user's LedgerRollup buckets."""
+    record_entries([instance], sign=-1)
+
+
+@receiver(post_delete, sender=QuestGoldReservation)
+def release_reserved_gold_on_delete(sender, instance, **kwargs):
+    """Take a deleted reservation out of the creator's reserved_gold (covers quest cascade deletes)."""
+    # Cascades delete reservations before their quest, so the quest row is still readable here
+    quest = Quest.objects.filter(pk=instance.quest_id).values('creator_id', 'status').first()
+    if quest and quest['status'] in ACTIVE_RESERVATION_STATUSES:
+        adjust_reserved_gold(quest['creator_id'], -instance.amount)
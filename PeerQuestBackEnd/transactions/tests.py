@@ -1,3 +1,90 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from quests.models import Quest, QuestCategory
+from users.models import User
+from .management.commands.recalculate_balances import reconcile_range, user_id_ranges
+from .models import QuestGoldReservation, Transaction, TransactionType, UserBalance
+from .transaction_utils import find_reserved_gold_drift, get_available_balance, release_gold_reservation
+
+
+class ReservedGoldCounterTest(TestCase):
+    def setUp(self):
+        self.creator = User.objects.create(username='creator', email='creator@example.com')
+        UserBalance.objects.create(user=self.creator, gold_balance=Decimal('500'))
+        self.category = QuestCategory.objects.create(name='Testing')
+
+    def make_reserved_quest(self, amount):
+        quest = Quest.objects.create(
+            title='Reserved quest', description='desc', creator=self.creator, category=self.category,
+            difficulty='initiate', gold_reward=amount, status='open',
+        )
+        QuestGoldReservation.objects.create(quest=quest, amount=Decimal(amount))
+        return quest
+
+    def test_counter_follows_reservations_and_status(self):
+        first = self.make_reserved_quest(100)
+        second = self.make_reserved_quest(50)
+        self.assertEqual(get_available_balance(self.creator), Decimal('350'))
+
+        second.status = 'completed'
+        second.save()
+        self.assertEqual(get_available_balance(self.creator), Decimal('400'))
+
+        self.assertEqual(release_gold_reservation(first), Decimal('100'))
+        self.assertEqual(get_available_balance(self.creator), Decimal('500'))
+        self.assertEqual(find_reserved_gold_drift(), [])
+
+    def test_drift_is_reported(self):
+        self.make_reserved_quest(100)
+        UserBalance.objects.filter(user=self.creator).update(reserved_gold=0)
+        self.assertEqual(len(find_reserved_gold_drift()), 1)
+
+
+class RecalculateBalancesTest(TestCase):
+    def setUp(self):
+        self.users = User.objects.bulk_create([
+            User(username=f'ledger-{i}', email=f'ledger-{i}@example.com') for i in range(6)
+        ])
+        Transaction.objects.bulk_create([
+            Transaction(user=user, type=TransactionType.REWARD, amount=Decimal(10 * (i + 1)), description='test')
+            for i, user in enumerate(self.users)
+        ])
+        UserBalance.objects.bulk_create([
+            UserBalance(user=user, gold_balance=Decimal(10 * (i + 1))) for i, user in enumerate(self.users[1:], 1)
+        ])
+        # users[0] has no balance row; users[1] has drifted
+        UserBalance.objects.filter(user=self.users[1]).update(gold_balance=Decimal('999'))
+
+    def balances(self):
+        return dict(UserBalance.objects.values_list('user__username', 'gold_balance'))
+
+    def test_fixes_drift_and_missing_balances(self):
+        out = StringIO()
+        call_command('recalculate_balances', '--chunk-size', '2', stdout=out)
+        self.assertIn('1 updated, 1 created (6 scanned)', out.getvalue())
+        self.assertEqual(self.balances(), {f'ledger-{i}': Decimal(10 * (i + 1)) for i in range(6)})
+
+    def test_dry_run_writes_nothing(self):
+        before = self.balances()
+        out = StringIO()
+        call_command('recalculate_balances', '--dry-run', stdout=out)
+        self.assertIn('Scanned 6 users: 1 balances drifted, 1 missing', out.getvalue())
+        self.assertIn('ledger-1: 999.00 -> 20.00', out.getvalue())
+        self.assertEqual(self.balances(), before)
+
+    def test_worker_ranges_cover_every_user_once(self):
+        ranges = user_id_ranges(4)
+        self.assertEqual(len(ranges), 4)
+        self.assertIsNone(ranges[0][0])
+        self.assertIsNone(ranges[-1][1])
+        self.assertTrue(all(hi == next_lo for (_, hi), (next_lo, _) in zip(ranges, ranges[1:])))
+
+        # Each range is what one --workers process reconciles
+        results = [reconcile_range(lo, hi) for lo, hi in ranges]
+        self.assertEqual(sum(r['scanned'] for r in results), 6)
+        self.assertEqual((sum(r['updated'] for r in results), sum(r['created'] for r in results)), (1, 1))
+        self.assertEqual(self.balances(), {f'ledger-{i}': Decimal(10 * (i + 1)) for i in range(6)})
@@ -1,6 +1,10 @@
 from django.db import transaction as db_transaction, models
 from .models import Transaction, UserBalance, TransactionType
 from decimal import Decimal
+from xp import leaderboards
+
+# Earned gold (as opposed to purchases, refunds and transfers) counts towards the gold leaderboards
+LEADERBOARD_TYPES = (TransactionType.REWARD, TransactionType.QUEST_REWARD)
 
 def get_user_balance(user):
     """
@@ -30,20 +34,88 @@ def get_available_balance(user):
     Returns:
         Decimal: The user's available gold balance
     """
+    # reserved_gold is maintained incrementally, so this is a single-row read
+    row = UserBalance.objects.filter(user=user).values_list('gold_balance', 'reserved_gold').first()
+    if row is None:
+        return get_user_balance(user)
+    gold_balance, reserved_gold = row
+    return gold_balance - reserved_gold
+
+
+def adjust_reserved_gold(user_id, delta):
+    """
+    Atomically add ``delta`` to a user's UserBalance.reserved_gold, creating the
+    balance row if needed.
+    """
+    if not delta:
+        return
+    with db_transaction.atomic():
+        UserBalance.objects.bulk_create([UserBalance(user_id=user_id)], ignore_conflicts=True)
+        UserBalance.objects.filter(user_id=user_id).update(reserved_gold=models.F('reserved_gold') + delta)
+
+
+def sync_reserved_gold_for_status_change(quest, old_status):
+    """
+    Move a quest's reservation in or out of the creator's reserved_gold when the
+    quest crosses between an active (open/in-progress) and an inactive status.
+    """
+    from .gold_reservation_models import ACTIVE_RESERVATION_STATUSES, QuestGoldReservation
+
+    was_active = old_status in ACTIVE_RESERVATION_STATUSES
+    is_active = quest.status in ACTIVE_RESERVATION_STATUSES
+    if was_active == is_active:
+        return
+    amount = QuestGoldReservation.objects.filter(quest=quest).values_list('amount', flat=True).first()
+    if amount:
+        adjust_reserved_gold(quest.creator_id, amount if is_active else -amount)
+
+
+def release_gold_reservation(quest):
+    """
+    Release the gold reserved for a quest (if any), returning it to the creator's
+    available balance.
+
+    Returns:
+        Decimal: The amount released
+    """
     from .gold_reservation_models import QuestGoldReservation
-    
-    # Get total balance
-    total_balance = get_user_balance(user)
-    
-    # Calculate reserved gold (for active quests created by this user)
-    reserved_gold = Decimal('0.00')
-    quests_with_reservations = QuestGoldReservation.objects.filter(quest__creator=user, quest__status__in=['open', 'in-progress'])
-    
-    if quests_with_reservations.exists():
-        reserved_gold = quests_with_reservations.aggregate(models.Sum('amount'))['amount__sum'] or Decimal('0.00')
-    
-    # Return available balance
-    return total_balance - reserved_gold
+
+    with db_transaction.atomic():
+        reservation = QuestGoldReservation.objects.select_for_update().filter(quest=quest).first()
+        if reservation is None:
+            return Decimal('0.00')
+        # post_delete takes the amount back out of reserved_gold
+        reservation.delete()
+        return reservation.amount
+
+
+def find_reserved_gold_drift(user_ids=None):
+    """
+    Compare UserBalance.reserved_gold with the reservation table.
+
+    Returns:
+        list: (user_id, counter value, expected value) for every drifted balance
+    """
+    from .gold_reservation_models import ACTIVE_RESERVATION_STATUSES, QuestGoldReservation
+
+    reservations = QuestGoldReservation.objects.filter(quest__status__in=ACTIVE_RESERVATION_STATUSES)
+    balances = UserBalance.objects.all()
+    if user_ids is not None:
+        reservations = reservations.filter(quest__creator_id__in=user_ids)
+        balances = balances.filter(user_id__in=user_ids)
+    expected = dict(
+        reservations.order_by().values('quest__creator_id').annotate(total=models.Sum('amount'))
+        .values_list('quest__creator_id', 'total')
+    )
+    drift = []
+    for user_id, reserved in balances.values_list('user_id', 'reserved_gold').iterator():
+        total = expected.pop(user_id, None) or Decimal('0.00')
+        if reserved != total:
+            drift.append((user_id, reserved, total))
+    # Creators with active reservations but no balance row at all
+    drift.extend((user_id, Decimal('0.00'), total) for user_id, total in expected.items() if total)
+    return drift
+
 
 def award_gold(user, amount, description=None, quest=None, transaction_type=TransactionType.REWARD):
     """
@@ -84,6 +156,9 @@ def award_gold(user, amount, description=None, quest=None, transaction_type=Tran
         previous_balance = balance.gold_balance
         balance.gold_balance += amount
         balance.save()
+
+        if transaction_type in LEADERBOARD_TYPES:
+            leaderboards.record_gold(user, int(amount))
         
         # UserBalance is now the single source of truth for gold balance
         
@@ -7,6 +7,7 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import Transaction, UserBalance, TransactionType, CashoutRequest, CashoutStatus, CashoutMethod
+from common.reference_data import cashout_methods
 from .serializers import TransactionSerializer, UserBalanceSerializer, UserBalanceUpdateSerializer, CashoutRequestSerializer
 
 # Define permission classes to replace common.permissions
@@ -215,6 +216,14 @@ class CashoutRequestViewSet(viewsets.ModelViewSet):
                 {'error': 'Invalid cashout method'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
+
+        # Admin-managed method settings, if any; a configured method can be switched off
+        method_config = cashout_methods.get().get(method)
+        if method_config and not method_config['is_active']:
+            return Response(
+                {'error': f"{method_config['display_name']} cashouts are currently unavailable"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         # Check user balance
         try:
@@ -251,6 +260,7 @@ class CashoutRequestViewSet(viewsets.ModelViewSet):
                 amount_php=amount_php,
                 exchange_rate=exchange_rate,
                 method=method,
+                method_config_id=method_config['id'] if method_config else None,
                 payment_details=payment_details,
                 transaction=transaction_record
             )
@@ -56,7 +56,7 @@ class CustomUserAdmin(UserAdmin):
 
     def experience_points(self, obj):
         return obj.xp
-    experience_points.admin_order_field = 'xp'
+    experience_points.admin_order_field = 'xp_total'
     experience_points.short_description = 'XP'
     list_filter = [
         'is_staff', 'is_active', 'level', 'date_joined', 'last_login',
@@ -209,3 +209,16 @@ class GoldTransactionAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'amount', 'reason', 'created_at')
     list_filter = ('reason', 'created_at')
     search_fields = ('user__username', 'reason')
+
+
+# Skills are served to clients from the reference data cache
+from common.reference_data import skills_by_category
+from core.admin_settings import ReferenceDataAdminMixin
+from .models import Skill
+
+@admin.register(Skill)
+class SkillAdmin(ReferenceDataAdminMixin, admin.ModelAdmin):
+    reference_cache = skills_by_category
+    list_display = ('name', 'category', 'is_active', 'created_at')
+    list_filter = ('category', 'is_active')
+    search_fields = ('name', 'category')
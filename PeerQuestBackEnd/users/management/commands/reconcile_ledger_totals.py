@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from users.models import User
+from users.models_reward import XPTransaction, GoldTransaction
+
+
+def _ledger_sum(model):
+    return Coalesce(
+        models.Subquery(
+            model.objects.filter(user=models.OuterRef('pk'))
+            .values('user')
+            .annotate(total=models.Sum('amount'))
+            .values('total')[:1]
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = 'Check User.xp_total/gold_total against the XP and gold ledgers and optionally repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true',
+                            help='Rewrite drifted totals from the ledgers')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of users repaired per transaction')
+
+    def handle(self, *args, **options):
+        fix = options['fix']
+        batch_size = options['batch_size']
+
+        drifted = (
+            User.objects
+            .annotate(ledger_xp=_ledger_sum(XPTransaction), ledger_gold=_ledger_sum(GoldTransaction))
+            .exclude(xp_total=models.F('ledger_xp'), gold_total=models.F('ledger_gold'))
+            .values_list('pk', 'username', 'xp_total', 'ledger_xp', 'gold_total', 'ledger_gold')
+        )
+
+        pending = []
+        total = 0
+        for pk, username, xp_total, ledger_xp, gold_total, ledger_gold in drifted.iterator(chunk_size=batch_size):
+            total += 1
+            self.stdout.write(
+                f'  {username}: xp {xp_total} -> {ledger_xp}, gold {gold_total} -> {ledger_gold}'
+            )
+            pending.append(pk)
+            if fix and len(pending) >= batch_size:
+                self._repair(pending)
+                pending = []
+
+        if fix and pending:
+            self._repair(pending)
+
+        if total == 0:
+            self.stdout.write(self.style.SUCCESS('All ledger totals are consistent'))
+        elif fix:
+            self.stdout.write(self.style.SUCCESS(f'Repaired ledger totals for {total} users'))
+        else:
+            self.stdout.write(self.style.WARNING(f'{total} users have drifted totals (run with --fix to repair)'))
+
+    def _repair(self, user_ids):
+        with transaction.atomic():
+            User.objects.filter(pk__in=user_ids).update(
+                xp_total=_ledger_sum(XPTransaction),
+                gold_total=_ledger_sum(GoldTransaction),
+                updated_at=timezone.now(),
+            )
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-17 02:28
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_ledger_totals(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    XPTransaction = apps.get_model('users', 'XPTransaction')
+    GoldTransaction = apps.get_model('users', 'GoldTransaction')
+
+    def ledger_sum(model):
+        return Coalesce(
+            models.Subquery(
+                model.objects.filter(user=models.OuterRef('pk'))
+                .values('user')
+                .annotate(total=models.Sum('amount'))
+                .values('total')[:1]
+            ),
+            0,
+        )
+
+    User.objects.update(xp_total=ledger_sum(XPTransaction), gold_total=ledger_sum(GoldTransaction))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_alter_guildreport_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='gold_total',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='xp_total',
+            field=models.IntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_ledger_totals, migrations.RunPython.noop),
+    ]
@@ -188,17 +188,27 @@ class User(AbstractUser):
     avatar_data = models.TextField(blank=True, null=True)  # For base64 image data
     bio = models.TextField(blank=True)
     level = models.IntegerField(default=1)
-    # Removed experience_points and gold_balance fields; now use transaction tables
+    # Removed experience_points and gold_balance fields; now use transaction tables.
+    # xp_total/gold_total are materialized sums of those ledgers, bumped with F()
+    # increments by XPTransaction/GoldTransaction (see models_reward.py).
+    xp_total = models.IntegerField(default=0, db_index=True, editable=False)
+    gold_total = models.IntegerField(default=0, editable=False)
+    # Bumped by save() and by every bulk write of level/xp_total, so views can
+    # use it to revalidate responses that embed the user
+    updated_at = models.DateTimeField(auto_now=True)
     from .models_reward import XPTransaction, GoldTransaction
+
+    # Denormalized ledger totals are only ever written with F() increments, so a
+    # plain save() of a stale instance must not clobber them.
+    LEDGER_TOTAL_FIELDS = ('xp_total', 'gold_total')
+
     @property
     def xp(self):
-        from .models_reward import XPTransaction
-        return XPTransaction.objects.filter(user=self).aggregate(models.Sum('amount'))['amount__sum'] or 0
+        return self.xp_total
 
     @property
     def gold(self):
-        from .models_reward import GoldTransaction
-        return GoldTransaction.objects.filter(user=self).aggregate(models.Sum('amount'))['amount__sum'] or 0
+        return self.gold_total
 
     @gold.setter
     def gold(self, value):
@@ -268,7 +278,18 @@ class User(AbstractUser):
                 self.ban_reason = None
                 self.ban_expires_at = None
 
-        self.level = self.calculate_level()
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.LEDGER_TOTAL_FIELDS
+            ]
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'level' in update_fields:
+            # xp_total may have moved under a stale instance (F() rewards), so derive
+            # the level from the stored total rather than the in-memory one
+            if not self._state.adding:
+                self.refresh_from_db(fields=['xp_total'])
+            self.level = self.calculate_level()
         super().save(*args, **kwargs)
 
     def set_password(self, raw_password):
@@ -287,8 +308,9 @@ class User(AbstractUser):
         self.last_password_change = timezone.now()
 
     def calculate_level(self):
-        # Level is now based on transaction-based XP
-        return min(100, max(1, self.xp // 1000))
+        # Level is based on transaction-based XP via the shared level table
+        from xp.levels import level_for
+        return level_for(self.xp)
 
     # Role hierarchy methods
     def role_level(self):
@@ -1,13 +1,52 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+
+def apply_ledger_delta(user, field, delta):
+    """
+    Atomically bump a denormalized ledger total (``xp_total``/``gold_total``) on
+    the user row and refresh the in-memory instance so callers see the new value.
+    """
+    from django.contrib.auth import get_user_model
+    if not delta:
+        return
+    User = get_user_model()
+    User.objects.filter(pk=user.pk).update(**{field: models.F(field) + delta, 'updated_at': timezone.now()})
+    user.refresh_from_db(fields=[field, 'updated_at'])
+
+
+class LedgerEntryMixin(models.Model):
+    """Keeps the owning user's materialized total in step with ledger inserts/deletes."""
+    total_field = None
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        is_new = self._state.adding
+        super().save(*args, **kwargs)
+        if is_new:
+            apply_ledger_delta(self.user, self.total_field, self.amount)
+
+    def delete(self, *args, **kwargs):
+        user, amount = self.user, self.amount
+        result = super().delete(*args, **kwargs)
+        apply_ledger_delta(user, self.total_field, -amount)
+        return result
+
+
+class XPTransaction(LedgerEntryMixin):
+    total_field = 'xp_total'
 
-class XPTransaction(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='xp_transactions')
     amount = models.IntegerField()
     reason = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
-class GoldTransaction(models.Model):
+class GoldTransaction(LedgerEntryMixin):
+    total_field = 'gold_total'
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='gold_transactions')
     amount = models.IntegerField()
     reason = models.CharField(max_length=255, blank=True)
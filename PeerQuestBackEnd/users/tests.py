@@ -1,10 +1,75 @@
-from django.urls import path
-from .views import CustomUserCreate, BlacklistTokenUpdateView
+from io import StringIO
 
-app_name = 'users'
+from django.core.management import call_command
+from django.test import TestCase
 
-urlpatterns = [
-    path('create/', CustomUserCreate.as_view(), name="create_user"),
-    path('logout/blacklist/', BlacklistTokenUpdateView.as_view(),
-         name='blacklist')
-]
\ No newline at end of file
+from common.testing import make_user
+from .models import User
+from .models_reward import GoldTransaction, XPTransaction
+
+
+class LedgerTotalsTest(TestCase):
+    def setUp(self):
+        self.user = make_user('ledger-user')
+
+    def test_entries_bump_and_reverse_totals(self):
+        first = XPTransaction.objects.create(user=self.user, amount=120, reason='quest')
+        XPTransaction.objects.create(user=self.user, amount=30, reason='bonus')
+        GoldTransaction.objects.create(user=self.user, amount=75, reason='quest')
+        # The instance passed in is refreshed in place
+        self.assertEqual((self.user.xp_total, self.user.gold_total), (150, 75))
+
+        first.delete()
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.xp, self.user.gold), (30, 75))
+
+        # Editing an existing entry is not an insert and leaves the total alone
+        entry = GoldTransaction.objects.get(user=self.user)
+        entry.reason = 'renamed'
+        entry.save()
+        self.assertEqual(User.objects.get(pk=self.user.pk).gold_total, 75)
+
+    def test_user_save_does_not_overwrite_totals(self):
+        stale = User.objects.get(pk=self.user.pk)
+        XPTransaction.objects.create(user=self.user, amount=500)
+        GoldTransaction.objects.create(user=self.user, amount=40)
+
+        stale.bio = 'Updated profile'
+        stale.save()
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.xp_total, self.user.gold_total), (500, 40))
+        self.assertEqual(self.user.bio, 'Updated profile')
+
+    def test_stale_save_does_not_regress_level(self):
+        stale = User.objects.get(pk=self.user.pk)
+        XPTransaction.objects.create(user=self.user, amount=5000)
+        self.user.save()
+        level = User.objects.get(pk=self.user.pk).level
+        self.assertGreater(level, 1)
+
+        stale.bio = 'Saved after the reward'
+        stale.save()
+        self.assertEqual(User.objects.get(pk=self.user.pk).level, level)
+        self.assertEqual(stale.level, level)
+
+    def test_reconcile_repairs_drift(self):
+        XPTransaction.objects.create(user=self.user, amount=200)
+        XPTransaction.objects.create(user=self.user, amount=50)
+        GoldTransaction.objects.create(user=self.user, amount=10)
+        # Queryset deletes bypass LedgerEntryMixin.delete, so the totals drift
+        XPTransaction.objects.filter(user=self.user, amount=50).delete()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.xp_total, 250)
+
+        out = StringIO()
+        call_command('reconcile_ledger_totals', stdout=out)
+        self.assertIn('ledger-user: xp 250 -> 200, gold 10 -> 10', out.getvalue())
+        self.assertEqual(User.objects.get(pk=self.user.pk).xp_total, 250)
+
+        call_command('reconcile_ledger_totals', '--fix', stdout=StringIO())
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.xp_total, self.user.gold_total), (200, 10))
+
+        out = StringIO()
+        call_command('reconcile_ledger_totals', stdout=out)
+        self.assertIn('All ledger totals are consistent', out.getvalue())
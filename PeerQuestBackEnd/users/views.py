@@ -212,6 +212,8 @@ from .email_utils import send_verification_email, generate_verification_token
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
 from django.conf import settings
+from core.conditional import make_etag, not_modified, set_validators
+from common.reference_data import skills_by_category as cached_skills_by_category
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from .validators import PROFANITY_LIST, LEET_MAP, levenshtein, normalize_username
@@ -1225,19 +1227,8 @@ class SkillsListView(APIView):
     
     def get(self, request):
         try:
-            # Get skills from database
-            skills = Skill.objects.filter(is_active=True).order_by('category', 'name')
-
-            # Organize by category
-            skills_by_category = {}
-            for skill in skills:
-                if skill.category not in skills_by_category:
-                    skills_by_category[skill.category] = []
-                skills_by_category[skill.category].append({
-                    'id': str(skill.id),
-                    'name': skill.name,
-                    'description': skill.description
-                })
+            # Active skills organized by category, served from the reference data cache
+            skills_by_category = dict(cached_skills_by_category.get())
 
             # If no skills in database, return predefined skills as objects with fake UUIDs
             import uuid
@@ -1422,7 +1413,13 @@ class CurrentUserView(APIView):
             'date_joined': user.date_joined,
             # Add any other fields needed by the frontend here
         }
-        return Response(data)
+        # Everything above comes from the already-authenticated user row (xp/gold are the
+        # denormalized ledger totals), so the fingerprint costs no extra queries
+        etag = make_etag(data)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        return set_validators(Response(data), etag)
         data = {
             'id': user.id,
             'username': user.username,
@@ -0,0 +1,269 @@
+"""
+Realtime XP and gold leaderboards backed by Redis sorted sets.
+
+Each board is a sorted set keyed ``leaderboard:<metric>:<scope>`` whose members
+are user ids and whose scores are running totals. Scopes are ``global``,
+``weekly:<iso-year>-W<week>`` and ``guild:<guild_id>``. Awards are applied with
+ZINCRBY once the surrounding DB transaction commits, so rank, top-N and
+around-me lookups are all O(log n) in Redis.
+
+Set ``LEADERBOARD_BACKEND = 'memory'`` (e.g. in tests) to use the in-process
+InMemorySortedSetClient instead of Redis.
+"""
+from bisect import bisect_left, insort
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('xp', 'gold')
+WEEKLY_TTL_SECONDS = 5 * 7 * 24 * 3600
+
+
+class InMemorySortedSetClient:
+    """
+    Minimal stand-in for the subset of the redis-py sorted-set API used here.
+    Members are kept in a list ordered by (-score, member) next to a score map.
+    """
+
+    def __init__(self):
+        self._scores = {}
+        self._orders = {}
+
+    def flushall(self):
+        self._scores.clear()
+        self._orders.clear()
+
+    def _remove(self, name, member):
+        scores = self._scores.get(name, {})
+        if member in scores:
+            order = self._orders[name]
+            del order[bisect_left(order, (-scores[member], member))]
+            del scores[member]
+
+    def _set(self, name, member, score):
+        self._remove(name, member)
+        self._scores.setdefault(name, {})[member] = score
+        insort(self._orders.setdefault(name, []), (-score, member))
+
+    def zincrby(self, name, amount, value):
+        score = self._scores.get(name, {}).get(value, 0) + amount
+        self._set(name, value, score)
+        return score
+
+    def zadd(self, name, mapping):
+        for member, score in mapping.items():
+            self._set(name, member, score)
+        return len(mapping)
+
+    def zrem(self, name, *values):
+        for value in values:
+            self._remove(name, value)
+
+    def zscore(self, name, value):
+        return self._scores.get(name, {}).get(value)
+
+    def zrevrank(self, name, value):
+        score = self.zscore(name, value)
+        if score is None:
+            return None
+        return bisect_left(self._orders[name], (-score, value))
+
+    def zrevrange(self, name, start, end, withscores=False):
+        order = self._orders.get(name, [])
+        end = len(order) if end == -1 else end + 1
+        window = order[max(start, 0):end]
+        if withscores:
+            return [(member, -neg) for neg, member in window]
+        return [member for _, member in window]
+
+    def zcard(self, name):
+        return len(self._scores.get(name, {}))
+
+    def delete(self, *names):
+        for name in names:
+            self._scores.pop(name, None)
+            self._orders.pop(name, None)
+
+    def rename(self, src, dst):
+        self.delete(dst)
+        self._scores[dst] = self._scores.pop(src, {})
+        self._orders[dst] = self._orders.pop(src, [])
+
+    def expire(self, name, seconds):
+        return True
+
+    def pipeline(self, transaction=True):
+        return _InMemoryPipeline(self)
+
+
+class _InMemoryPipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        results = [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+        self._calls = []
+        return results
+
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        if getattr(settings, 'LEADERBOARD_BACKEND', 'redis') == 'memory':
+            _client = InMemorySortedSetClient()
+        else:
+            import redis
+            _client = redis.Redis.from_url(
+                getattr(settings, 'LEADERBOARD_REDIS_URL', settings.REDIS_URL), decode_responses=True
+            )
+    return _client
+
+
+def reset_client():
+    """Drop the cached client so the next call picks up the current LEADERBOARD_BACKEND."""
+    global _client
+    _client = None
+
+
+def week_scope(when=None):
+    year, week, _ = timezone.localdate(when).isocalendar()
+    return f"weekly:{year}-W{week:02d}"
+
+
+def guild_scope(guild_id):
+    return f"guild:{guild_id}"
+
+
+def board_key(metric, scope='global'):
+    if metric not in METRICS:
+        raise ValueError(f"Unknown leaderboard metric: {metric}")
+    return f"leaderboard:{metric}:{scope}"
+
+
+def active_guild_ids(user_ids):
+    """{user_id: [guild_id, ...]} for active guild memberships of the given users (one query)."""
+    from guilds.models import GuildMembership
+    guilds = {}
+    for user_id, guild_id in GuildMembership.objects.filter(
+        user_id__in=user_ids, is_active=True
+    ).values_list('user_id', 'guild_id'):
+        guilds.setdefault(user_id, []).append(guild_id)
+    return guilds
+
+
+def _apply_increments(metric, deltas):
+    deltas = {user_id: amount for user_id, amount in deltas.items() if amount}
+    if not deltas:
+        return
+    weekly = board_key(metric, week_scope())
+    guilds = active_guild_ids(list(deltas))
+    pipe = get_client().pipeline(transaction=False)
+    for user_id, amount in deltas.items():
+        member = str(user_id)
+        pipe.zincrby(board_key(metric), amount, member)
+        pipe.zincrby(weekly, amount, member)
+        for guild_id in guilds.get(user_id, []):
+            pipe.zincrby(board_key(metric, guild_scope(guild_id)), amount, member)
+    pipe.expire(weekly, WEEKLY_TTL_SECONDS)
+    pipe.execute()
+
+
+def record(metric, deltas):
+    """
+    Queue leaderboard increments ({user_id: amount}) to be applied once the current
+    DB transaction commits. Leaderboard failures are logged, never raised to callers.
+    """
+    def apply():
+        try:
+            _apply_increments(metric, deltas)
+        except Exception as e:
+            logger.error(f"Failed to update {metric} leaderboard: {e}")
+    transaction.on_commit(apply)
+
+
+def record_xp(user, amount):
+    record('xp', {user.pk: amount})
+
+
+def record_gold(user, amount):
+    record('gold', {user.pk: amount})
+
+
+def _with_users(entries):
+    from users.models import User
+    users = {
+        str(row['id']): row
+        for row in User.objects.filter(pk__in=[member for member, _, _ in entries])
+        .values('id', 'username', 'display_name', 'avatar_url', 'level')
+    }
+    return [
+        {'rank': rank, 'score': int(score), 'user': users.get(member, {'id': member})}
+        for member, score, rank in entries
+    ]
+
+
+def top(metric, scope='global', limit=10):
+    rows = get_client().zrevrange(board_key(metric, scope), 0, limit - 1, withscores=True)
+    return _with_users([(member, score, index + 1) for index, (member, score) in enumerate(rows)])
+
+
+def rank_of(user, metric, scope='global'):
+    key, member = board_key(metric, scope), str(user.pk)
+    client = get_client()
+    rank = client.zrevrank(key, member)
+    if rank is None:
+        return None
+    return {'rank': rank + 1, 'score': int(client.zscore(key, member) or 0), 'total': client.zcard(key)}
+
+
+def around(user, metric, scope='global', radius=5):
+    key = board_key(metric, scope)
+    rank = get_client().zrevrank(key, str(user.pk))
+    if rank is None:
+        return []
+    start = max(rank - radius, 0)
+    rows = get_client().zrevrange(key, start, rank + radius, withscores=True)
+    return _with_users([(member, score, start + index + 1) for index, (member, score) in enumerate(rows)])
+
+
+def sync_guild_membership(user_id, guild_id, active):
+    """Add a member to (or drop them from) a guild's boards using their global totals."""
+    client = get_client()
+    member = str(user_id)
+    for metric in METRICS:
+        key = board_key(metric, guild_scope(guild_id))
+        if active:
+            score = client.zscore(board_key(metric), member)
+            client.zadd(key, {member: score or 0})
+        else:
+            client.zrem(key, member)
+
+
+def replace_board(key, scores, ttl=None):
+    """Atomically swap a whole board for ``scores`` ({member: score}) via a staging key."""
+    client = get_client()
+    staging = f"{key}:rebuild"
+    client.delete(staging)
+    items = list(scores.items())
+    for start in range(0, len(items), 1000):
+        client.zadd(staging, dict(items[start:start + 1000]))
+    if items:
+        client.rename(staging, key)
+        if ttl:
+            client.expire(key, ttl)
+    else:
+        client.delete(key)
@@ -0,0 +1,102 @@
+"""
+Single source of truth for XP -> level conversion.
+
+The threshold table in levels.json is loaded once into a sorted array. Single
+lookups use binary search; batch lookups use NumPy's searchsorted when NumPy is
+installed and fall back to bisect otherwise.
+"""
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+import json
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch lookups fall back to bisect
+    np = None
+
+LEVELS_PATH = Path(__file__).with_name('levels.json')
+
+
+class LevelTable:
+    def __init__(self, thresholds):
+        if not thresholds:
+            raise ValueError("Level table needs at least one threshold")
+        self.thresholds = sorted(int(t) for t in thresholds)
+        self._array = np.asarray(self.thresholds, dtype=np.int64) if np is not None else None
+
+    @classmethod
+    def from_file(cls, path=LEVELS_PATH):
+        with open(path, encoding='utf-8') as fh:
+            return cls(json.load(fh)['thresholds'])
+
+    @property
+    def max_level(self):
+        return len(self.thresholds)
+
+    def level_for(self, xp):
+        """Level reached with ``xp`` total XP (never below 1)."""
+        return max(1, bisect_right(self.thresholds, xp))
+
+    def levels_for(self, xp_values):
+        """Vectorized level_for over a sequence of XP totals; returns a list of ints."""
+        if self._array is not None:
+            levels = np.searchsorted(self._array, np.asarray(xp_values, dtype=np.int64), side='right')
+            return np.maximum(levels, 1).tolist()
+        return [self.level_for(xp) for xp in xp_values]
+
+    def xp_for_level(self, level):
+        """Minimum XP needed to reach ``level`` (clamped to the table)."""
+        level = min(max(level, 1), self.max_level)
+        return self.thresholds[level - 1]
+
+
+@lru_cache(maxsize=None)
+def get_level_table():
+    return LevelTable.from_file()
+
+
+def level_for(xp):
+    return get_level_table().level_for(xp)
+
+
+def recompute_levels(queryset=None, chunk_size=5000, dry_run=False):
+    """
+    Recompute ``User.level`` from ``xp_total`` for every user in ``queryset``.
+
+    Users are walked in primary-key order one chunk at a time; each chunk's
+    levels are computed in one vectorized call and only changed rows are written
+    back with bulk_update. User.save() is never called.
+
+    Returns a dict with the number of users scanned and changed.
+    """
+    from django.db import transaction
+    from django.utils import timezone
+    from users.models import User
+
+    table = get_level_table()
+    now = timezone.now()
+    queryset = (queryset if queryset is not None else User.objects.all()).order_by('pk')
+    scanned = changed = 0
+    last_pk = None
+
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(page.values_list('pk', 'xp_total', 'level')[:chunk_size])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        scanned += len(rows)
+
+        new_levels = table.levels_for([xp for _, xp, _ in rows])
+        updates = [
+            User(pk=pk, level=new_level, updated_at=now)
+            for (pk, _, old_level), new_level in zip(rows, new_levels)
+            if new_level != old_level
+        ]
+        changed += len(updates)
+        if updates and not dry_run:
+            with transaction.atomic():
+                User.objects.bulk_update(updates, ['level', 'updated_at'], batch_size=1000)
+
+    return {"scanned": scanned, "changed": changed}
@@ -0,0 +1,57 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+from django.utils import timezone
+
+from guilds.models import GuildMembership
+from transactions.models import Transaction
+from transactions.transaction_utils import LEADERBOARD_TYPES
+from users.models_reward import XPTransaction
+from xp import leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the global, weekly and guild XP/gold leaderboards from the ledgers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Rows streamed from the database per fetch')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        today = timezone.localdate()
+        week_start = timezone.make_aware(datetime.combine(today - timedelta(days=today.weekday()), time.min))
+
+        ledgers = {
+            'xp': XPTransaction.objects.all(),
+            'gold': Transaction.objects.filter(type__in=LEADERBOARD_TYPES),
+        }
+        members = defaultdict(list)
+        for user_id, guild_id in GuildMembership.objects.filter(is_active=True).values_list(
+            'user_id', 'guild_id'
+        ).iterator(chunk_size=chunk_size):
+            members[guild_id].append(str(user_id))
+
+        for metric, ledger in ledgers.items():
+            totals = self._totals(ledger, chunk_size)
+            weekly = self._totals(ledger.filter(created_at__gte=week_start), chunk_size)
+            leaderboards.replace_board(leaderboards.board_key(metric), totals)
+            leaderboards.replace_board(
+                leaderboards.board_key(metric, leaderboards.week_scope()), weekly, ttl=leaderboards.WEEKLY_TTL_SECONDS
+            )
+            for guild_id, user_ids in members.items():
+                leaderboards.replace_board(
+                    leaderboards.board_key(metric, leaderboards.guild_scope(guild_id)),
+                    {user_id: totals.get(user_id, 0) for user_id in user_ids},
+                )
+            self.stdout.write(
+                f"{metric}: {len(totals)} users ranked, {len(weekly)} this week, {len(members)} guild boards"
+            )
+
+        self.stdout.write(self.style.SUCCESS('Leaderboards rebuilt'))
+
+    def _totals(self, ledger, chunk_size):
+        rows = ledger.order_by().values('user_id').annotate(total=Sum('amount')).values_list('user_id', 'total')
+        return {str(user_id): int(total or 0) for user_id, total in rows.iterator(chunk_size=chunk_size)}
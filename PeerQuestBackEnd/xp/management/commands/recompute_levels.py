@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from xp.levels import get_level_table, recompute_levels
+
+
+class Command(BaseCommand):
+    help = 'Recompute every user level from xp_total using the level table in xp/levels.json'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Number of users read and written per chunk')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report how many levels would change without writing them')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
+
+        table = get_level_table()
+        self.stdout.write(f"Level table: {table.max_level} levels, cap at {table.xp_for_level(table.max_level)} XP")
+
+        result = recompute_levels(chunk_size=options['chunk_size'], dry_run=dry_run)
+        verb = 'would change' if dry_run else 'updated'
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {result['scanned']} users, {verb} {result['changed']} levels"
+        ))
@@ -0,0 +1,89 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from common.testing import make_user
+from users.models import User
+from . import leaderboards
+from .levels import LevelTable, get_level_table, recompute_levels
+from .utils import award_xp
+
+
+@override_settings(LEADERBOARD_BACKEND='memory')
+class LeaderboardTest(TestCase):
+    def setUp(self):
+        # A fresh in-process client per test; never flush a real Redis
+        leaderboards.reset_client()
+        self.addCleanup(leaderboards.reset_client)
+        self.assertIsInstance(leaderboards.get_client(), leaderboards.InMemorySortedSetClient)
+        self.users = [make_user(f'player-{i}') for i in range(5)]
+
+    def test_awards_update_global_and_weekly_boards(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i, user in enumerate(self.users):
+                award_xp(user, (i + 1) * 100)
+            award_xp(self.users[0], 1000)
+
+        top = leaderboards.top('xp', limit=2)
+        self.assertEqual([row['user']['username'] for row in top], ['player-0', 'player-4'])
+        self.assertEqual(top[0]['score'], 1100)
+        self.assertEqual(leaderboards.top('xp', leaderboards.week_scope(), 1)[0]['score'], 1100)
+
+        rank = leaderboards.rank_of(self.users[2], 'xp')
+        self.assertEqual(rank, {'rank': 4, 'score': 300, 'total': 5})
+        around = leaderboards.around(self.users[2], 'xp', radius=1)
+        self.assertEqual([row['rank'] for row in around], [3, 4, 5])
+
+    def test_rolled_back_awards_are_not_ranked(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            award_xp(self.users[0], 500)
+        self.assertEqual(len(callbacks), 1)
+        self.assertIsNone(leaderboards.rank_of(self.users[0], 'xp'))
+
+
+class LevelTableTest(SimpleTestCase):
+    def setUp(self):
+        self.table = get_level_table()
+
+    def test_boundaries(self):
+        self.assertEqual(self.table.max_level, 100)
+        for xp, level in [(-50, 1), (0, 1), (1999, 1), (2000, 2), (2999, 2), (3000, 3),
+                          (99999, 99), (100000, 100), (10 ** 9, 100)]:
+            self.assertEqual(self.table.level_for(xp), level, xp)
+        self.assertEqual((self.table.xp_for_level(1), self.table.xp_for_level(2), self.table.xp_for_level(500)),
+                         (0, 2000, 100000))
+
+    def test_matches_previous_user_formula(self):
+        # User.calculate_level used to be min(100, max(1, xp // 1000))
+        xp_values = list(range(-1000, 120000, 250)) + [1999, 2000, 2001, 99999, 100000]
+        expected = [min(100, max(1, xp // 1000)) for xp in xp_values]
+        self.assertEqual([self.table.level_for(xp) for xp in xp_values], expected)
+        self.assertEqual(self.table.levels_for(xp_values), expected)
+
+    def test_batch_lookup_without_numpy(self):
+        table = LevelTable([0, 10, 20])
+        with mock.patch.object(table, '_array', None):
+            self.assertEqual(table.levels_for([-1, 0, 9, 10, 25]), [1, 1, 1, 2, 3])
+
+
+class RecomputeLevelsTest(TestCase):
+    def setUp(self):
+        self.users = [make_user(f'leveller-{i}') for i in range(5)]
+        for user, xp, stored in zip(self.users, [0, 2500, 7000, 150000, 1500], [1, 1, 9, 100, 1]):
+            User.objects.filter(pk=user.pk).update(xp_total=xp, level=stored)
+
+    def levels(self):
+        return [User.objects.get(pk=user.pk).level for user in self.users]
+
+    def test_dry_run_makes_no_writes(self):
+        with self.assertNumQueries(3):  # two chunks of 3 and the empty read that ends the walk; no UPDATE
+            result = recompute_levels(User.objects.filter(username__startswith='leveller-'), chunk_size=3,
+                                      dry_run=True)
+        self.assertEqual(result, {'scanned': 5, 'changed': 2})
+        self.assertEqual(self.levels(), [1, 1, 9, 100, 1])
+
+    def test_writes_only_changed_levels(self):
+        result = recompute_levels(User.objects.filter(username__startswith='leveller-'), chunk_size=2)
+        self.assertEqual(result, {'scanned': 5, 'changed': 2})
+        self.assertEqual(self.levels(), [1, 2, 7, 100, 1])
+        self.assertEqual(recompute_levels(User.objects.filter(username__startswith='leveller-'))['changed'], 0)
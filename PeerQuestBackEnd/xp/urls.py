@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import LeaderboardView, LeaderboardMeView
+
+urlpatterns = [
+    path('<str:metric>/', LeaderboardView.as_view(), name='leaderboard'),
+    path('<str:metric>/me/', LeaderboardMeView.as_view(), name='leaderboard-me'),
+]
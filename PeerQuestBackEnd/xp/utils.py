@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.db import transaction
 from users.models import User
+from . import leaderboards
+from .levels import get_level_table, level_for
 
 
 def award_xp(user, xp_amount, reason="Quest completion"):
@@ -32,6 +34,7 @@ def award_xp(user, xp_amount, reason="Quest completion"):
         new_level = calculate_level(new_xp)
         user.level = new_level
         user.save(update_fields=["level"])
+        leaderboards.record_xp(user, xp_amount)
 
     leveled_up = new_level > old_level
 
@@ -49,37 +52,40 @@ def award_xp(user, xp_amount, reason="Quest completion"):
 
 def calculate_level(xp):
     """
-    Calculate user level based on XP.
-    Uses a simple formula: level = floor(xp / 100) + 1
+    Calculate user level based on XP using the shared level table (xp/levels.json).
     """
-    if xp < 0:
-        return 1
-    return (xp // 100) + 1
+    return level_for(xp)
 
 
 def get_xp_for_next_level(current_xp):
     """
     Calculate XP needed for the next level.
     """
-    current_level = calculate_level(current_xp)
-    next_level_xp = current_level * 100
-    return next_level_xp - current_xp
+    table = get_level_table()
+    current_level = table.level_for(current_xp)
+    if current_level >= table.max_level:
+        return 0
+    return table.xp_for_level(current_level + 1) - current_xp
 
 
 def get_level_progress(current_xp):
     """
     Get progress percentage towards the next level.
     """
-    current_level = calculate_level(current_xp)
-    current_level_start_xp = (current_level - 1) * 100
-    next_level_start_xp = current_level * 100
-    
+    table = get_level_table()
+    current_level = table.level_for(current_xp)
+    if current_level >= table.max_level:
+        return 100
+
+    current_level_start_xp = table.xp_for_level(current_level)
+    next_level_start_xp = table.xp_for_level(current_level + 1)
+
     progress_xp = current_xp - current_level_start_xp
     level_xp_range = next_level_start_xp - current_level_start_xp
-    
+
     if level_xp_range == 0:
         return 100
-    
+
     return min(100, (progress_xp / level_xp_range) * 100)
 
 
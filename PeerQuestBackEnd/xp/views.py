@@ -0,0 +1,57 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import leaderboards
+
+MAX_LIMIT = 100
+
+
+def resolve_scope(request):
+    """Map ?scope=global|weekly|guild (&guild=<id>) to a leaderboard scope, or raise ValueError."""
+    scope = request.query_params.get('scope', 'global')
+    if scope == 'global':
+        return 'global'
+    if scope == 'weekly':
+        return leaderboards.week_scope()
+    if scope == 'guild':
+        guild_id = request.query_params.get('guild')
+        if not guild_id:
+            raise ValueError("guild is required for the guild scope")
+        return leaderboards.guild_scope(guild_id)
+    raise ValueError(f"Unknown scope: {scope}")
+
+
+class LeaderboardView(APIView):
+    """
+    Top-N users for a metric (xp or gold).
+    GET /api/leaderboards/<metric>/?scope=global|weekly|guild&guild=<id>&limit=10
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, metric):
+        try:
+            scope = resolve_scope(request)
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), MAX_LIMIT)
+            results = leaderboards.top(metric, scope, limit)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'metric': metric, 'scope': scope, 'results': results})
+
+
+class LeaderboardMeView(APIView):
+    """
+    The current user's rank on a board plus the users ranked around them.
+    GET /api/leaderboards/<metric>/me/?scope=...&radius=5
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, metric):
+        try:
+            scope = resolve_scope(request)
+            radius = min(max(int(request.query_params.get('radius', 5)), 0), MAX_LIMIT // 2)
+            rank = leaderboards.rank_of(request.user, metric, scope)
+            nearby = leaderboards.around(request.user, metric, scope, radius) if rank else []
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'metric': metric, 'scope': scope, 'rank': rank, 'around': nearby})
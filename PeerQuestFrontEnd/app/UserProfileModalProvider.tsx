@@ -21,8 +21,8 @@ export function UserProfileModalProvider({ children }: { children: React.ReactNo
       setUser(e.detail.user);
       setIsOpen(true);
       // Fetch quests for this user
-      QuestAPI.getQuests({ creator: e.detail.user.id })
-        .then(res => setQuests(res.results || []))
+      QuestAPI.getAllQuests({ creator: e.detail.user.id })
+        .then(setQuests)
         .catch(() => setQuests([]));
       // TODO: fetch guilds if needed
     }
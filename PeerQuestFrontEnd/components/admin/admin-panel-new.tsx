@@ -186,16 +186,8 @@ function AdminPanel({
   // Fetch quests for admin panel
   const fetchQuestsForAdmin = async () => {
     try {
-      const data = await QuestAPI.getQuests();
-      if (Array.isArray(data)) {
-        setQuests?.(data);
-      } else if (Array.isArray(data.results)) {
-        setQuests?.(data.results);
-      } else if (Array.isArray(data.value)) {
-        setQuests?.(data.value);
-      } else {
-        setQuests?.([]);
-      }
+      // Every page of the board, not just the first
+      setQuests?.(await QuestAPI.getAllQuests());
     } catch (err: any) {
       setQuests?.([]);
       if (showToast) showToast("Failed to fetch quests: " + (err?.message || err), "error");
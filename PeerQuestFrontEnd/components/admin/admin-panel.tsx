@@ -233,17 +233,8 @@ function AdminPanel({
   // Fetch quests for admin panel
   const fetchQuestsForAdmin = async () => {
     try {
-      const data = await QuestAPI.getQuests();
-      let questArray: Quest[] = [];
-      if (Array.isArray(data)) {
-        questArray = data;
-      } else if (Array.isArray(data.results)) {
-        questArray = data.results;
-      } else if (Array.isArray(data.value)) {
-        questArray = data.value;
-      } else {
-        questArray = [];
-      }
+      // Every page of the board, not just the first
+      const questArray: Quest[] = await QuestAPI.getAllQuests();
       
       // Set both local state and props
       setLocalQuests(questArray);
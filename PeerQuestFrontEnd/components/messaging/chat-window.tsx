@@ -33,6 +33,10 @@ interface ChatWindowProps {
   conversations: Conversation[];
   getOtherParticipant: (conv: Conversation) => User | null;
   isLoading: boolean;
+  // Backward scroll through the conversation's history
+  hasOlderMessages?: boolean;
+  isLoadingOlder?: boolean;
+  onLoadOlder?: () => void;
   isOtherUserTyping: boolean;
   // Mobile/Back button support
   isMobile?: boolean;
@@ -56,6 +60,9 @@ function ChatWindow({
   activeConversation,
   getOtherParticipant,
   isLoading,
+  hasOlderMessages = false,
+  isLoadingOlder = false,
+  onLoadOlder,
   isMobile: isMobileProp,
   onBack,
   ...rest
@@ -91,13 +98,32 @@ function ChatWindow({
     setSelectedFiles([]);
   };
 
+  // Height before an older page was requested, so prepending keeps the view in place
+  const prependScrollHeightRef = useRef<number | null>(null);
+  const lastMessageIdRef = useRef<string | undefined>(undefined);
+
   useEffect(() => {
     const container = scrollContainerRef.current;
-    if (container) {
+    if (!container) return;
+    const lastId = messages[messages.length - 1]?.id;
+    if (prependScrollHeightRef.current !== null && lastId === lastMessageIdRef.current) {
+      container.scrollTop += container.scrollHeight - prependScrollHeightRef.current;
+    } else {
       container.scrollTop = container.scrollHeight;
     }
+    prependScrollHeightRef.current = null;
+    lastMessageIdRef.current = lastId;
   }, [messages]);
 
+  const handleScroll = () => {
+    const container = scrollContainerRef.current;
+    if (!container || !onLoadOlder || !hasOlderMessages || isLoadingOlder) return;
+    if (container.scrollTop < 40) {
+      prependScrollHeightRef.current = container.scrollHeight;
+      onLoadOlder();
+    }
+  };
+
   const otherParticipant = getOtherParticipant(activeConversation);
   const presence = otherParticipant
     ? onlineUsers.get(otherParticipant.id)
@@ -164,6 +190,7 @@ function ChatWindow({
       <div
         className="flex-1 overflow-y-auto p-2 md:p-4 space-y-3 md:space-y-4"
         ref={scrollContainerRef}
+        onScroll={handleScroll}
         style={{
           backgroundColor: "var(--tavern-cream)",
           paddingBottom: isMobile ? "90px" : "110px",
@@ -185,6 +212,14 @@ function ChatWindow({
           </div>
         ) : (
           <>
+            {isLoadingOlder && (
+              <div className="flex justify-center py-2">
+                <div
+                  className="animate-spin rounded-full h-5 w-5 border-b-2"
+                  style={{ borderColor: "var(--tavern-gold)" }}
+                />
+              </div>
+            )}
             {messages.map((message) => {
               const isCurrentUser = message.sender.id === currentUser.id;
               const sender = message.sender;
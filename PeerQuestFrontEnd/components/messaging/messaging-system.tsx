@@ -6,6 +6,7 @@ import Avatar from "@/components/ui/avatar";
 import type {
   Conversation,
   Message,
+  MessagePage,
   User,
   TypingUser,
   UserStatus,
@@ -179,6 +180,9 @@ export default function MessagingSystem({
   const messageIdSet = useRef<Set<string>>(new Set());
   const [isLoadingMessages, setIsLoadingMessages] = useState(false)
   const hasReceivedInitialMessages = useRef(false);
+  // Cursor for the next older page of the active conversation (null = start reached)
+  const [olderCursor, setOlderCursor] = useState<string | null>(null)
+  const [isLoadingOlder, setIsLoadingOlder] = useState(false)
   const [infoSearchQuery, setInfoSearchQuery] = useState("");
 
 
@@ -432,14 +436,17 @@ export default function MessagingSystem({
 
             if (!wsRef.current || wsRef.current.readyState !== WebSocket.OPEN) {
               try {
-                const res = await API.get<Message[]>(`/conversations/${activeId}/messages/`);
+                const res = await API.get<MessagePage>(`/conversations/${activeId}/messages/`);
 
-                const realMessages = (res.data || []).map((m) => ({
+                const realMessages = (res.data?.results || []).map((m) => ({
                   ...m,
                   status: (m.read ? "read" : "sent") as MessageStatus,
                 }));
 
                 setMessages((existing) => {
+                  // Keep older pages the user already scrolled back through
+                  const latestIds = new Set(realMessages.map((m) => m.id));
+                  const older = existing.filter((m) => !m.id.startsWith("temp") && !latestIds.has(m.id));
                   const temp = existing.filter(
                     (m) =>
                       m.id.startsWith("temp") &&
@@ -453,7 +460,7 @@ export default function MessagingSystem({
                         )
                   );
 
-                  return [...realMessages, ...temp].sort(
+                  return [...older, ...realMessages, ...temp].sort(
                     (a, b) => new Date(a.timestamp).getTime() - new Date(b.timestamp).getTime()
                   );
                 });
@@ -486,6 +493,7 @@ export default function MessagingSystem({
             hasReceivedInitialMessages.current = true;      // ✅ Mark as handled
 
             if (!Array.isArray(data.messages)) return;
+            setOlderCursor(data.before ?? null);
 
             // Do not set status to delivered/read on initial fetch; only update via WebSocket events
             const realMessages = (data.messages || []).map((m: Message) => ({
@@ -627,6 +635,30 @@ export default function MessagingSystem({
   )
 
   // --- Stable ref for handleWsMessage to avoid effect restarts ---
+  // Backward scroll: fetch the page just before the oldest loaded message
+  const loadOlderMessages = useCallback(async () => {
+    if (!activeId || !olderCursor || isLoadingOlder) return;
+    setIsLoadingOlder(true);
+    try {
+      const res = await API.get<MessagePage>(`/conversations/${activeId}/messages/`, {
+        params: { before: olderCursor },
+      });
+      const olderMessages = (res.data?.results || []).map((m: Message) => ({
+        ...m,
+        status: (m.read ? "read" : "sent") as MessageStatus,
+      }));
+      setMessages((existing) => {
+        const seen = new Set(existing.map((m) => m.id));
+        return [...olderMessages.filter((m) => !seen.has(m.id)), ...existing];
+      });
+      setOlderCursor(res.data?.before ?? null);
+    } catch {
+      showToast?.("⚠️ Failed to load older messages", "error");
+    } finally {
+      setIsLoadingOlder(false);
+    }
+  }, [API, activeId, olderCursor, isLoadingOlder, showToast]);
+
   const handleWsMessageRef = useRef(handleWsMessage)
   useEffect(() => {
     handleWsMessageRef.current = handleWsMessage
@@ -636,6 +668,7 @@ export default function MessagingSystem({
   useEffect(() => {
     hasReceivedInitialMessages.current = false; // ✅ Reset guard
     messageIdSet.current = new Set();
+    setOlderCursor(null);
 
     if (!activeId) return;
 
@@ -660,9 +693,10 @@ export default function MessagingSystem({
     );
 
 
-    API.get<Message[]>(`/conversations/${activeId}/messages/`)
+    API.get<MessagePage>(`/conversations/${activeId}/messages/`)
       .then((res) => {
-        const realMessages = (res.data || []).map((m: Message) => ({
+        setOlderCursor(res.data?.before ?? null);
+        const realMessages = (res.data?.results || []).map((m: Message) => ({
           ...m,
           status: (m.read ? "read" : "sent") as MessageStatus,
         }));
@@ -947,6 +981,9 @@ export default function MessagingSystem({
               conversations={conversations}
               getOtherParticipant={getOtherParticipant}
               isLoading={isLoadingMessages}
+              hasOlderMessages={!!olderCursor}
+              isLoadingOlder={isLoadingOlder}
+              onLoadOlder={loadOlderMessages}
               isOtherUserTyping={isOtherUserTyping}
               onBack={() => setActiveId(null)}
               isMobile={true}
@@ -1048,6 +1085,9 @@ export default function MessagingSystem({
                   conversations={conversations}
                   getOtherParticipant={getOtherParticipant}
                   isLoading={isLoadingMessages}
+                  hasOlderMessages={!!olderCursor}
+                  isLoadingOlder={isLoadingOlder}
+                  onLoadOlder={loadOlderMessages}
                   isOtherUserTyping={isOtherUserTyping}
                   isMobile={false}
                 />
@@ -37,9 +37,10 @@ export function ApplicationsModal({ isOpen, onClose, currentUser, questId, onApp
     setLoading(true)
     setError(null)
     try {
+      const filters = questId ? { questId } : undefined
       const [myApps, appsToMyQuests] = await Promise.all([
-        getMyApplications(),
-        getApplicationsToMyQuests()
+        getMyApplications(filters),
+        getApplicationsToMyQuests(filters)
       ])
       console.log('Applications loaded successfully:', { 
         myApps: myApps.length, 
@@ -47,12 +48,8 @@ export function ApplicationsModal({ isOpen, onClose, currentUser, questId, onApp
         questId: questId
       })
       
-      // Filter applications if questId is provided
-      const filteredMyApps = questId ? myApps.filter(app => app.quest.id === questId) : myApps
-      const filteredAppsToMyQuests = questId ? appsToMyQuests.filter(app => app.quest.id === questId) : appsToMyQuests
-      
-      setMyApplications(filteredMyApps)
-      setApplicationsToMyQuests(filteredAppsToMyQuests)
+      setMyApplications(myApps)
+      setApplicationsToMyQuests(appsToMyQuests)
     } catch (err) {
       console.error('Failed to load applications:', err)
       const errorMessage = err instanceof Error ? err.message : 'Failed to load applications'
@@ -120,15 +120,13 @@ export function QuestManagementApplicationsModal({
     setLoading(true)
     setError(null)
     try {
-      const appsToMyQuests = await getApplicationsToMyQuests()
+      // The server filters by quest, so the list is complete however many quests the user owns
+      const filteredAppsToMyQuests = await getApplicationsToMyQuests(questId ? { questId } : undefined)
       console.log('Applications loaded successfully:', { 
-        appsToMyQuests: appsToMyQuests.length,
+        appsToMyQuests: filteredAppsToMyQuests.length,
         questId: questId
       })
       
-      // Filter applications if questId is provided
-      const filteredAppsToMyQuests = questId ? appsToMyQuests.filter(app => app.quest.id === questId) : appsToMyQuests
-      
       setApplicationsToMyQuests(filteredAppsToMyQuests)
       
       // Load submissions for each unique quest (skip for now since we need slug)
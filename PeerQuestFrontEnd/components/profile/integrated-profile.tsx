@@ -373,15 +373,8 @@ function IntegratedProfile({ currentUser, quests: propQuests, guilds: propGuilds
         if (Array.isArray(propQuests) && propQuests.length > 0) {
           all = propQuests;
         } else {
-          // Always fetch fresh from API for up-to-date data
-          const questResponse = await QuestAPI.getQuests();
-          if (Array.isArray(questResponse)) {
-            all = questResponse;
-          } else if (questResponse && Array.isArray(questResponse.results)) {
-            all = questResponse.results;
-          } else if (questResponse && Array.isArray(questResponse.value)) {
-            all = questResponse.value;
-          }
+          // Always fetch fresh from API: the user's own created and participating quests
+          all = await QuestAPI.getMyQuests();
         }
         setAllQuests(all);
       } catch (err) {
@@ -58,14 +58,12 @@ export function QuestBoard({
     setLoading(true)
     try {
       const [questsData, categoriesData] = await Promise.all([
-        QuestAPI.getQuests(filters),
+        QuestAPI.getAllQuests(filters),
         QuestAPI.getCategories()
       ])
       
-      // Handle both response formats: array directly or wrapped in results/value
-      const questsArray = Array.isArray(questsData) 
-        ? questsData 
-        : (questsData.results || questsData.value || [])
+      // Every page of the board, so the client-side filtering and sorting sees all quests
+      const questsArray = questsData
       
       // Apply consistent client-side sorting regardless of backend order
       const sortedQuests = [...questsArray].sort((a: Quest, b: Quest) => {
@@ -119,13 +117,9 @@ export function QuestBoard({
 
   const loadQuests = async () => {
     try {
-      const questsData = await QuestAPI.getQuests(filters)
-      console.log('📋 Loaded quests:', questsData.results || questsData)
-      
-      // Handle both response formats: array directly or wrapped in results/value
-      const questsArray = Array.isArray(questsData) 
-        ? questsData 
-        : (questsData.results || questsData.value || [])
+      // Every page of the board, so the client-side filtering and sorting sees all quests
+      const questsArray = await QuestAPI.getAllQuests(filters)
+      console.log('📋 Loaded quests:', questsArray)
       
       // Apply consistent client-side sorting regardless of backend order
       const sortedQuests = [...questsArray].sort((a: Quest, b: Quest) => {
@@ -178,12 +172,7 @@ export function QuestBoard({
   const handleQuestUpdate = async () => {
     try {
       // Update the quest list
-      const questsData = await QuestAPI.getQuests(filters)
-      
-      // Handle both response formats: array directly or wrapped in results/value
-      const updatedQuests = Array.isArray(questsData) 
-        ? questsData 
-        : (questsData.results || questsData.value || [])
+      const updatedQuests = await QuestAPI.getAllQuests(filters)
       
       setQuests(updatedQuests)
       
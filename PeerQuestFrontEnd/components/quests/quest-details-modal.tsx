@@ -152,7 +152,8 @@ function QuestDetailsModal({
   const loadUserApplications = async (retryCount = 0) => {
     try {
       setIsLoadingApplications(true)
-      const applications = await getMyApplications()
+      // Only this quest's applications decide the apply/approved/kicked state
+      const applications = quest ? await getMyApplications({ questId: quest.id }) : []
       setUserApplications(applications)
       console.log('📋 Quest Details Modal - Applications loaded:', applications.length)
     } catch (error) {
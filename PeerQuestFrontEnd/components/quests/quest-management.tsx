@@ -138,13 +138,8 @@ export function QuestManagement({
     try {
       setLoading(true)
       
-      // Load fresh quest data from API instead of relying on props
-      const questResponse = await QuestAPI.getQuests()
-      
-      // Handle both response formats: array directly or wrapped in results/value
-      const allQuests = Array.isArray(questResponse) 
-        ? questResponse 
-        : (questResponse.results || questResponse.value || [])
+      // Load the user's own created and participating quests (complete, unlike one board page)
+      const allQuests = await QuestAPI.getMyQuests()
 
       // DEBUG: Log the quest data being processed
       console.log('🔍 Quest Management Debug - Raw quest data:', {
@@ -260,8 +255,7 @@ export function QuestManagement({
 
     setLoadingApplications((prev) => ({ ...prev, [questId]: true }))
     try {
-      const allApplications = await getApplicationsToMyQuests()
-      const questSpecificApplications = allApplications.filter(app => app.quest.id === questId)
+      const questSpecificApplications = await getApplicationsToMyQuests({ questId })
       setQuestApplications((prev: { [questId: number]: Application[] }) => ({ ...prev, [questId]: questSpecificApplications }))
     } catch (error) {
       console.error('Failed to load applications for quest:', questId, error)
@@ -8,40 +8,50 @@ export interface ApplicationListResponse {
   count: number
   next: string | null
   previous: string | null
+  facets?: Record<string, number>
 }
 
-// Get all applications (user's own applications)
-export const getMyApplications = async (): Promise<Application[]> => {
-  try {
-    const response = await fetch(`${API_BASE_URL}/applications/my_applications/`, {
-      headers: getAuthHeaders(),
-    })
-    
+export interface ApplicationInboxFilters {
+  questId?: number
+  status?: string[]
+}
+
+// The inboxes are cursor-paginated; follow `next` until every page is loaded.
+const fetchInbox = async (path: string, filters: ApplicationInboxFilters = {}): Promise<Application[]> => {
+  const params = new URLSearchParams({ page_size: '100' })
+  if (filters.questId !== undefined) params.set('quest', String(filters.questId))
+  if (filters.status?.length) params.set('status', filters.status.join(','))
+
+  const applications: Application[] = []
+  let url: string | null = `${API_BASE_URL}/applications/${path}/?${params}`
+  while (url) {
+    const response = await fetch(url, { headers: getAuthHeaders() })
+
     if (response.status === 401) {
       throw new Error('Authentication required. Please log in.')
     }
-    
+
     const data: ApplicationListResponse = await handleApiResponse<ApplicationListResponse>(response)
-    return data.results
+    applications.push(...data.results)
+    url = data.next
+  }
+  return applications
+}
+
+// Get all applications (user's own applications), optionally for one quest
+export const getMyApplications = async (filters?: ApplicationInboxFilters): Promise<Application[]> => {
+  try {
+    return await fetchInbox('my_applications', filters)
   } catch (error) {
     console.error('Error fetching my applications:', error)
     throw error
   }
 }
 
-// Get applications to user's quests
-export const getApplicationsToMyQuests = async (): Promise<Application[]> => {
+// Get applications to user's quests, optionally for one quest
+export const getApplicationsToMyQuests = async (filters?: ApplicationInboxFilters): Promise<Application[]> => {
   try {
-    const response = await fetch(`${API_BASE_URL}/applications/to_my_quests/`, {
-      headers: getAuthHeaders(),
-    })
-    
-    if (response.status === 401) {
-      throw new Error('Authentication required. Please log in.')
-    }
-    
-    const data: ApplicationListResponse = await handleApiResponse<ApplicationListResponse>(response)
-    return data.results
+    return await fetchInbox('to_my_quests', filters)
   } catch (error) {
     console.error('Error fetching applications to my quests:', error)
     throw error
@@ -18,6 +18,21 @@ const getAuthHeaders = () => {
   return headers
 }
 
+// Cursor-paginated quest lists (board, search) link each page to the next;
+// follow `next` from the first page until the last one
+const collectPages = async (page: QuestListResponse, what: string): Promise<Quest[]> => {
+  const quests: Quest[] = []
+  while (true) {
+    quests.push(...(page.results || page.value || []))
+    if (!page.next) return quests
+    const response = await fetchWithAuth(page.next, { headers: getAuthHeaders() })
+    if (!response.ok) {
+      throw new Error(`Failed to ${what}: ${response.statusText || 'Unknown error'}`)
+    }
+    page = await response.json()
+  }
+}
+
 export interface QuestListResponse {
   results?: Quest[]
   value?: Quest[]
@@ -70,6 +85,7 @@ export interface QuestFilters {
   status?: string
   creator?: string | number
   available_only?: boolean
+  page_size?: number
 }
 
 export type DifficultyTier = 'initiate' | 'adventurer' | 'champion' | 'mythic';
@@ -223,6 +239,14 @@ export const QuestAPI = {
     return response.json();
   },
 
+  /**
+   * Every quest matching the filters. The board is cursor-paginated (20 per
+   * page by default), so this follows `next` until the last page.
+   */
+  async getAllQuests(filters: QuestFilters = {}): Promise<Quest[]> {
+    return collectPages(await QuestAPI.getQuests({ ...filters, page_size: 100 }), 'fetch quests')
+  },
+
   async getQuest(slug: string): Promise<Quest> {
     const response = await fetchWithAuth(`${API_BASE_URL}/quests/quests/${slug}/`, {
       headers: getAuthHeaders(),
@@ -502,12 +526,12 @@ export const QuestAPI = {
     return response.json()
   },
 
-  // Quest search
+  // Quest search: every matching quest, across all result pages
   async searchQuests(searchParams: {
     search?: string
     available_only?: boolean
   }): Promise<Quest[]> {
-    const params = new URLSearchParams()
+    const params = new URLSearchParams({ page_size: '100' })
     Object.entries(searchParams).forEach(([key, value]) => {
       if (value !== undefined && value !== null && value !== '') {
         params.append(key, value.toString())
@@ -522,7 +546,8 @@ export const QuestAPI = {
       throw new Error(`Failed to search quests: ${response.statusText}`)
     }
 
-    return response.json()
+    const page: QuestListResponse = await response.json()
+    return collectPages(page, 'search quests')
   },
 
   // Quest statistics
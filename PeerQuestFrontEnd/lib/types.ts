@@ -477,6 +477,15 @@ export interface Message {
   attachments?: Attachment[]
 }
 
+// GET /conversations/:id/messages/ -- one cursor page, oldest first
+export interface MessagePage {
+  previous: string | null
+  next: string | null
+  before: string | null
+  after: string | null
+  results: Message[]
+}
+
 export interface TypingUser {
   user_id: string
   username: string